@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.contrib.auth.admin import UserAdmin
 
-from .models import BlackListedToken, Profile, User
+from .models import BlackListedToken, Follow, Profile, User
 
 
 class CustomUserAdmin(UserAdmin):
@@ -95,4 +95,5 @@ class ProfileAdmin(admin.ModelAdmin):
 
 admin.site.register(User, CustomUserAdmin)
 admin.site.register(BlackListedToken)
+admin.site.register(Follow)
 admin.site.register(Profile, ProfileAdmin)
@@ -32,14 +32,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
         access_token = self.get_token(request)
         if not access_token:
             return None
-        try:
-            payload = jwt.decode(
-                access_token, key=settings.SECRET_KEY, algorithms=["HS256"]
-            )
-        except jwt.exceptions.InvalidSignatureError:
-            raise AuthenticationFailed("Invalid token signature!")
-        except Exception:
-            raise ParseError()
+        payload = self.decode_access_token(access_token)
 
         if self.is_token_blacklisted(payload):
             raise AuthenticationFailed("Invalid or expired token!")
@@ -50,6 +43,29 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
         return user, payload
 
+    def decode_access_token(self, access_token: str) -> dict[str, t.Any]:
+        """
+        Decode an access token and check its signature.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            dict[str, Any]: The decoded JWT payload.
+
+        Raises:
+            AuthenticationFailed: If the token signature is invalid.
+            ParseError: If there was an error decoding the token.
+        """
+        try:
+            return jwt.decode(
+                access_token, key=settings.SECRET_KEY, algorithms=["HS256"]
+            )
+        except jwt.exceptions.InvalidSignatureError:
+            raise AuthenticationFailed("Invalid token signature!")
+        except Exception:
+            raise ParseError()
+
     def get_token(self, request: HttpRequest) -> str | None:
         """
         Extracts the token from the Authorization header of the given request.
@@ -206,3 +222,67 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
         access_token, _ = cls.create_tokens(user)
         return access_token
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` for async views, checking the token with the async ORM.
+    """
+
+    async def aauthenticate(
+        self, request: HttpRequest
+    ) -> tuple[BaseUser, dict[str, t.Any]] | None:
+        """
+        Authenticates the user using the provided HTTP request.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            A tuple containing the authenticated user object and the decoded JWT
+            payload, or None if the request carries no token.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or expired, or if the user is invalid.
+            ParseError: If there was an error decoding the token.
+        """
+        access_token = self.get_token(request)
+        if not access_token:
+            return None
+        payload = self.decode_access_token(access_token)
+
+        if await self.ais_token_blacklisted(payload):
+            raise AuthenticationFailed("Invalid or expired token!")
+
+        user = await self.aget_user(payload)
+        if not user:
+            raise AuthenticationFailed("Invalid user")
+
+        return user, payload
+
+    async def ais_token_blacklisted(self, payload) -> bool:
+        """
+        Check if the given token is blacklisted.
+
+        Args:
+            payload (str): The token to check.
+
+        Returns:
+            bool: True if the token is blacklisted, False otherwise.
+        """
+        return await BlackListedToken.objects.filter(token=payload).aexists()
+
+    async def aget_user(self, payload: dict[str, t.Any]) -> BaseUser | None:
+        """
+        Retrieve the user instance based on the payload.
+
+        Args:
+            payload (dict): The payload containing the user ID.
+
+        Returns:
+            AbstractBaseUser | None: The user instance if found, otherwise None.
+        """
+        user_id = payload.get("user_id")
+        if not user_id:
+            return None
+        return await User.objects.filter(pk=user_id).afirst()
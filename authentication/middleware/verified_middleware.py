@@ -1,15 +1,25 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.http import HttpRequest
+from django.utils.decorators import sync_and_async_middleware
 from rest_framework.exceptions import AuthenticationFailed
 
+EXCLUDED_PATHS = [
+    "/api/auth/verify-otp/",
+    "/api/auth/resend-otp/",
+]
+
 
 class EmailVerificationError(Exception):
     pass
 
 
+@sync_and_async_middleware
 def verified_middleware(get_response):
     """
     Middleware that checks if the user has verified their email address before allowing access to certain views.
 
+    Runs natively in async mode under ASGI, so the async views don't hold a thread.
+
     Args:
         get_response (callable): A function that takes a request and returns a response.
 
@@ -17,22 +27,30 @@ def verified_middleware(get_response):
         callable: A function that takes a request and returns a response.
     """
 
-    def middleware(request: HttpRequest):
-        excluded_paths = [
-            "/api/auth/verify-otp/",
-            "/api/auth/resend-otp/",
-        ]
+    def is_checked(request: HttpRequest) -> bool:
+        return hasattr(request, "user") and request.path_info not in EXCLUDED_PATHS
 
-        if not hasattr(request, "user"):
-            return get_response(request)
+    def check(request: HttpRequest) -> None:
+        if not request.user.is_active:
+            raise EmailVerificationError("Verify your email first!")
 
-        if request.path_info in excluded_paths:
-            return get_response(request)
+    if iscoroutinefunction(get_response):
 
-        response = get_response(request)
+        async def middleware(request: HttpRequest):
+            checked = is_checked(request)
+            response = await get_response(request)
+            if checked:
+                # Loading a lazy user queries the database.
+                await sync_to_async(check)(request)
+            return response
 
-        if not request.user.is_active:
-            raise EmailVerificationError("Verify your email first!")
-        return response
+    else:
+
+        def middleware(request: HttpRequest):
+            checked = is_checked(request)
+            response = get_response(request)
+            if checked:
+                check(request)
+            return response
 
     return middleware
@@ -17,6 +17,29 @@ class User(AbstractUser):
     otp = models.CharField(max_length=6, null=True, blank=True)
 
 
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="following"
+    )
+    following = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="followers"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "following"], name="unique_follow"
+            ),
+            models.CheckConstraint(
+                check=~models.Q(follower=models.F("following")), name="no_self_follow"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.follower} -> {self.following}"
+
+
 class BlackListedToken(models.Model):
     token = models.CharField(max_length=255, unique=True)
 
@@ -1,3 +1,102 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authentication.authentication import JWTAuthentication
+from authentication.models import Follow
+from jobs.models import Job
+
+User = get_user_model()
+
+
+class AsyncProfileTests(TestCase):
+    url = "/api/auth/async/profile/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="author", email="author@example.com", first_name="Ada"
+        )
+
+    async def test_returns_the_profile(self):
+        access_token, _ = JWTAuthentication.create_tokens(self.user)
+        headers = {"Authorization": f"Bearer {access_token}"}
+        expected = await self.async_client.get("/api/auth/profile/", headers=headers)
+        response = await self.async_client.get(self.url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.json()["data"]["first_name"], "Ada")
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()["message"], "Forbidden")
+
+
+class FollowTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", email="author@example.com"
+        )
+        self.reader = User.objects.create_user(
+            username="reader", email="reader@example.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.url = f"/api/auth/follow/{self.author.id}/"
+
+    def test_toggles(self):
+        response = self.client.put(self.url)
+        self.assertEqual(response.json()["message"], "User followed successfully.")
+        self.assertTrue(Follow.objects.filter(follower=self.reader).exists())
+
+        response = self.client.put(self.url)
+        self.assertEqual(response.json()["message"], "User unfollowed successfully.")
+        self.assertFalse(Follow.objects.filter(follower=self.reader).exists())
+
+    def test_concurrent_follow_is_idempotent(self):
+        delete = QuerySet.delete
+
+        def delete_then_follow_concurrently(queryset):
+            deleted = delete(queryset)
+            # The other request inserts between our delete and insert.
+            Follow.objects.bulk_create(
+                [Follow(follower=self.reader, following=self.author)]
+            )
+            return deleted
+
+        with mock.patch.object(QuerySet, "delete", delete_then_follow_concurrently):
+            response = self.client.put(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"], "User followed successfully.")
+        self.assertEqual(Follow.objects.filter(follower=self.reader).count(), 1)
+
+
+@override_settings(ENV="production")
+class OtpEmailTests(TestCase):
+    def test_registration_queues_the_otp_email(self):
+        response = self.client.post(
+            "/api/auth/register/",
+            {
+                "username": "reader",
+                "email": "reader@example.com",
+                "password": "correct-horse-battery",
+                "confirm_password": "correct-horse-battery",
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            Job.objects.get().payload["recipients"], ["reader@example.com"]
+        )
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+        user = User.objects.get(username="reader")
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(str(user.otp), mail.outbox[0].body)
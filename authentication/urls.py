@@ -1,6 +1,8 @@
 from django.urls import path
 
 from authentication.views import (
+    AsyncProfileView,
+    FollowView,
     LoginView,
     LogoutView,
     ProfileView,
@@ -16,6 +18,8 @@ urlpatterns = [
     path("refresh/", RefreshTokenView.as_view(), name="refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", ProfileView.as_view(), name="profile"),
+    path("async/profile/", AsyncProfileView.as_view(), name="async-profile"),
     path("verify-otp/", VerifyOtpView.as_view(), name="verify-otp"),
     path("resend-otp/", ResendOtpView.as_view(), name="resend-otp"),
+    path("follow/<int:user_id>/", FollowView.as_view(), name="follow"),
 ]
@@ -1,8 +1,7 @@
 import random
 import string
 
-from django.conf import settings
-from django.core.mail import send_mail
+from jobs.mail import enqueue_email
 
 
 def generate_otp(length: int = 6) -> int:
@@ -22,7 +21,8 @@ def generate_otp(length: int = 6) -> int:
 
 def send_otp_email(email: str, otp: int):
     """
-    Sends an email containing the OTP for verification to the specified email address.
+    Queues an email containing the OTP for verification to the specified email address.
+    The email is sent by the `run_jobs` worker once the current transaction commits.
 
     Args:
         email (str): The email address to send the OTP to.
@@ -30,6 +30,4 @@ def send_otp_email(email: str, otp: int):
     """
     subject = "Verify your account!"
     message = f"Your OTP for verification is: {otp}"
-    from_email = settings.EMAIL_HOST_USER
-    recipient_list = [email]
-    send_mail(subject, message, from_email, recipient_list)
+    enqueue_email(subject, message, [email])
@@ -1,12 +1,14 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, JsonResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from authentication.models import BlackListedToken, Profile
+from authentication.models import BlackListedToken, Follow, Profile
 from authentication.serializers import (
     LoginSerializer,
     OtpSerializer,
@@ -16,6 +18,7 @@ from authentication.serializers import (
 )
 from authentication.utils import generate_otp, send_otp_email
 from core.response import CustomResponse as cr
+from core.views import AsyncAPIView
 
 from .authentication import JWTAuthentication as jwt_auth
 
@@ -38,14 +41,15 @@ class RegisterView(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.validated_data.pop("confirm_password")
-        user = serializer.save()
-        if settings.ENV == "production":
-            user.is_active = False
-            otp = generate_otp()
-            user.otp = otp
-            send_otp_email(user.email, otp)
-
-            user.save()
+        # The user and the OTP email are committed together.
+        with transaction.atomic():
+            user = serializer.save()
+            if settings.ENV == "production":
+                user.is_active = False
+                otp = generate_otp()
+                user.otp = otp
+                user.save()
+                send_otp_email(user.email, otp)
 
         access_token, refresh_token = jwt_auth.create_tokens(user)
         return cr.success(
@@ -109,10 +113,10 @@ class ResendOtpView(APIView):
             return cr.error("User is already verified!")
 
         otp = generate_otp()
-        send_otp_email(user.email, otp)
-
-        user.otp = otp
-        user.save()
+        with transaction.atomic():
+            user.otp = otp
+            user.save()
+            send_otp_email(user.email, otp)
 
         return cr.success(message="OTP resent successfully!")
 
@@ -176,6 +180,7 @@ class RefreshTokenView(APIView):
 
 
 class ProfileView(APIView):
+    replica_reads = True
     permission_classes = [IsAuthenticated]
     serializer_class = ProfileSerializer
 
@@ -212,6 +217,69 @@ class ProfileView(APIView):
         return cr.success(data=serializer.data, message="Profile created successfully.")
 
 
+class AsyncProfileView(AsyncAPIView):
+    replica_reads = True
+    authentication_required = True
+    serializer_class = ProfileSerializer
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        """
+        Async counterpart of `ProfileView.get`.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The HTTP response object containing the profile.
+        """
+        # The serializer reads the user's names, join them in rather than lazy load.
+        profile = (
+            await Profile.objects.select_related("user")
+            .filter(user=request.user)
+            .afirst()
+        )
+        serializer = self.serializer_class(instance=profile)
+        return self.success(
+            data=serializer.data, message="Profile fetched successfully!"
+        )
+
+
+class FollowView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request: Request, user_id: int) -> Response:
+        """
+        Follows the given user if not followed, unfollows otherwise.
+
+        Args:
+            request (Request): The HTTP request object.
+            user_id (int): The id of the user to follow.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        if user_id == request.user.id:
+            return cr.error(message="You cannot follow yourself.")
+        if not User.objects.filter(pk=user_id).exists():
+            return cr.error(message="User not found.")
+
+        # Deleting first and inserting only when nothing was deleted keeps the toggle
+        # correct under concurrent requests, like `LikeQuerySet.toggle`.
+        deleted, _ = Follow.objects.filter(
+            follower=request.user, following_id=user_id
+        ).delete()
+        if deleted:
+            return cr.success(message="User unfollowed successfully.")
+
+        try:
+            with transaction.atomic():
+                Follow.objects.create(follower=request.user, following_id=user_id)
+        except IntegrityError:
+            # A concurrent request followed the user first.
+            pass
+        return cr.success(message="User followed successfully.")
+
+
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from core.asgi import DisconnectMiddleware
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+os.environ.setdefault("WEB_INTERFACE", "asgi")
 
-application = get_asgi_application()
+application = DisconnectMiddleware(get_asgi_application())
@@ -46,10 +46,14 @@ INSTALLED_APPS = [
     "rest_framework",
     "authentication",
     "blogs",
+    "core",
+    "jobs",
 ]
 
 MIDDLEWARE = [
     "authentication.middleware.verified_middleware.verified_middleware",
+    "core.middleware.CompressionMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -86,24 +90,129 @@ WSGI_APPLICATION = "backend.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# "asgi" when served by backend.asgi, which sets it, "wsgi" otherwise.
+WEB_INTERFACE = os.environ.get("WEB_INTERFACE", "wsgi")
+
+# Persistent connections: each thread keeps its connection open for
+# CONN_MAX_AGE seconds (0 closes it after every request, "none" never does) and
+# checks it is still usable before reusing it. See `benchmark_connections`.
+# Under ASGI every request runs its queries in a thread of its own, so a kept
+# connection would never be reused: it must be 0 there (core.E003).
+DATABASE_CONNECTIONS = {
+    "CONN_MAX_AGE": (
+        None
+        if os.environ.get("DATABASE_CONN_MAX_AGE", "").lower() == "none"
+        else int(
+            os.environ.get(
+                "DATABASE_CONN_MAX_AGE", 0 if WEB_INTERFACE == "asgi" else 60
+            )
+        )
+    ),
+    "CONN_HEALTH_CHECKS": (
+        os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "true").lower() == "true"
+    ),
+}
+
+if os.environ.get("DATABASE_ENGINE", "sqlite3") == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("POSTGRES_DB"),
+            "USER": os.environ.get("POSTGRES_USER"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
+            "HOST": os.environ.get("POSTGRES_HOST"),
+            "PORT": os.environ.get("POSTGRES_PORT"),
+            "OPTIONS": {
+                "connect_timeout": int(os.environ.get("POSTGRES_CONNECT_TIMEOUT", 5))
+            },
+            **DATABASE_CONNECTIONS,
+        },
+    }
+    # A streaming replica of `default`, only used when POSTGRES_REPLICA_HOST is set.
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ.get("POSTGRES_REPLICA_HOST"),
+        "PORT": os.environ.get(
+            "POSTGRES_REPLICA_PORT", os.environ.get("POSTGRES_PORT")
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICA_CONFIGURED = bool(os.environ.get("POSTGRES_REPLICA_HOST"))
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            **DATABASE_CONNECTIONS,
+        },
+        # A read replica of `default`, only used when DATABASE_REPLICA_NAME is set.
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DATABASE_REPLICA_NAME", BASE_DIR / "db.sqlite3"),
+            "TEST": {"MIRROR": "default"},
+            **DATABASE_CONNECTIONS,
+        },
+    }
+    DATABASE_REPLICA_CONFIGURED = bool(os.environ.get("DATABASE_REPLICA_NAME"))
+
+DATABASE_POOL = {
+    # Connections the database server accepts from this app, checked at startup
+    # against what the processes below may hold open. Unset skips the check.
+    "MAX_CONNECTIONS": (
+        int(os.environ["DATABASE_MAX_CONNECTIONS"])
+        if os.environ.get("DATABASE_MAX_CONNECTIONS")
+        else None
+    ),
+    # Worker processes and threads per process, gunicorn reads WEB_CONCURRENCY too.
+    "WORKERS": int(os.environ.get("WEB_CONCURRENCY", 1)),
+    "THREADS": int(os.environ.get("WEB_THREADS", 1)),
+    # Requests in flight per ASGI worker, uvicorn's --limit-concurrency. Each one
+    # holds its own connections, so unset leaves the demand unbounded.
+    "ASGI_CONCURRENCY": (
+        int(os.environ["UVICORN_LIMIT_CONCURRENCY"])
+        if os.environ.get("UVICORN_LIMIT_CONCURRENCY")
+        else None
+    ),
+}
+
+DATABASE_ROUTERS = ["core.db.ReplicaRouter"]
+
+DATABASE_REPLICATION = {
+    # The aliases the reads of the replica enabled views are spread over.
+    "REPLICAS": ["replica"] if DATABASE_REPLICA_CONFIGURED else [],
+    # Seconds a user's reads stay on the primary after they wrote. The pin lives
+    # in the default cache, which must be shared by the workers.
+    "STICKY_SECONDS": 5,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
-# DATABASES = {
-#     "default": {
-#         "ENGINE": "django.db.backends.postgresql",
-#         "NAME": os.environ.get("POSTGRES_DB"),
-#         "USER": os.environ.get("POSTGRES_USER"),
-#         "PASSWORD": os.environ.get(
-#             "POSTGRES_PASSWORD",
-#         ),
-#         "HOST": os.environ.get("POSTGRES_HOST"),
-#         "PORT": os.environ.get("POSTGRES_PORT"),
-#     }
-# }
+
+POST_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.environ.get("POST_CACHE_TIMEOUT", 300)),
+}
+
+COMPRESSION = {
+    # Bodies smaller than this many bytes aren't worth compressing.
+    "MIN_SIZE": 1024,
+    "CONTENT_TYPES": ["application/json", "application/x-ndjson", "text/"],
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+    # Compressed variants of cached bodies live alongside them.
+    "CACHE_ALIAS": POST_CACHE["ALIAS"],
+    "CACHE_TIMEOUT": POST_CACHE["TIMEOUT"],
+}
 
 
 # Password validation
@@ -159,6 +268,109 @@ REST_FRAMEWORK = {
         "authentication.authentication.JWTAuthentication",
     ],
     "EXCEPTION_HANDLER": "core.exception_handler.custom_exception_handler",
+    "DEFAULT_RENDERER_CLASSES": [
+        # Same output as DRF's JSONRenderer, encoded with orjson when installed.
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+PAGINATION = {
+    "PAGE_SIZE": int(os.environ.get("PAGINATION_PAGE_SIZE", 20)),
+    "MAX_PAGE_SIZE": int(os.environ.get("PAGINATION_MAX_PAGE_SIZE", 100)),
+}
+
+BACKGROUND_TASKS = {
+    "MAX_WORKERS": int(os.environ.get("BACKGROUND_MAX_WORKERS", 2)),
+    # Run tasks inline when the transaction commits, used by the tests.
+    "ALWAYS_EAGER": False,
+}
+
+FEED = {
+    "FAN_OUT_BATCH_SIZE": 1000,
+    # Authors with more followers than this are fanned out in the background.
+    "ASYNC_FAN_OUT_THRESHOLD": 500,
+    "BACKFILL_PER_AUTHOR": 20,
+}
+
+TRENDING = {
+    "HALF_LIFE_HOURS": 24,
+    # The first run scores the events of this window, older ones weigh less than
+    # 1/128 of a new one. Later runs only read the events added since.
+    "WINDOW_HOURS": 24 * 7,
+    # Events are only read once they are this old, so the rows of transactions
+    # that commit up to this late are not skipped.
+    "SETTLE_SECONDS": 60,
+    "LIKE_WEIGHT": 1.0,
+    "COMMENT_WEIGHT": 3.0,
+    # Scores that decayed below this are dropped to keep the ranking table small.
+    "MIN_SCORE": 0.01,
+    "CHUNK_SIZE": 10000,
+}
+
+JOBS = {
+    # Jobs claimed by the worker at a time, the emails of a batch share a connection.
+    "BATCH_SIZE": 50,
+    "POLL_INTERVAL": 1.0,
+    # Failed jobs are retried after 30s, 60s, 120s... and dead-lettered after this.
+    "MAX_ATTEMPTS": 5,
+    "RETRY_BACKOFF": 30,
+    "MAX_BACKOFF": 3600,
+    # Seconds before a job claimed by a worker that died is claimed again.
+    "LEASE": 300,
+}
+
+POST_PURGE = {
+    # Rows of a deleted post removed per statement, each in its own transaction.
+    "BATCH_SIZE": 1000,
+}
+
+LIKES = {
+    # Buffer like toggles in memory and write them to the database in batches.
+    # The buffer is per process, so this requires WEB_CONCURRENCY=1 (core.E001).
+    "WRITE_BEHIND": os.environ.get("LIKES_WRITE_BEHIND", "false").lower() == "true",
+    "FLUSH_INTERVAL": 1.0,
+    "MAX_PENDING": 10000,
+    "BATCH_SIZE": 400,
+}
+
+VIEWS = {
+    # Post views are counted in memory and written every FLUSH_INTERVAL seconds, or
+    # once MAX_PENDING posts were viewed. A crash loses at most one interval.
+    "FLUSH_INTERVAL": float(os.environ.get("VIEWS_FLUSH_INTERVAL", 5.0)),
+    "MAX_PENDING": 10000,
+    "BATCH_SIZE": 500,
+}
+
+BATCH = {
+    "MAX_ITEMS": 20,
+    # Batches of reads only run on this many threads, 1 runs them in order.
+    "READ_WORKERS": int(os.environ.get("BATCH_READ_WORKERS", 4)),
+}
+
+BULK = {
+    "MAX_ITEMS": 1000,
+    "BATCH_SIZE": 500,
+}
+
+PUBSUB = {
+    # LocalPubSub only reaches the subscribers of the current process, use
+    # core.pubsub.RedisPubSub with a PUBSUB_URL when serving from several processes.
+    "BACKEND": os.environ.get("PUBSUB_BACKEND", "core.pubsub.LocalPubSub"),
+    "OPTIONS": {"url": os.environ.get("PUBSUB_URL")},
+}
+
+SSE = {
+    # Seconds between keep-alive comments on an idle stream.
+    "HEARTBEAT": 15,
+    # Milliseconds clients wait before reconnecting.
+    "RETRY": 3000,
+    # Events a slow client may fall behind before its stream is reset.
+    "MAX_QUEUED": 100,
+    # Open streams per process.
+    "MAX_CONNECTIONS": 1000,
+    # Seconds after which a stream is closed and the client reconnects.
+    "MAX_DURATION": 300,
 }
 
 JWT_CONF = {
@@ -19,10 +19,14 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import BatchView, DatabaseStatsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("authentication.urls")),
     path("api/blogs/", include("blogs.urls")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("api/db/stats/", DatabaseStatsView.as_view(), name="db-stats"),
 ]
 
 if settings.DEBUG:
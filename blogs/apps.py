@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    # Migrations that rebuild `blogs_posts` on SQLite drop the index triggers.
+    from blogs.search import create_search_index
+
+    connection = connections[using]
+    if "blogs_posts" in connection.introspection.table_names():
+        create_search_index(connection)
 
 
 class BlogsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "blogs"
+
+    def ready(self):
+        post_migrate.connect(ensure_search_index, sender=self)
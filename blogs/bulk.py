@@ -0,0 +1,169 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from rest_framework import serializers
+
+from blogs.cache import invalidate_post
+from blogs.events import publish_post_event
+from blogs.models import Comments, FeedEntry, Posts
+from blogs.serializers import CommentSerializer, CreatePostSerializer
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    A primary key field resolving instances loaded up front, instead of running a
+    query per item.
+    """
+
+    def __init__(self, instances: dict, **kwargs):
+        self.instances = instances
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except ValidationError:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if pk not in self.instances:
+            self.fail("does_not_exist", pk_value=data)
+        return self.instances[pk]
+
+
+def preload_related(serializer: serializers.Serializer, items: list) -> None:
+    """
+    Load the objects referenced by the primary key fields of a serializer with one
+    query per field, and swap in fields resolving them from memory.
+
+    Args:
+        serializer (Serializer): The serializer of a single item.
+        items (list): The raw items.
+    """
+    for name, field in list(serializer.fields.items()):
+        if field.read_only or not isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+        queryset = field.get_queryset()
+        pks = set()
+        for item in items:
+            value = item.get(name) if isinstance(item, dict) else None
+            if isinstance(value, bool) or not isinstance(value, (int, str)):
+                continue
+            try:
+                pks.add(queryset.model._meta.pk.to_python(value))
+            except ValidationError:
+                continue
+        serializer.fields[name] = PreloadedPrimaryKeyRelatedField(
+            queryset.in_bulk(pks),
+            queryset=queryset,
+            required=field.required,
+            allow_null=field.allow_null,
+        )
+
+
+def validate_items(
+    serializer_class: type[serializers.Serializer], items: list
+) -> tuple[list[tuple[int, dict]], dict[int, dict]]:
+    """
+    Validate a list of items with `serializer_class(many=True)`, keeping the valid
+    items when some of them fail. Related objects are loaded for all items at once.
+
+    Args:
+        serializer_class (type[Serializer]): The serializer of a single item.
+        items (list): The raw items.
+
+    Returns:
+        tuple[list[tuple[int, dict]], dict[int, dict]]: The index and validated data
+        of each valid item, and the errors of each invalid item by index.
+    """
+    serializer = serializer_class(data=items, many=True)
+    preload_related(serializer.child, items)
+    if serializer.is_valid():
+        return list(enumerate(serializer.validated_data)), {}
+
+    errors = {index: error for index, error in enumerate(serializer.errors) if error}
+    # The list serializer discards everything once an item fails.
+    valid = [
+        (index, serializer.child.run_validation(item))
+        for index, item in enumerate(items)
+        if index not in errors
+    ]
+    return valid, errors
+
+
+def bulk_insert(model: type[models.Model], rows: list[dict], users: list) -> list:
+    """
+    Insert validated rows with `bulk_create`, in chunks of `BULK["BATCH_SIZE"]`.
+
+    Args:
+        model (type[Model]): The model to insert.
+        rows (list[dict]): The validated data of each row.
+        users (list[User]): The author of each row.
+
+    Returns:
+        list: The created instances, with their primary keys.
+    """
+    return model.objects.bulk_create(
+        [model(user=user, **row) for row, user in zip(rows, users)],
+        batch_size=settings.BULK["BATCH_SIZE"],
+    )
+
+
+def bulk_create_posts(items: list, users: list) -> tuple[dict[int, Posts], dict]:
+    """
+    Validate posts with `CreatePostSerializer` and insert the valid ones in one
+    transaction, then fan them out to the followers of their authors, in one batch
+    per author.
+
+    Args:
+        items (list): The raw posts.
+        users (list[User]): The author of each post.
+
+    Returns:
+        tuple[dict[int, Posts], dict[int, dict]]: The created posts and the errors
+        of the rejected ones, both by index.
+    """
+    valid, errors = validate_items(CreatePostSerializer, items)
+    with transaction.atomic():
+        posts = bulk_insert(
+            Posts, [row for _, row in valid], [users[index] for index, _ in valid]
+        )
+        # `bulk_create` doesn't send the `post_save` signal that fans posts out.
+        by_author = defaultdict(list)
+        for post in posts:
+            by_author[post.user_id].append(post)
+        for author_posts in by_author.values():
+            FeedEntry.objects.schedule_fan_out(author_posts)
+    return dict(zip((index for index, _ in valid), posts)), errors
+
+
+def bulk_create_comments(items: list, users: list) -> tuple[dict[int, Comments], dict]:
+    """
+    Validate comments with `CommentSerializer` and insert the valid ones in one
+    transaction, with a single counter update per commented post.
+
+    Args:
+        items (list): The raw comments.
+        users (list[User]): The author of each comment.
+
+    Returns:
+        tuple[dict[int, Comments], dict[int, dict]]: The created comments and the
+        errors of the rejected ones, both by index.
+    """
+    valid, errors = validate_items(CommentSerializer, items)
+    with transaction.atomic():
+        comments = bulk_insert(
+            Comments, [row for _, row in valid], [users[index] for index, _ in valid]
+        )
+        # `bulk_create` doesn't send the signals that keep the counters, the cache
+        # and the live updates.
+        for post_id, count in Counter(c.post_id for c in comments).items():
+            Posts.objects.filter(pk=post_id).adjust_counters(comments=count)
+            invalidate_post(post_id)
+        for comment in comments:
+            publish_post_event(
+                comment.post_id, "comment.created", CommentSerializer(comment).data
+            )
+    return dict(zip((index for index, _ in valid), comments)), errors
@@ -0,0 +1,161 @@
+import typing as t
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from core.compression import compressed_cache_keys
+from core.db import get_routing
+
+HITS_KEY = "blogs:post_cache:hits"
+MISSES_KEY = "blogs:post_cache:misses"
+
+
+def get_cache():
+    return caches[settings.POST_CACHE["ALIAS"]]
+
+
+def post_cache_key(post_id: int) -> str:
+    """
+    Get the cache key of the serialized payload of a post, cached with its version.
+
+    Args:
+        post_id (int): The id of the post.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"blogs:post:{post_id}"
+
+
+def can_fill() -> bool:
+    """
+    Tell whether the payload built by the current request may be cached. Payloads
+    read from a replica are not: the replica may still lag behind a write that
+    just invalidated the post, and the cached copy would hide the write from
+    everyone, its author included, until it expires.
+
+    Returns:
+        bool: True if the reads of the current request go to the primary.
+    """
+    state = get_routing()
+    return state is None or state.replica is None
+
+
+def get_or_build_post(
+    post_id: int, version: str, build: t.Callable[[], dict | None]
+) -> dict[str, t.Any] | None:
+    """
+    Read-through lookup of the serialized payload of a post.
+
+    The payload is cached along with the version of the post it was built for, and
+    only served for that version. A build that raced with a write may store an
+    outdated payload, but under the version read before the write, so it can't be
+    served behind the validators of the new one.
+
+    Args:
+        post_id (int): The id of the post.
+        version (str): The current version of the post, see `Posts.version`.
+        build (Callable[[], dict | None]): Builds the payload on a cache miss.
+            Returning None (e.g. for a missing post) skips caching, and so does
+            building it from a replica.
+
+    Returns:
+        dict[str, Any] | None: The serialized payload, or None if `build` returned None.
+    """
+    cache = get_cache()
+    key = post_cache_key(post_id)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        _increment(HITS_KEY)
+        return cached[1]
+
+    _increment(MISSES_KEY)
+    payload = build()
+    if payload is not None and can_fill():
+        cache.set(key, (version, payload), settings.POST_CACHE["TIMEOUT"])
+    return payload
+
+
+async def aget_or_build_post(
+    post_id: int, version: str, build: t.Callable[[], t.Awaitable[dict | None]]
+) -> dict[str, t.Any] | None:
+    """
+    Async counterpart of `get_or_build_post`.
+
+    Args:
+        post_id (int): The id of the post.
+        version (str): The current version of the post, see `Posts.version`.
+        build (Callable[[], Awaitable[dict | None]]): Builds the payload on a
+            cache miss. Returning None (e.g. for a missing post) skips caching, and
+            so does building it from a replica.
+
+    Returns:
+        dict[str, Any] | None: The serialized payload, or None if `build` returned None.
+    """
+    cache = get_cache()
+    key = post_cache_key(post_id)
+    cached = await cache.aget(key)
+    if cached is not None and cached[0] == version:
+        await _aincrement(HITS_KEY)
+        return cached[1]
+
+    await _aincrement(MISSES_KEY)
+    payload = await build()
+    if payload is not None and can_fill():
+        await cache.aset(key, (version, payload), settings.POST_CACHE["TIMEOUT"])
+    return payload
+
+
+def invalidate_post(post_id: int) -> None:
+    """
+    Drop the cached payload of a post, and the compressed responses made from it.
+
+    The entries are dropped right away and again once the surrounding transaction
+    commits, so a concurrent read cannot put back the state from before the write.
+
+    Args:
+        post_id (int): The id of the post.
+    """
+    key = post_cache_key(post_id)
+    keys = [key, *compressed_cache_keys(key)]
+    get_cache().delete_many(keys)
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
+
+
+def get_cache_stats() -> dict[str, int]:
+    """
+    Get the hit and miss counters of the post cache.
+
+    Returns:
+        dict[str, int]: The number of hits and misses and the hit ratio.
+    """
+    cache = get_cache()
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counters.get(HITS_KEY, 0), counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def _increment(key: str) -> None:
+    cache = get_cache()
+    # The counters never expire, `add` only creates them if they are missing.
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between `add` and `incr`, the count is best effort anyway.
+        cache.add(key, 1, timeout=None)
+
+
+async def _aincrement(key: str) -> None:
+    cache = get_cache()
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, timeout=None)
@@ -0,0 +1,130 @@
+import json
+import threading
+
+from django.apps import apps
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.pubsub import get_pubsub
+
+
+def post_channel(post_id: int) -> str:
+    """
+    Get the pub/sub channel of the live updates of a post.
+
+    Args:
+        post_id (int): The id of the post.
+
+    Returns:
+        str: The channel.
+    """
+    return f"blogs:post:{post_id}:events"
+
+
+def has_listeners(post_id: int) -> bool:
+    """
+    Tell whether anyone may be listening to the live updates of a post.
+
+    Args:
+        post_id (int): The id of the post.
+
+    Returns:
+        bool: False only if there is certainly no subscriber.
+    """
+    return get_pubsub().has_subscribers(post_channel(post_id))
+
+
+def publish_post_event(post_id: int, event: str, data: dict) -> None:
+    """
+    Publish an event to the live subscribers of a post once the current
+    transaction commits.
+
+    Args:
+        post_id (int): The id of the post.
+        event (str): The event type, e.g. "comment.created".
+        data (dict): The JSON serializable payload.
+    """
+    channel = post_channel(post_id)
+    message = {"event": event, "data": data}
+    transaction.on_commit(lambda: get_pubsub().publish(channel, message))
+
+
+def publish_like_counts(post_ids) -> None:
+    """
+    Publish the like counts of posts once the current transaction commits. The
+    counts are only read for posts someone may be listening to.
+
+    Args:
+        post_ids (Iterable[int]): The ids of the posts whose likes changed.
+    """
+    post_ids = list(post_ids)
+
+    def publish():
+        listened = [post_id for post_id in post_ids if has_listeners(post_id)]
+        if not listened:
+            return
+        counts = (
+            apps.get_model("blogs", "Posts")
+            .objects.filter(pk__in=listened)
+            .values_list("pk", "like_count")
+        )
+        pubsub = get_pubsub()
+        for post_id, like_count in counts:
+            pubsub.publish(
+                post_channel(post_id),
+                {
+                    "event": "likes",
+                    "data": {"post_id": post_id, "like_count": like_count},
+                },
+            )
+
+    transaction.on_commit(publish)
+
+
+class StreamSlots:
+    """
+    Count the event streams open in this process, up to a limit. The streams may
+    run on several event loops, in different threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+
+    def acquire(self, limit: int) -> bool:
+        """
+        Take a slot, if one is free.
+
+        Args:
+            limit (int): The number of streams that may be open at once.
+
+        Returns:
+            bool: Whether a slot was taken, to be released when the stream ends.
+        """
+        with self._lock:
+            if self.open >= limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.open -= 1
+
+
+stream_slots = StreamSlots()
+
+
+def format_event(event: str, data) -> str:
+    """
+    Encode an event in the Server-Sent Events format.
+
+    Args:
+        event (str): The event type.
+        data: The JSON serializable payload.
+
+    Returns:
+        str: The encoded event.
+    """
+    data = json.dumps(data, cls=JSONEncoder, separators=(",", ":"))
+    return f"event: {event}\ndata: {data}\n\n"
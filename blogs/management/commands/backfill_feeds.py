@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authentication.models import Follow
+from blogs.models import FeedEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the home feeds of users with the latest posts of the authors they follow."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Only backfill the feed of this user id. Can be repeated.",
+        )
+        parser.add_argument(
+            "--per-author",
+            type=int,
+            default=settings.FEED["BACKFILL_PER_AUTHOR"],
+            help="Number of posts copied per followed author.",
+        )
+
+    def handle(self, *args, **options):
+        follower_ids = options["users"] or (
+            Follow.objects.order_by("follower_id")
+            .values_list("follower_id", flat=True)
+            .distinct()
+        )
+        users, entries = 0, 0
+        for follower_id in follower_ids:
+            entries += FeedEntry.objects.backfill(
+                follower_id, per_author=options["per_author"]
+            )
+            users += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled {users} feeds with {entries} posts.")
+        )
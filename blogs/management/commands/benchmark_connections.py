@@ -0,0 +1,99 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+
+from authentication.authentication import JWTAuthentication
+from blogs.models import Posts
+
+User = get_user_model()
+
+MODES = {
+    "new connection per request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": False},
+    "persistent + health checks": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what persistent database connections save by serving the same "
+        "requests through the WSGI handler, which opens and closes connections like "
+        "a server does: with a new connection per request, with persistent "
+        "connections, and with persistent connections checked before reuse. Creates "
+        "and removes its own user and post."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(
+            username="benchmark-connections",
+            email="benchmark-connections@example.com",
+        )
+        post = Posts.objects.create(title="Benchmark", content="-", user=user)
+        access_token, _ = JWTAuthentication.create_tokens(user)
+        paths = [f"/api/blogs/getblog/{post.post_id}/", "/api/auth/profile/"]
+        originals = {
+            alias: {
+                key: connections[alias].settings_dict[key]
+                for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")
+            }
+            for alias in connections
+        }
+
+        try:
+            for name, conf in MODES.items():
+                for alias in connections:
+                    connections[alias].settings_dict.update(conf)
+                connections.close_all()
+                stats = self.run_requests(paths, access_token, options["requests"])
+                self.stdout.write(
+                    f"{name}: {stats['rps']:.0f} req/s, "
+                    f"mean {stats['mean']:.2f}ms per request, "
+                    f"{stats['connections']} connections opened, "
+                    f"{stats['errors']} errors"
+                )
+        finally:
+            for alias, conf in originals.items():
+                connections[alias].settings_dict.update(conf)
+            connections.close_all()
+            user.delete()
+
+    def run_requests(self, paths: list[str], token: str, total: int) -> dict:
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        opened = errors = 0
+
+        def count(**kwargs):
+            nonlocal opened
+            opened += 1
+
+        connection_created.connect(count)
+        try:
+            started = time.perf_counter()
+            for index in range(total):
+                environ = factory.get(
+                    paths[index % len(paths)],
+                    HTTP_HOST="localhost",
+                    HTTP_AUTHORIZATION=f"Bearer {token}",
+                ).environ
+                response = handler(environ, lambda status, headers: None)
+                errors += response.status_code != 200
+                # Closing the response fires `request_finished`, which closes the
+                # expired connections.
+                response.close()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count)
+        return {
+            "rps": total / elapsed,
+            "mean": elapsed / total * 1000,
+            "connections": opened,
+            "errors": errors,
+        }
@@ -0,0 +1,168 @@
+import importlib.util
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.authentication import JWTAuthentication
+from blogs.models import Comments, Posts
+
+User = get_user_model()
+
+SERVERS = {
+    "wsgi": {
+        "module": "gunicorn",
+        "args": ["backend.wsgi:application", "--workers", "{workers}"],
+        "bind": ["--bind", "127.0.0.1:{port}"],
+        "prefix": "",
+    },
+    "asgi": {
+        "module": "uvicorn",
+        "args": ["backend.asgi:application", "--workers", "{workers}"],
+        "bind": ["--host", "127.0.0.1", "--port", "{port}", "--log-level", "warning"],
+        "prefix": "async/",
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput and latency of the read endpoints served by the sync "
+        "views under WSGI (gunicorn) and the async views under ASGI (uvicorn), with "
+        "the same number of worker processes. Creates and removes its own user, post "
+        "and comment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--wsgi-url",
+            help="Benchmark an already running WSGI server instead of starting one.",
+        )
+        parser.add_argument(
+            "--asgi-url",
+            help="Benchmark an already running ASGI server instead of starting one.",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.create(
+            username="benchmark-reads", email="benchmark-reads@example.com"
+        )
+        post = Posts.objects.create(title="Benchmark", content="-", user=user)
+        comment = Comments.objects.create(post=post, user=user, c_content="-")
+        access_token, _ = JWTAuthentication.create_tokens(user)
+
+        try:
+            for name, server in SERVERS.items():
+                paths = [
+                    # Expanding skips the post cache, so every read hits the database.
+                    f"/api/blogs/{server['prefix']}getblog/{post.post_id}/"
+                    "?expand=comments,liked_by_me",
+                    f"/api/blogs/{server['prefix']}readcomment/{comment.id}/",
+                    f"/api/auth/{server['prefix']}profile/",
+                ]
+                url = options[f"{name}_url"]
+                process = None
+                if not url:
+                    process, url = self.start_server(server, options["workers"])
+                try:
+                    stats = self.run_load(
+                        url.rstrip("/"),
+                        paths,
+                        access_token,
+                        options["requests"],
+                        options["concurrency"],
+                    )
+                finally:
+                    if process:
+                        process.terminate()
+                        process.wait()
+                self.stdout.write(
+                    f"{name.upper()} ({options['workers']} workers, "
+                    f"concurrency {options['concurrency']}): "
+                    f"{stats['rps']:.0f} req/s, p50 {stats['p50']:.1f}ms, "
+                    f"p99 {stats['p99']:.1f}ms, {stats['errors']} errors"
+                )
+        finally:
+            user.delete()
+
+    def start_server(self, server: dict, workers: int) -> tuple[subprocess.Popen, str]:
+        if importlib.util.find_spec(server["module"]) is None:
+            raise CommandError(
+                f"{server['module']} is not installed, install it or pass the URL of "
+                "a running server."
+            )
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        values = {"workers": workers, "port": port}
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                server["module"],
+                *(arg.format(**values) for arg in server["args"] + server["bind"]),
+            ]
+        )
+        url = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                urlopen(url, timeout=1)
+            except HTTPError:
+                # Any response, the root path is a 404, means the server is up.
+                return process, url
+            except OSError:
+                time.sleep(0.1)
+        process.terminate()
+        raise CommandError(f"{server['module']} didn't start.")
+
+    def run_load(
+        self, url: str, paths: list[str], token: str, total: int, concurrency: int
+    ) -> dict[str, float]:
+        latencies, errors = [], 0
+        lock = Lock()
+
+        def fetch(index: int) -> None:
+            nonlocal errors
+            request = Request(
+                url + paths[index % len(paths)],
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            started = time.perf_counter()
+            try:
+                with urlopen(request, timeout=30) as response:
+                    response.read()
+                failed = False
+            except OSError:
+                failed = True
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                errors += failed
+
+        # Warm up the workers and their database connections.
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(fetch, range(concurrency)))
+        latencies, errors = [], 0
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "rps": total / elapsed,
+            "p50": latencies[len(latencies) // 2] * 1000,
+            "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+            "errors": errors,
+        }
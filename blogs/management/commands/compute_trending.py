@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blogs.trending import compute_trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the trending post scores with the likes and comments added since "
+        "the last run. Meant to be run periodically, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        stats = compute_trending()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {stats['likes']} likes and {stats['comments']} comments, "
+                f"{stats['posts']} posts updated."
+            )
+        )
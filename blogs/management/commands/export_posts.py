@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from blogs.export import decode_cursor, export_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Export posts as newline delimited JSON, with a tombstone for each deleted "
+        "post."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only export posts updated after this ISO 8601 timestamp.",
+        )
+        parser.add_argument(
+            "--cursor",
+            help="Only export the changes after the line of a previous export that "
+            "carried this cursor.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write to. Defaults to stdout.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched per database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("--since must be an ISO 8601 timestamp.")
+
+        if options["cursor"]:
+            try:
+                decode_cursor(options["cursor"])
+            except ValueError as error:
+                raise CommandError(str(error))
+
+        lines = export_posts(
+            since=since, chunk_size=options["chunk_size"], cursor=options["cursor"]
+        )
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w") as output:
+            output.writelines(lines)
@@ -0,0 +1,92 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from blogs.bulk import bulk_create_comments, bulk_create_posts
+
+User = get_user_model()
+
+IMPORTERS = {"posts": bulk_create_posts, "comments": bulk_create_comments}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import posts or comments from a newline delimited JSON file. Every line is "
+        "an item as accepted by the create endpoints, plus the `user` (username) "
+        "authoring it. Invalid lines are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to import.")
+        parser.add_argument("--type", choices=IMPORTERS, default="posts")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.BULK["MAX_ITEMS"],
+            help="Number of lines validated and inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        bulk_create = IMPORTERS[options["type"]]
+        created = failed = 0
+        try:
+            file = open(options["path"])
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with file:
+            chunk = []
+            for number, line in enumerate(file, start=1):
+                if line.strip():
+                    chunk.append((number, line))
+                if len(chunk) == options["chunk_size"]:
+                    created, failed = self.import_chunk(
+                        bulk_create, chunk, created, failed
+                    )
+                    chunk = []
+            if chunk:
+                created, failed = self.import_chunk(bulk_create, chunk, created, failed)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} {options['type']}, {failed} failed."
+            )
+        )
+
+    def import_chunk(self, bulk_create, chunk, created: int, failed: int):
+        items, errors = [], {}
+        for number, line in chunk:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                errors[number] = "Invalid JSON."
+                continue
+            if not isinstance(item, dict) or not isinstance(item.get("user"), str):
+                errors[number] = "Expected an object with a `user`."
+                continue
+            items.append((number, item))
+
+        users = User.objects.in_bulk(
+            {item["user"] for _, item in items}, field_name="username"
+        )
+        authored = []
+        for number, item in items:
+            if item["user"] in users:
+                authored.append((number, item))
+            else:
+                errors[number] = "Unknown user."
+
+        if authored:
+            inserted, rejected = bulk_create(
+                [item for _, item in authored],
+                [users[item["user"]] for _, item in authored],
+            )
+            created += len(inserted)
+            for index, error in rejected.items():
+                errors[authored[index][0]] = error
+
+        for number in sorted(errors):
+            self.stderr.write(f"Line {number}: {errors[number]}")
+        return created, failed + len(errors)
@@ -0,0 +1,76 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+
+from blogs.models import Likes, Posts
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the like toggle of one post from many threads and check that the "
+        "like counter and the likes table stay consistent. Creates and removes its "
+        "own users and post."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--toggles", type=int, default=25, help="Per user.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--retries", type=int, default=20)
+
+    def handle(self, *args, **options):
+        users = [
+            User.objects.create(
+                username=f"loadtest-{i}", email=f"loadtest-{i}@example.com"
+            )
+            for i in range(options["users"])
+        ]
+        post = Posts.objects.create(title="Load test", content="-", user=users[0])
+
+        # Every user toggles many times, in random order, so the same (user, post)
+        # pair is regularly toggled from several threads at once.
+        work = [user.id for user in users for _ in range(options["toggles"])]
+        random.shuffle(work)
+
+        def toggle(user_id: int) -> float:
+            started = time.perf_counter()
+            for attempt in range(options["retries"]):
+                try:
+                    Likes.objects.toggle(user_id, post.post_id)
+                    break
+                except OperationalError:
+                    # SQLite allows a single writer, back off and try again.
+                    time.sleep(0.001 * (attempt + 1))
+            else:
+                raise CommandError("Toggle kept failing, giving up.")
+            connections.close_all()
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            latencies = sorted(executor.map(toggle, work))
+        elapsed = time.perf_counter() - started
+
+        try:
+            post.refresh_from_db()
+            likes = Likes.objects.filter(post=post)
+            actual = likes.count()
+            distinct = likes.values("user").distinct().count()
+            self.stdout.write(
+                f"{len(work)} toggles in {elapsed:.2f}s "
+                f"({len(work) / elapsed:.0f}/s, "
+                f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms). "
+                f"like_count={post.like_count}, likes={actual}, users={distinct}"
+            )
+            if post.like_count != actual or distinct != actual:
+                raise CommandError("Like counts are inconsistent!")
+            self.stdout.write(self.style.SUCCESS("Like counts are consistent."))
+        finally:
+            post.delete()
+            User.objects.filter(pk__in=[user.id for user in users]).delete()
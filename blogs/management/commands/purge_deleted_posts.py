@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blogs.models import Posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge the soft deleted posts with their comments and likes. Deleting a post "
+        "purges it in the background, this picks up the posts whose purge was lost."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help='Number of rows deleted per statement. Defaults to POST_PURGE["BATCH_SIZE"].',
+        )
+
+    def handle(self, *args, **options):
+        purged = Posts.all_objects.filter(deleted_at__isnull=False).purge(
+            options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} posts."))
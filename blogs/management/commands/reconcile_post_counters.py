@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from blogs.models import Posts
+
+
+class Command(BaseCommand):
+    help = "Repair the like and comment counters of posts that drifted from the child tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts checked per query. Defaults to 1000.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_pk, checked, repaired = 0, 0, 0
+
+        while True:
+            pks = list(
+                Posts.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            repaired += Posts.objects.filter(pk__in=pks).reconcile_counters()
+            checked += len(pks)
+            last_pk = pks[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} posts, repaired {repaired}.")
+        )
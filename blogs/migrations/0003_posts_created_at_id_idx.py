@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0002_alter_comments_post_alter_comments_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                fields=["-created_at", "-post_id"], name="posts_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Posts = apps.get_model("blogs", "Posts")
+    Comments = apps.get_model("blogs", "Comments")
+    Likes = apps.get_model("blogs", "Likes")
+
+    def count_of(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(post=OuterRef("pk"))
+                .order_by()
+                .values("post")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+
+    Posts.objects.update(like_count=count_of(Likes), comment_count=count_of(Comments))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0003_posts_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="posts",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0004_posts_like_count_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
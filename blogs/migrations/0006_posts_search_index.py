@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from blogs.search import create_search_index, drop_search_index
+
+
+def forwards(apps, schema_editor):
+    create_search_index(schema_editor.connection, rebuild=True)
+
+
+def backwards(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0005_posts_last_activity_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
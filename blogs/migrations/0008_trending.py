@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:54
+
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_posted_at(apps, schema_editor):
+    # The best guess for the existing comments, edits moved their `created_at`.
+    Comments = apps.get_model("blogs", "Comments")
+    Comments.objects.using(schema_editor.connection.alias).update(
+        posted_at=F("created_at")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0007_feedentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comments",
+            name="posted_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_posted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comments",
+            index=models.Index(fields=["posted_at"], name="comments_posted_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="likes",
+            index=models.Index(fields=["created_at"], name="likes_created_at_idx"),
+        ),
+        migrations.CreateModel(
+            name="TrendingState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("events_until", models.DateTimeField(blank=True, null=True)),
+                ("scored_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TrendingPost",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending",
+                        serialize=False,
+                        to="blogs.posts",
+                    ),
+                ),
+                ("score", models.FloatField()),
+            ],
+            options={
+                "indexes": [models.Index(fields=["-score"], name="trending_score_idx")],
+            },
+        ),
+    ]
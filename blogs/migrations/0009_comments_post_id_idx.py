@@ -0,0 +1,16 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0008_trending"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comments",
+            index=models.Index(fields=["post", "id"], name="comments_post_id_idx"),
+        ),
+    ]
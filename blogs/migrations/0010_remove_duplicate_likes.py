@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:57
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    Posts = apps.get_model("blogs", "Posts")
+    Likes = apps.get_model("blogs", "Likes")
+
+    duplicates = (
+        Likes.objects.values("user", "post")
+        .annotate(first_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for duplicate in list(duplicates):
+        Likes.objects.filter(user=duplicate["user"], post=duplicate["post"]).exclude(
+            id=duplicate["first_id"]
+        ).delete()
+        post = Posts.objects.get(pk=duplicate["post"])
+        post.like_count = Likes.objects.filter(post=post).count()
+        post.save(update_fields=["like_count"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0009_comments_post_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+    ]
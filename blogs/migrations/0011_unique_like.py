@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0010_remove_duplicate_likes"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="likes",
+            constraint=models.UniqueConstraint(
+                fields=("user", "post"), name="unique_like"
+            ),
+        ),
+    ]
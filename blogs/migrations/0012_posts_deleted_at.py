@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0011_unique_like"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="posts_deleted_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0012_posts_deleted_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posts",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0013_posts_view_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="posts",
+            index=models.Index(
+                fields=["updated_at", "post_id"], name="posts_updated_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blogs", "0014_posts_updated_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostTombstone",
+            fields=[
+                ("post_id", models.IntegerField(primary_key=True, serialize=False)),
+                ("deleted_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at", "post_id"],
+                        name="tombstones_deleted_at_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,10 +1,316 @@
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest, Now
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from authentication.models import Follow
+from blogs.cache import invalidate_post
+from blogs.events import has_listeners, publish_like_counts, publish_post_event
+from core.background import run_in_background
+from core.buffer import CounterBuffer, WriteBuffer
 
 # Create your models here.
 
 
+class PostQuerySet(models.QuerySet):
+    def for_read(self, expand=(), fields=None, viewer=None) -> "PostQuerySet":
+        """
+        Plan the queries needed to serialize posts with `PostSerializer`.
+
+        The author is joined in and only the expanded relations are prefetched (the
+        comments together with their authors), so reading any number of posts costs
+        a fixed number of queries. When `fields` is given, only those columns are
+        loaded. Expanding "liked_by_me" annotates whether `viewer` liked each post
+        within the same query, taking the likes still in `like_buffer` into account.
+
+        Args:
+            expand (Iterable[str]): The relations to prefetch, any of "comments"
+                and "likes", and "liked_by_me". Defaults to none.
+            fields (Iterable[str], optional): The post fields to load. Defaults to
+                all of them.
+            viewer (User, optional): The user reading the posts.
+
+        Returns:
+            PostQuerySet: The planned queryset.
+        """
+        queryset = self
+        if fields is None:
+            queryset = queryset.select_related("user")
+        else:
+            if "user" in fields:
+                queryset = queryset.select_related("user")
+            queryset = queryset.only(
+                *("user__username" if field == "user" else field for field in fields)
+            )
+        if "comments" in expand:
+            queryset = queryset.prefetch_related(
+                models.Prefetch(
+                    "comment_post", queryset=Comments.objects.select_related("user")
+                )
+            )
+        if "likes" in expand:
+            queryset = queryset.prefetch_related("like_post")
+        if "liked_by_me" in expand:
+            queryset = queryset.annotate(liked_by_me=self._liked_by(viewer))
+        return queryset
+
+    def for_rows(self, expand=(), fields=None, viewer=None) -> "PostQuerySet":
+        """
+        Plan a `values()` projection of posts for `blogs.rows.build_post_rows`, the
+        serializer-free counterpart of `for_read`. The related comments and likes
+        are loaded by `build_post_rows` itself.
+
+        Args:
+            expand (Iterable[str]): Only "liked_by_me" matters here. Defaults to
+                none.
+            fields (Iterable[str], optional): The post fields to load. Defaults to
+                all of them. The pagination columns are always loaded.
+            viewer (User, optional): The user reading the posts.
+
+        Returns:
+            PostQuerySet: The planned queryset, yielding dicts.
+        """
+        if fields is None:
+            columns = {field.attname for field in self.model._meta.concrete_fields}
+            columns.add("user__username")
+        else:
+            columns = {"post_id", "created_at"}
+            columns.update(
+                "user__username" if field == "user" else field for field in fields
+            )
+        queryset = self
+        if "liked_by_me" in expand:
+            queryset = queryset.annotate(liked_by_me=self._liked_by(viewer))
+            columns.add("liked_by_me")
+        return queryset.values(*columns)
+
+    @staticmethod
+    def _liked_by(viewer) -> models.Expression:
+        """
+        Build the expression telling whether `viewer` liked a post, taking the likes
+        still in `like_buffer` into account.
+        """
+        if viewer is None or not viewer.is_authenticated:
+            return models.Value(False)
+        liked = models.Exists(
+            Likes.objects.filter(post=OuterRef("pk"), user_id=viewer.id)
+        )
+        pending = {
+            post_id: state
+            for (user_id, post_id), state in like_buffer.items()
+            if user_id == viewer.id
+        }
+        if not pending:
+            return liked
+        return models.Case(
+            *(
+                models.When(
+                    pk__in=[pk for pk in pending if pending[pk] is state],
+                    then=models.Value(state),
+                )
+                for state in (True, False)
+            ),
+            default=liked,
+            output_field=models.BooleanField(),
+        )
+
+    def adjust_counters(self, likes: int = 0, comments: int = 0) -> int:
+        """
+        Atomically shift the denormalized like and comment counters and stamp the
+        activity time.
+
+        Args:
+            likes (int): The change in the number of likes. Defaults to 0.
+            comments (int): The change in the number of comments. Defaults to 0.
+
+        Returns:
+            int: The number of posts updated.
+        """
+        changes = {}
+        if likes:
+            changes["like_count"] = Greatest(F("like_count") + likes, 0)
+        if comments:
+            changes["comment_count"] = Greatest(F("comment_count") + comments, 0)
+        if not changes:
+            return 0
+        # The incremental exports carry the counters and resume from `updated_at`.
+        return self.update(last_activity_at=Now(), updated_at=Now(), **changes)
+
+    def add_views(self, counts: dict[int, int]) -> int:
+        """
+        Add buffered views to the view counters, `VIEWS["BATCH_SIZE"]` posts per
+        UPDATE. Views of posts deleted in the meantime are dropped.
+
+        Unlike the other counters, the views don't stamp the activity time: a view
+        doesn't change the post, so cached copies and validators stay valid.
+
+        Args:
+            counts (dict[int, int]): The number of new views, by post id.
+
+        Returns:
+            int: The number of posts updated.
+        """
+        batch_size = settings.VIEWS["BATCH_SIZE"]
+        post_ids = sorted(counts)
+        updated = 0
+        for start in range(0, len(post_ids), batch_size):
+            chunk = post_ids[start : start + batch_size]
+            views = models.Case(
+                *(models.When(pk=pk, then=models.Value(counts[pk])) for pk in chunk),
+                output_field=models.PositiveBigIntegerField(),
+            )
+            updated += self.filter(pk__in=chunk).update(
+                view_count=F("view_count") + views
+            )
+        return updated
+
+    def touch(self) -> int:
+        """
+        Stamp the activity time after a change to a comment or like of the posts.
+
+        Returns:
+            int: The number of posts updated.
+        """
+        return self.update(last_activity_at=Now())
+
+    def with_actual_counts(self) -> "PostQuerySet":
+        """
+        Annotate each post with its like and comment counts counted from the child tables.
+
+        Returns:
+            PostQuerySet: The annotated queryset.
+        """
+
+        def count_of(model):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(post=OuterRef("pk"))
+                    .order_by()
+                    .values("post")
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+
+        return self.annotate(
+            actual_like_count=count_of(Likes),
+            actual_comment_count=count_of(Comments),
+        )
+
+    def reconcile_counters(self) -> int:
+        """
+        Repair the counters of the posts in this queryset that drifted from the
+        child tables.
+
+        Returns:
+            int: The number of posts repaired.
+        """
+        drifted = self.with_actual_counts().filter(
+            ~Q(like_count=F("actual_like_count"))
+            | ~Q(comment_count=F("actual_comment_count"))
+        )
+        repaired = 0
+        for post in drifted.only("pk"):
+            if Posts.objects.filter(pk=post.pk).update(
+                like_count=post.actual_like_count,
+                comment_count=post.actual_comment_count,
+                updated_at=Now(),
+            ):
+                repaired += 1
+                # The UPDATE bypasses the model signals.
+                invalidate_post(post.pk)
+        return repaired
+
+    def soft_delete(self) -> int:
+        """
+        Delete posts without touching their comments and likes: the posts are only
+        marked deleted, which hides them from every read right away, and are purged
+        in the background by `purge`. The request deleting a post costs the same
+        however much engagement the post has.
+
+        Returns:
+            int: The number of posts deleted.
+        """
+        post_ids = list(
+            self.filter(deleted_at__isnull=True).values_list("pk", flat=True)
+        )
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            deleted = Posts.all_objects.filter(
+                pk__in=post_ids, deleted_at__isnull=True
+            ).update(deleted_at=now)
+            PostTombstone.objects.bulk_create(
+                [
+                    PostTombstone(post_id=post_id, deleted_at=now)
+                    for post_id in post_ids
+                ],
+                ignore_conflicts=True,
+            )
+        if not deleted:
+            return 0
+        for post_id in post_ids:
+            invalidate_post(post_id)
+            publish_post_event(post_id, "post.deleted", {"post_id": post_id})
+        # The posts left behind by a lost task are purged by `purge_deleted_posts`.
+        run_in_background(Posts.all_objects.filter(pk__in=post_ids).purge)
+        return deleted
+
+    def purge(self, batch_size: int | None = None) -> int:
+        """
+        Hard delete the soft deleted posts in this queryset.
+
+        The comments, likes, feed entries and trending score of each post are
+        deleted first, at most `POST_PURGE["BATCH_SIZE"]` rows per statement and
+        each statement in its own transaction, so no lock is held for long. The post
+        goes last, cascading to whatever was added in the meantime.
+
+        Args:
+            batch_size (int, optional): The number of rows deleted per statement.
+                Defaults to `POST_PURGE["BATCH_SIZE"]`.
+
+        Returns:
+            int: The number of posts purged.
+        """
+        batch_size = batch_size or settings.POST_PURGE["BATCH_SIZE"]
+        post_ids = list(
+            self.filter(deleted_at__isnull=False).values_list("pk", flat=True)
+        )
+        purged = 0
+        for post_id in post_ids:
+            for model in (Comments, Likes, FeedEntry, TrendingPost):
+                self._delete_children(model, post_id, batch_size)
+            _, deleted = Posts.all_objects.filter(pk=post_id).delete()
+            purged += deleted.get(Posts._meta.label, 0)
+        return purged
+
+    def _delete_children(
+        self, model: type[models.Model], post_id: int, batch_size: int
+    ) -> None:
+        children = model.objects.filter(post_id=post_id).values_list("pk", flat=True)
+        pk_column = model._meta.pk.column
+        while pks := list(children[:batch_size]):
+            # Raw statements skip the model signals, which would only update the
+            # post being removed.
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {model._meta.db_table} WHERE {pk_column} IN "
+                    f"({', '.join(['%s'] * len(pks))})",
+                    pks,
+                )
+
+
+class LivePostManager(models.Manager.from_queryset(PostQuerySet)):
+    """The manager of the posts that were not soft deleted."""
+
+    def get_queryset(self) -> PostQuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Posts(models.Model):
     post_id = models.AutoField(primary_key=True)
     title = models.CharField(max_length=50, blank=False)
@@ -14,10 +320,60 @@ class Posts(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="post"
     )  # reference from Users
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    # Written in batches from `view_buffer`, behind by up to `VIEWS["FLUSH_INTERVAL"]`.
+    view_count = models.PositiveBigIntegerField(default=0)
+    # Last change to the comments or likes, used with `updated_at` for validators.
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    # Set by `soft_delete`, the post is hidden until it is purged.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LivePostManager()
+    # Includes the soft deleted posts.
+    all_objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the blog list.
+            models.Index(
+                fields=["-created_at", "-post_id"], name="posts_created_at_id_idx"
+            ),
+            # Backs the ordering and `since` filter of the export.
+            models.Index(
+                fields=["updated_at", "post_id"], name="posts_updated_at_id_idx"
+            ),
+            # Finds the posts waiting to be purged.
+            models.Index(
+                fields=["deleted_at"],
+                condition=Q(deleted_at__isnull=False),
+                name="posts_deleted_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @property
+    def last_modified(self):
+        if self.last_activity_at and self.last_activity_at > self.updated_at:
+            return self.last_activity_at
+        return self.updated_at
+
+    @property
+    def version(self) -> str:
+        # Changes with every write to the post or its comments and likes, the
+        # buffered views aside. Needs the columns loaded by the detail views.
+        return "|".join(
+            str(value)
+            for value in (
+                self.updated_at.isoformat(),
+                self.last_activity_at and self.last_activity_at.isoformat(),
+                self.like_count,
+                self.comment_count,
+            )
+        )
+
 
 class Comments(models.Model):
     post = models.ForeignKey(
@@ -28,11 +384,172 @@ class Comments(models.Model):
     )  # reference from Users
     c_content = models.TextField()
     created_at = models.DateTimeField(auto_now=True)
+    # Unlike `created_at`, not changed by edits.
+    posted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of a post's comments, by id as
+            # `created_at` changes when a comment is edited.
+            models.Index(fields=["post", "id"], name="comments_post_id_idx"),
+            # Backs the incremental reads of `compute_trending`.
+            models.Index(fields=["posted_at"], name="comments_posted_at_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user}/{self.post}"
 
 
+class LikeQuerySet(models.QuerySet):
+    def toggle(self, user_id: int, post_id: int) -> bool | None:
+        """
+        Like a post, or remove the like if the user already liked it.
+
+        The toggle is a DELETE, followed by an INSERT only when nothing was deleted,
+        plus one counter UPDATE. It stays correct under concurrent requests: the
+        unique constraint on (user, post) rejects a racing duplicate INSERT, which
+        is then treated as already liked.
+
+        With `LIKES["WRITE_BEHIND"]` the toggle only reads, and the new state is
+        recorded in `like_buffer` to be written later by `apply_buffered`.
+
+        Args:
+            user_id (int): The id of the user.
+            post_id (int): The id of the post.
+
+        Returns:
+            bool | None: True if the post is now liked, False if the like was
+            removed, None if the post doesn't exist.
+        """
+        if settings.LIKES["WRITE_BEHIND"]:
+            return self._toggle_buffered(user_id, post_id)
+
+        posts = Posts.objects.filter(pk=post_id)
+        with transaction.atomic(using=self.db):
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {self.model._meta.db_table} "
+                    "WHERE user_id = %s AND post_id = %s",
+                    [user_id, post_id],
+                )
+                deleted = cursor.rowcount
+            if deleted:
+                if not posts.adjust_counters(likes=-deleted):
+                    # The post is soft deleted, its likes are left to the purge.
+                    transaction.set_rollback(True, using=self.db)
+                    return None
+                liked = False
+            elif not posts.adjust_counters(likes=1):
+                return None
+            else:
+                try:
+                    with transaction.atomic(using=self.db):
+                        self.bulk_create([Likes(user_id=user_id, post_id=post_id)])
+                except IntegrityError:
+                    # A concurrent request inserted the like first.
+                    posts.adjust_counters(likes=-1)
+                liked = True
+        # The raw statements bypass the model signals.
+        invalidate_post(post_id)
+        publish_like_counts([post_id])
+        return liked
+
+    def _toggle_buffered(self, user_id: int, post_id: int) -> bool | None:
+        stored = (
+            Posts.objects.filter(pk=post_id)
+            .annotate(
+                liked=models.Exists(self.filter(user_id=user_id, post=OuterRef("pk")))
+            )
+            .values_list("liked", flat=True)
+            .first()
+        )
+        if stored is None:
+            return None
+        return like_buffer.update(
+            (user_id, post_id),
+            lambda pending: not (stored if pending is None else pending),
+        )
+
+    def liked_post_ids(self, user_id: int, post_ids) -> list[int]:
+        """
+        Find which of the given posts a user liked, including the buffered likes.
+
+        Args:
+            user_id (int): The id of the user.
+            post_ids (Iterable[int]): The ids of the posts.
+
+        Returns:
+            list[int]: The ids of the liked posts, in ascending order.
+        """
+        liked = set(
+            self.filter(
+                user_id=user_id, post_id__in=post_ids, post__deleted_at__isnull=True
+            ).values_list("post_id", flat=True)
+        )
+        for post_id in post_ids:
+            pending = like_buffer.get((user_id, post_id))
+            if pending is True:
+                liked.add(post_id)
+            elif pending is False:
+                liked.discard(post_id)
+        return sorted(liked)
+
+    def apply_buffered(self, changes: dict[tuple[int, int], bool]) -> None:
+        """
+        Write a batch of buffered like states, in chunks of `LIKES["BATCH_SIZE"]`.
+
+        Likes are inserted with `bulk_create` and removed with a DELETE per chunk,
+        then the counters of the affected posts are recounted. Likes of posts or
+        users deleted in the meantime are dropped.
+
+        Args:
+            changes (dict[tuple[int, int], bool]): Whether each (user id, post id)
+                pair should be liked.
+        """
+        batch_size = settings.LIKES["BATCH_SIZE"]
+        user_model = self.model._meta.get_field("user").related_model
+        with transaction.atomic(using=self.db):
+            post_ids = set(
+                Posts.objects.filter(
+                    pk__in={post_id for _, post_id in changes}
+                ).values_list("pk", flat=True)
+            )
+            user_ids = set(
+                user_model.objects.filter(
+                    pk__in={user_id for user_id, _ in changes}
+                ).values_list("pk", flat=True)
+            )
+            liked, unliked = [], []
+            for (user_id, post_id), state in changes.items():
+                if post_id in post_ids and user_id in user_ids:
+                    (liked if state else unliked).append((user_id, post_id))
+
+            self.bulk_create(
+                [Likes(user_id=user_id, post_id=post_id) for user_id, post_id in liked],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            with connections[self.db].cursor() as cursor:
+                for start in range(0, len(unliked), batch_size):
+                    chunk = unliked[start : start + batch_size]
+                    cursor.execute(
+                        f"DELETE FROM {self.model._meta.db_table} WHERE "
+                        + " OR ".join(["(user_id = %s AND post_id = %s)"] * len(chunk)),
+                        [value for pair in chunk for value in pair],
+                    )
+
+            posts = Posts.objects.filter(
+                pk__in={post_id for _, post_id in liked + unliked}
+            )
+            posts.touch()
+            posts.reconcile_counters()
+        # The bulk statements bypass the model signals.
+        touched = {post_id for _, post_id in liked + unliked}
+        for post_id in touched:
+            invalidate_post(post_id)
+        publish_like_counts(touched)
+
+
 class Likes(models.Model):
     post = models.ForeignKey(
         Posts, on_delete=models.CASCADE, related_name="like_post"
@@ -41,3 +558,264 @@ class Likes(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="like_user"
     )  # reference from Users
     created_at = models.DateTimeField(auto_now=True)
+
+    objects = LikeQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # Also serves as the (user, post) index for "did I like this" lookups.
+            models.UniqueConstraint(fields=["user", "post"], name="unique_like"),
+        ]
+        indexes = [
+            # Backs the incremental reads of `compute_trending`.
+            models.Index(fields=["created_at"], name="likes_created_at_idx"),
+        ]
+
+
+# Like states waiting to be written, keyed by (user id, post id).
+like_buffer = WriteBuffer(
+    lambda changes: Likes.objects.apply_buffered(changes), setting="LIKES"
+)
+
+
+# Views waiting to be added to the counters, keyed by post id.
+view_buffer = CounterBuffer(
+    lambda counts: Posts.objects.add_views(counts), setting="VIEWS"
+)
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    def fan_out(self, posts: list[Posts]) -> int:
+        """
+        Write new posts of one author into the feeds of the author's followers, in
+        batches of `FEED["FAN_OUT_BATCH_SIZE"]`. The followers are read once
+        whatever the number of posts.
+
+        Args:
+            posts (list[Posts]): The new posts, all by the same author.
+
+        Returns:
+            int: The number of followers the posts were fanned out to.
+        """
+        batch_size = settings.FEED["FAN_OUT_BATCH_SIZE"]
+        follower_ids = (
+            Follow.objects.filter(following_id=posts[0].user_id)
+            .values_list("follower_id", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+        batch, total = [], 0
+        for follower_id in follower_ids:
+            batch.extend(
+                FeedEntry(user_id=follower_id, post=post, created_at=post.created_at)
+                for post in posts
+            )
+            total += 1
+            if len(batch) >= batch_size:
+                self._insert_entries(batch)
+                batch = []
+        self._insert_entries(batch)
+        return total
+
+    def schedule_fan_out(self, posts: list[Posts]) -> None:
+        """
+        Fan out new posts of one author inline, or in a single background task for
+        authors with more than `FEED["ASYNC_FAN_OUT_THRESHOLD"]` followers.
+
+        Args:
+            posts (list[Posts]): The new posts, all by the same author.
+        """
+        threshold = settings.FEED["ASYNC_FAN_OUT_THRESHOLD"]
+        followers = Follow.objects.filter(following_id=posts[0].user_id)
+        if followers[: threshold + 1].count() > threshold:
+            run_in_background(self.fan_out, posts)
+        else:
+            self.fan_out(posts)
+
+    def backfill(self, follower_id: int, author_ids=None, per_author=None) -> int:
+        """
+        Copy the latest posts of followed authors into a user's feed.
+
+        Args:
+            follower_id (int): The id of the user whose feed is filled.
+            author_ids (Iterable[int], optional): The authors to copy posts from.
+                Defaults to every author the user follows.
+            per_author (int, optional): The number of posts copied per author.
+                Defaults to `FEED["BACKFILL_PER_AUTHOR"]`.
+
+        Returns:
+            int: The number of posts considered.
+        """
+        if author_ids is None:
+            author_ids = Follow.objects.filter(follower_id=follower_id).values_list(
+                "following_id", flat=True
+            )
+        per_author = per_author or settings.FEED["BACKFILL_PER_AUTHOR"]
+        total = 0
+        for author_id in author_ids:
+            posts = Posts.objects.filter(user_id=author_id).order_by(
+                "-created_at", "-post_id"
+            )[:per_author]
+            total += self._insert_entries(
+                [
+                    FeedEntry(
+                        user_id=follower_id, post=post, created_at=post.created_at
+                    )
+                    for post in posts.only("post_id", "created_at")
+                ]
+            )
+        return total
+
+    def _insert_entries(self, entries: list["FeedEntry"]) -> int:
+        if entries:
+            self.bulk_create(entries, ignore_conflicts=True)
+        return len(entries)
+
+
+class FeedEntry(models.Model):
+    """A post materialized into the home feed of one of its author's followers."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="feed_entries"
+    )  # owner of the feed
+    post = models.ForeignKey(
+        Posts, on_delete=models.CASCADE, related_name="feed_entries"
+    )  # reference from Posts
+    created_at = models.DateTimeField()  # copied from the post for ordering
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"], name="unique_feed_entry"),
+        ]
+        indexes = [
+            # Backs the keyset pagination of a user's feed.
+            models.Index(
+                fields=["user", "-created_at", "-post"], name="feed_user_created_idx"
+            ),
+        ]
+
+
+class TrendingPost(models.Model):
+    """The time-decayed engagement score of a post, computed by `compute_trending`."""
+
+    post = models.OneToOneField(
+        Posts, on_delete=models.CASCADE, primary_key=True, related_name="trending"
+    )  # reference from Posts
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=["-score"], name="trending_score_idx")]
+
+
+class TrendingState(models.Model):
+    """Bookkeeping of the last `compute_trending` run, a single row."""
+
+    # The likes and comments up to this time are included in the scores.
+    events_until = models.DateTimeField(null=True, blank=True)
+    # The time the stored scores are decayed to.
+    scored_at = models.DateTimeField(null=True, blank=True)
+
+
+class PostTombstone(models.Model):
+    """The deletion of a post, for the incremental exports to pass on."""
+
+    post_id = models.IntegerField(primary_key=True)
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "post_id"], name="tombstones_deleted_at_idx"
+            )
+        ]
+
+
+@receiver(post_save, sender=Posts)
+def fan_out_post(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        FeedEntry.objects.schedule_fan_out([instance])
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_author(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        FeedEntry.objects.backfill(instance.follower_id, [instance.following_id])
+
+
+@receiver(post_delete, sender=Follow)
+def remove_unfollowed_author(sender, instance, **kwargs):
+    FeedEntry.objects.filter(
+        user_id=instance.follower_id, post__user_id=instance.following_id
+    ).delete()
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_save, sender=Likes)
+def increment_post_counters(sender, instance, created, **kwargs):
+    posts = Posts.objects.filter(pk=instance.post_id)
+    if created:
+        field = "likes" if sender is Likes else "comments"
+        posts.adjust_counters(**{field: 1})
+    else:
+        # An edited comment changes the post without changing its counters.
+        posts.touch()
+
+
+@receiver(post_delete, sender=Comments)
+@receiver(post_delete, sender=Likes)
+def decrement_post_counters(sender, instance, **kwargs):
+    # Also runs for cascade deletes, e.g. when a user and their likes are removed.
+    field = "likes" if sender is Likes else "comments"
+    Posts.objects.filter(pk=instance.post_id).adjust_counters(**{field: -1})
+
+
+@receiver(post_save, sender=Posts)
+@receiver(post_delete, sender=Posts)
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+@receiver(post_save, sender=Likes)
+@receiver(post_delete, sender=Likes)
+def invalidate_post_cache(sender, instance, **kwargs):
+    invalidate_post(instance.post_id)
+
+
+@receiver(post_save, sender=Comments)
+def publish_comment_saved(sender, instance, created, raw=False, **kwargs):
+    # The comment is only serialized for posts someone may be listening to.
+    if raw or not has_listeners(instance.post_id):
+        return
+    # Imported here, the serializers import this module.
+    from blogs.serializers import CommentSerializer
+
+    event = "comment.created" if created else "comment.updated"
+    publish_post_event(instance.post_id, event, CommentSerializer(instance).data)
+
+
+@receiver(post_delete, sender=Comments)
+def publish_comment_deleted(sender, instance, **kwargs):
+    publish_post_event(instance.post_id, "comment.deleted", {"id": instance.id})
+
+
+@receiver(post_save, sender=Likes)
+@receiver(post_delete, sender=Likes)
+def publish_like_count(sender, instance, **kwargs):
+    publish_like_counts([instance.post_id])
+
+
+@receiver(post_delete, sender=Posts)
+def record_post_deleted(sender, instance, **kwargs):
+    # Soft deleted posts got theirs from `soft_delete`.
+    if instance.deleted_at is None:
+        PostTombstone.objects.bulk_create(
+            [PostTombstone(post_id=instance.post_id, deleted_at=timezone.now())],
+            ignore_conflicts=True,
+        )
+
+
+@receiver(post_delete, sender=Posts)
+def publish_post_deleted(sender, instance, **kwargs):
+    # Soft deleted posts were announced by `soft_delete`.
+    if instance.deleted_at is not None:
+        return
+    publish_post_event(instance.post_id, "post.deleted", {"post_id": instance.post_id})
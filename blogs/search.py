@@ -0,0 +1,188 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Case, FloatField, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+
+# SQLite: an external content FTS5 table over `blogs_posts`, kept in sync by triggers.
+SQLITE_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_posts_fts USING fts5(
+        title, content, content='blogs_posts', content_rowid='post_id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_posts_fts_insert AFTER INSERT ON blogs_posts
+    BEGIN
+        INSERT INTO blogs_posts_fts (rowid, title, content)
+        VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_posts_fts_delete AFTER DELETE ON blogs_posts
+    BEGIN
+        INSERT INTO blogs_posts_fts (blogs_posts_fts, rowid, title, content)
+        VALUES ('delete', old.post_id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_posts_fts_update
+    AFTER UPDATE OF title, content ON blogs_posts
+    BEGIN
+        INSERT INTO blogs_posts_fts (blogs_posts_fts, rowid, title, content)
+        VALUES ('delete', old.post_id, old.title, old.content);
+        INSERT INTO blogs_posts_fts (rowid, title, content)
+        VALUES (new.post_id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_REBUILD_SQL = "INSERT INTO blogs_posts_fts (blogs_posts_fts) VALUES ('rebuild')"
+
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS blogs_posts_fts_insert",
+    "DROP TRIGGER IF EXISTS blogs_posts_fts_delete",
+    "DROP TRIGGER IF EXISTS blogs_posts_fts_update",
+    "DROP TABLE IF EXISTS blogs_posts_fts",
+]
+
+# Postgres: a generated `tsvector` column with a GIN index, maintained by the database.
+POSTGRES_INDEX_SQL = [
+    """
+    ALTER TABLE blogs_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS blogs_posts_search_vector_idx
+    ON blogs_posts USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS blogs_posts_search_vector_idx",
+    "ALTER TABLE blogs_posts DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_search_index(connection, rebuild: bool = False) -> None:
+    """
+    Create the full-text index of posts for the database behind `connection`.
+
+    Safe to run repeatedly. On SQLite it also restores the sync triggers, which are
+    lost whenever a migration rebuilds the `blogs_posts` table.
+
+    Args:
+        connection: The database connection.
+        rebuild (bool): Whether to re-index all posts (SQLite only). Defaults to False.
+    """
+    if connection.vendor == "sqlite":
+        statements = SQLITE_INDEX_SQL + ([SQLITE_REBUILD_SQL] if rebuild else [])
+    elif connection.vendor == "postgresql":
+        statements = POSTGRES_INDEX_SQL
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def drop_search_index(connection) -> None:
+    """
+    Drop the full-text index of posts.
+
+    Args:
+        connection: The database connection.
+    """
+    statements = {"sqlite": SQLITE_DROP_SQL, "postgresql": POSTGRES_DROP_SQL}
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def to_sqlite_match(query: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all of its terms.
+
+    Every term is quoted so that FTS5 operators typed by users are taken literally.
+
+    Args:
+        query (str): The search text.
+
+    Returns:
+        str: The FTS5 MATCH expression.
+    """
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", query))
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter posts to those matching the search text and annotate them with a `rank`,
+    where a higher rank is a better match.
+
+    Databases without a full-text index fall back to a case-insensitive scan for
+    all of the terms, ranking title matches first.
+
+    Args:
+        queryset (QuerySet): The posts to search.
+        query (str): The search text.
+
+    Returns:
+        QuerySet: The matching posts, unordered.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        match = to_sqlite_match(query)
+        if not match:
+            return queryset.annotate(rank=Value(0.0)).none()
+        table = queryset.model._meta.db_table
+        # bm25() is lower for better matches; titles weigh more than content.
+        rank = RawSQL(
+            "SELECT -bm25(blogs_posts_fts, 4.0, 1.0) FROM blogs_posts_fts "
+            f'WHERE blogs_posts_fts MATCH %s AND rowid = "{table}"."post_id"',
+            [match],
+            output_field=FloatField(),
+        )
+        return queryset.filter(
+            post_id__in=RawSQL(
+                "SELECT rowid FROM blogs_posts_fts WHERE blogs_posts_fts MATCH %s",
+                [match],
+            )
+        ).annotate(rank=rank)
+
+    if vendor == "postgresql":
+        table = queryset.model._meta.db_table
+        tsquery = "websearch_to_tsquery('english', %s)"
+        return queryset.filter(
+            RawSQL(
+                f'"{table}"."search_vector" @@ {tsquery}',
+                [query],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            rank=RawSQL(
+                f'ts_rank_cd("{table}"."search_vector", {tsquery})',
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0)).none()
+    in_title = Q()
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(content__icontains=term)
+        )
+        in_title &= Q(title__icontains=term)
+    return queryset.annotate(
+        rank=Case(
+            When(in_title, then=Value(2.0)),
+            default=Value(1.0),
+            output_field=FloatField(),
+        )
+    )
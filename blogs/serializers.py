@@ -1,4 +1,5 @@
-from django.contrib.auth.models import User
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from .models import (
@@ -7,6 +8,8 @@ from .models import (
     Posts,
 )
 
+User = get_user_model()
+
 
 class LikeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,15 +22,26 @@ class LikeSerializer(serializers.ModelSerializer):
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comments
-        fields = "__all__"
+        # `posted_at` only serves the trending scores.
+        exclude = ("posted_at",)
 
         read_only_fields = ["user"]
 
 
+class CommentAuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "username")
+
+
+class PostCommentSerializer(CommentSerializer):
+    author = CommentAuthorSerializer(source="user", read_only=True)
+
+
 class CommentEditSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comments
-        fields = "__all__"
+        exclude = ("posted_at",)
 
         read_only_fields = ["user", "post"]
 
@@ -36,6 +50,14 @@ class PostSerializer(serializers.ModelSerializer):
     comment_post = CommentSerializer(many=True)
     like_post = LikeSerializer(many=True)
     user = serializers.CharField()
+    liked_by_me = serializers.BooleanField(read_only=True)
+
+    # Nested relations and viewer state, only serialized when asked for with `expand`.
+    expandable_fields = {
+        "comments": "comment_post",
+        "likes": "like_post",
+        "liked_by_me": "liked_by_me",
+    }
 
     class Meta:
         model = Posts
@@ -46,10 +68,48 @@ class PostSerializer(serializers.ModelSerializer):
             "content",
             "created_at",
             "updated_at",
+            "like_count",
+            "comment_count",
+            "view_count",
             "comment_post",
             "like_post",
+            "liked_by_me",
         )
 
+    def __init__(self, *args, expand=(), fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.expandable_fields.items():
+            if name not in expand:
+                self.fields.pop(field)
+        if fields is not None:
+            expanded = set(self.expandable_fields.values())
+            for field in set(self.fields) - set(fields) - expanded:
+                self.fields.pop(field)
+
+    @classmethod
+    def get_selectable_fields(cls) -> set[str]:
+        """
+        Get the fields a client can select with a sparse fieldset.
+
+        Returns:
+            set[str]: The field names.
+        """
+        return set(cls.Meta.fields) - set(cls.expandable_fields.values())
+
+
+class LikedPostsSerializer(serializers.Serializer):
+    post_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+
+    def validate_post_ids(self, value: list[int]) -> list[int]:
+        limit = settings.PAGINATION["MAX_PAGE_SIZE"]
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} post ids can be checked at once."
+            )
+        return value
+
 
 class CreatePostSerializer(serializers.ModelSerializer):
     class Meta:
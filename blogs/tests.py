@@ -1,3 +1,1859 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import sqlite3
+import tempfile
+import uuid
+from contextlib import closing
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from authentication.authentication import AsyncJWTAuthentication, JWTAuthentication
+from authentication.models import Follow
+from core.asgi import DisconnectMiddleware
+from core.checks import (
+    check_asgi_persistent_connections,
+    check_connection_pool,
+    get_connection_demand,
+)
+from core.compression import GzipCodec, negotiate
+from core.db import get_query_counts, reset_query_counts
+from core.middleware import ReplicaRoutingMiddleware
+from core.pubsub import get_pubsub
+from core.renderers import FastJSONRenderer, orjson
+
+from .bulk import bulk_create_comments, bulk_create_posts
+from .cache import get_cache, get_cache_stats, get_or_build_post, post_cache_key
+from .events import post_channel, stream_slots
+from .models import (
+    Comments,
+    FeedEntry,
+    Likes,
+    Posts,
+    TrendingPost,
+    like_buffer,
+    view_buffer,
+)
+from .rows import build_post_rows
+from .serializers import CommentSerializer, PostSerializer
+from .trending import compute_trending
+
+User = get_user_model()
+
+# The tests flush the view counts themselves instead of a background thread.
+views_flushed_inline = override_settings(
+    VIEWS={**settings.VIEWS, "FLUSH_INTERVAL": None}
+)
+
+
+def setUpModule():
+    views_flushed_inline.enable()
+
+
+def tearDownModule():
+    views_flushed_inline.disable()
+
+
+class BlogTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="author", email="author@example.com"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        # Drop the views counted by earlier tests, their posts are gone.
+        view_buffer.flush()
+
+    def create_posts(self, count: int, user=None) -> list[Posts]:
+        return [
+            Posts.objects.create(
+                title=f"Post {i}", content=f"Content {i}", user=user or self.user
+            )
+            for i in range(count)
+        ]
+
+    def create_engagement(self, posts: list[Posts], users: list) -> None:
+        for post in posts:
+            for user in users:
+                Comments.objects.create(post=post, user=user, c_content="Nice post")
+                Likes.objects.create(post=post, user=user)
+
+    def create_users(self, count: int) -> list:
+        return [
+            User.objects.create_user(
+                username=f"reader{i}", email=f"reader{i}@example.com"
+            )
+            for i in range(count)
+        ]
+
+
+class GetBlogPaginationTests(BlogTestCase):
+    url = "/api/blogs/getblog/"
+
+    def test_walks_pages_forward_and_back(self):
+        posts = self.create_posts(5)
+        expected = [post.post_id for post in reversed(posts)]
+
+        seen, cursor, pages = [], None, []
+        while True:
+            params = {"page_size": 2, **({"cursor": cursor} if cursor else {})}
+            data = self.client.get(self.url, params).json()["data"]
+            pages.append(data)
+            seen += [post["post_id"] for post in data["results"]]
+            cursor = data["next"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(
+            self.url, {"page_size": 2, "cursor": pages[2]["previous"]}
+        ).json()["data"]
+        self.assertEqual(previous["results"], pages[1]["results"])
+        self.assertIsNotNone(previous["next"])
+
+    def test_page_size_is_capped(self):
+        self.create_posts(3)
+        with self.settings(PAGINATION={"PAGE_SIZE": 1, "MAX_PAGE_SIZE": 2}):
+            data = self.client.get(self.url, {"page_size": 50}).json()["data"]
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class BlogQueryCountTests(BlogTestCase):
+    """
+    Reading posts must cost a fixed number of queries, however many posts, comments
+    and likes are involved.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.posts = self.create_posts(10)
+        self.create_engagement(self.posts, self.create_users(3))
+
+    def test_list_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/blogs/getblog/", {"page_size": 10})
+        self.assertEqual(len(response.json()["data"]["results"]), 10)
+
+    def test_expanded_list_query_count(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                "/api/blogs/getblog/", {"page_size": 10, "expand": "comments,likes"}
+            )
+        self.assertEqual(len(response.json()["data"]["results"][0]["like_post"]), 3)
+
+    def test_detail_query_count(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/blogs/getblog/{self.posts[0].post_id}/")
+        self.assertEqual(len(response.json()["data"]["comment_post"]), 3)
+
+    def test_read_comment_query_count(self):
+        comment = Comments.objects.first()
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/blogs/readcomment/{comment.id}/")
+        self.assertEqual(response.status_code, 200)
+
+
+class PostCounterTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.reader = self.create_users(1)[0]
+        self.client.force_authenticate(self.reader)
+
+    def get_counts(self) -> tuple[int, int]:
+        self.post.refresh_from_db()
+        return self.post.like_count, self.post.comment_count
+
+    def test_like_toggle_updates_counter(self):
+        url = f"/api/blogs/likepost/{self.post.post_id}/"
+        self.client.put(url)
+        self.assertEqual(self.get_counts(), (1, 0))
+        self.client.put(url)
+        self.assertEqual(self.get_counts(), (0, 0))
+
+    def test_comment_create_and_delete_update_counter(self):
+        response = self.client.post(
+            "/api/blogs/createcomment/",
+            {"post": self.post.post_id, "c_content": "Hello"},
+        )
+        self.assertEqual(self.get_counts(), (0, 1))
+        self.client.delete(f"/api/blogs/deletecomment/{response.json()['data']['id']}/")
+        self.assertEqual(self.get_counts(), (0, 0))
+
+    def test_cascade_delete_updates_counter(self):
+        self.create_engagement([self.post], [self.reader])
+        self.assertEqual(self.get_counts(), (1, 1))
+        self.reader.delete()
+        self.assertEqual(self.get_counts(), (0, 0))
+
+    def test_list_returns_counts_without_arrays(self):
+        self.create_engagement([self.post], [self.reader])
+        post = self.client.get("/api/blogs/getblog/").json()["data"]["results"][0]
+        self.assertEqual((post["like_count"], post["comment_count"]), (1, 1))
+        self.assertNotIn("comment_post", post)
+        self.assertNotIn("like_post", post)
+
+    def test_unknown_expansion(self):
+        response = self.client.get("/api/blogs/getblog/", {"expand": "authors"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_reconcile_command_repairs_drift(self):
+        self.create_engagement([self.post], [self.reader])
+        Posts.objects.filter(pk=self.post.pk).update(like_count=7, comment_count=0)
+        out = StringIO()
+        key = post_cache_key(self.post.pk)
+        get_cache().set(key, ("version", {"like_count": 7}))
+        call_command("reconcile_post_counters", stdout=out)
+        self.assertEqual(self.get_counts(), (1, 1))
+        self.assertIn("repaired 1", out.getvalue())
+        self.assertIsNone(get_cache().get(key))
+
+
+class PostCacheTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.url = f"/api/blogs/getblog/{self.post.post_id}/"
+        self.client.force_authenticate(self.user)
+
+    def test_detail_is_served_from_cache(self):
+        self.client.get(self.url)
+        # Only the validator lookup reaches the database.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()["data"]["title"], "Post 0")
+        self.assertEqual(get_cache_stats()["hits"], 1)
+        self.assertEqual(get_cache_stats()["misses"], 1)
+
+    def test_writes_invalidate_cache(self):
+        self.client.get(self.url)
+        self.client.put(
+            f"/api/blogs/createblog/{self.post.post_id}/",
+            {"title": "Edited", "content": "Edited"},
+        )
+        self.assertEqual(self.client.get(self.url).json()["data"]["title"], "Edited")
+
+        self.client.put(f"/api/blogs/likepost/{self.post.post_id}/")
+        self.assertEqual(self.client.get(self.url).json()["data"]["like_count"], 1)
+
+        comment = self.client.post(
+            "/api/blogs/createcomment/",
+            {"post": self.post.post_id, "c_content": "First"},
+        ).json()["data"]
+        self.assertEqual(self.client.get(self.url).json()["data"]["comment_count"], 1)
+
+        self.client.put(
+            f"/api/blogs/editcomment/{comment['id']}/", {"c_content": "Edited"}
+        )
+        data = self.client.get(self.url).json()["data"]
+        self.assertEqual(data["comment_post"][0]["c_content"], "Edited")
+
+        self.client.delete(f"/api/blogs/deleteblog/{self.post.post_id}/")
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+    def test_fills_racing_a_write_are_not_served(self):
+        version = Posts.objects.get(pk=self.post.pk).version
+        stale = self.client.get(self.url).json()["data"]
+        self.client.put(f"/api/blogs/likepost/{self.post.post_id}/")
+        # A read that loaded the post before the like fills the cache after it.
+        get_or_build_post(self.post.post_id, version, lambda: stale)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["data"]["like_count"], 1)
+        self.assertEqual(get_cache_stats()["hits"], 0)
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(cached.json(), response.json())
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_stats_require_admin(self):
+        self.assertEqual(self.client.get("/api/blogs/cache/stats/").status_code, 403)
+
+
+class ConditionalGetTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.url = f"/api/blogs/getblog/{self.post.post_id}/"
+        self.client.force_authenticate(self.user)
+
+    def test_post_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        self.assertIn("Last-Modified", response.headers)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_post_etag_changes_with_children(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        self.client.put(f"/api/blogs/likepost/{self.post.post_id}/")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        etag = response.headers["ETag"]
+        comment = Comments.objects.create(post=self.post, user=self.user, c_content="a")
+        etag_after_comment = self.client.get(self.url).headers["ETag"]
+        self.assertNotEqual(etag_after_comment, etag)
+
+        comment.c_content = "b"
+        comment.save()
+        self.assertNotEqual(
+            self.client.get(self.url).headers["ETag"], etag_after_comment
+        )
+
+    def test_etag_depends_on_representation(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.get(
+            self.url, {"expand": "likes"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_comment_not_modified(self):
+        comment = Comments.objects.create(post=self.post, user=self.user, c_content="a")
+        url = f"/api/blogs/readcomment/{comment.id}/"
+        etag = self.client.get(url).headers["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class SearchBlogTests(BlogTestCase):
+    url = "/api/blogs/search/"
+
+    def setUp(self):
+        super().setUp()
+        self.django = Posts.objects.create(
+            title="Django tips", content="Querysets and caching", user=self.user
+        )
+        self.python = Posts.objects.create(
+            title="Python", content="Writing django apps in python", user=self.user
+        )
+        Posts.objects.create(title="Rust", content="Ownership", user=self.user)
+
+    def search(self, query: str, **params) -> dict:
+        return self.client.get(self.url, {"q": query, **params}).json()["data"]
+
+    def ids(self, data: dict) -> list[int]:
+        return [post["post_id"] for post in data["results"]]
+
+    def test_results_are_ranked(self):
+        self.assertEqual(
+            self.ids(self.search("django")), [self.django.post_id, self.python.post_id]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        self.python.title = "Snakes"
+        self.python.content = "Nothing to see"
+        self.python.save()
+        self.assertEqual(self.ids(self.search("django")), [self.django.post_id])
+        self.assertEqual(self.ids(self.search("snakes")), [self.python.post_id])
+
+        self.django.delete()
+        self.assertEqual(self.ids(self.search("django")), [])
+
+    def test_counter_updates_do_not_break_index(self):
+        Likes.objects.create(post=self.django, user=self.user)
+        self.assertEqual(self.ids(self.search("caching")), [self.django.post_id])
+
+    def test_cursor_pagination(self):
+        first = self.search("django", page_size=1)
+        second = self.search("django", page_size=1, cursor=first["next"])
+        self.assertEqual(
+            self.ids(first) + self.ids(second),
+            [self.django.post_id, self.python.post_id],
+        )
+        self.assertIsNone(second["next"])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(self.ids(self.search('"django" OR NEAR(')), [])
+        self.assertEqual(self.ids(self.search("!?")), [])
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+    def test_falls_back_to_a_scan_without_full_text_index(self):
+        with mock.patch.object(connections["default"], "vendor", "mysql"):
+            self.assertEqual(
+                self.ids(self.search("Django")),
+                [self.django.post_id, self.python.post_id],
+            )
+            self.assertEqual(
+                self.ids(self.search("django caching")), [self.django.post_id]
+            )
+            self.assertEqual(self.ids(self.search("!?")), [])
+
+
+class FeedTests(BlogTestCase):
+    url = "/api/blogs/feed/"
+
+    def setUp(self):
+        super().setUp()
+        self.reader = self.create_users(1)[0]
+        self.client.force_authenticate(self.reader)
+
+    def feed_ids(self, **params) -> list[int]:
+        data = self.client.get(self.url, params).json()["data"]
+        return [post["post_id"] for post in data["results"]]
+
+    def test_follow_backfills_and_new_posts_fan_out(self):
+        old = self.create_posts(2)
+        self.client.put(f"/api/auth/follow/{self.user.id}/")
+        new = self.create_posts(1)[0]
+
+        with self.assertNumQueries(1):
+            ids = self.feed_ids()
+        self.assertEqual(ids, [new.post_id, old[1].post_id, old[0].post_id])
+
+    def test_unfollow_and_delete_remove_entries(self):
+        self.client.put(f"/api/auth/follow/{self.user.id}/")
+        post = self.create_posts(2)[0]
+        post.delete()
+        self.assertEqual(len(self.feed_ids()), 1)
+
+        self.client.put(f"/api/auth/follow/{self.user.id}/")
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_large_fan_out_runs_in_background(self):
+        Follow.objects.create(follower=self.reader, following=self.user)
+        feed = {"FAN_OUT_BATCH_SIZE": 1, "ASYNC_FAN_OUT_THRESHOLD": 0}
+        with self.settings(
+            FEED={**feed, "BACKFILL_PER_AUTHOR": 20},
+            BACKGROUND_TASKS={"MAX_WORKERS": 1, "ALWAYS_EAGER": True},
+        ):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                post = self.create_posts(1)[0]
+            self.assertEqual(self.feed_ids(), [])
+            for callback in callbacks:
+                callback()
+        self.assertEqual(self.feed_ids(), [post.post_id])
+
+    def test_cannot_follow_self(self):
+        response = self.client.put(f"/api/auth/follow/{self.reader.id}/")
+        self.assertEqual(response.status_code, 400)
+
+    def test_backfill_command(self):
+        Follow.objects.create(follower=self.reader, following=self.user)
+        posts = self.create_posts(3)
+        FeedEntry.objects.all().delete()
+        call_command("backfill_feeds", "--per-author", "2", stdout=StringIO())
+        self.assertEqual(self.feed_ids(), [posts[2].post_id, posts[1].post_id])
+
+
+class TrendingTests(BlogTestCase):
+    url = "/api/blogs/trending/"
+
+    def setUp(self):
+        super().setUp()
+        self.quiet, self.busy = self.create_posts(2)
+        self.readers = self.create_users(3)
+        self.create_engagement([self.busy], self.readers)
+        Likes.objects.create(post=self.quiet, user=self.readers[0])
+
+    def test_ranking_is_served_in_one_query(self):
+        with self.settings(TRENDING={**settings.TRENDING, "SETTLE_SECONDS": 0}):
+            call_command("compute_trending", stdout=StringIO())
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url).json()["data"]
+        self.assertEqual(
+            [post["post_id"] for post in data],
+            [self.busy.post_id, self.quiet.post_id],
+        )
+
+    def test_runs_are_incremental_and_decay(self):
+        now = timezone.now() + timedelta(minutes=1)
+        self.assertEqual(compute_trending(now)["likes"], 4)
+        score = TrendingPost.objects.get(post=self.quiet).score
+
+        later = now + timedelta(hours=1)
+        with self.settings(TRENDING={**settings.TRENDING, "HALF_LIFE_HOURS": 1}):
+            stats = compute_trending(later)
+        self.assertEqual((stats["likes"], stats["comments"]), (0, 0))
+        self.assertAlmostEqual(
+            TrendingPost.objects.get(post=self.quiet).score, score / 2, places=3
+        )
+
+        comment = Comments.objects.create(
+            post=self.quiet, user=self.user, c_content="New"
+        )
+        Comments.objects.filter(pk=comment.pk).update(posted_at=later)
+        with CaptureQueriesContext(connection) as queries:
+            stats = compute_trending(later + timedelta(minutes=2))
+        self.assertEqual((stats["comments"], stats["posts"]), (1, 1))
+        self.assertGreater(TrendingPost.objects.get(post=self.quiet).score, score / 2)
+        # Only the post with new events is written, the others are decayed in place.
+        inserts = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "blogs_trendingpost"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertIn("ON CONFLICT", inserts[0])
+        self.assertEqual(TrendingPost.objects.count(), 2)
+
+    def test_edited_comments_are_not_scored_again(self):
+        now = timezone.now() + timedelta(minutes=1)
+        compute_trending(now)
+        score = TrendingPost.objects.get(post=self.busy).score
+
+        comment = Comments.objects.filter(post=self.busy).first()
+        comment.c_content = "Edited"
+        comment.save()
+        stats = compute_trending(now + timedelta(minutes=5))
+        self.assertEqual(stats["comments"], 0)
+        self.assertLessEqual(TrendingPost.objects.get(post=self.busy).score, score)
+
+    def test_events_wait_to_settle(self):
+        now = timezone.now()
+        self.assertEqual(compute_trending(now)["likes"], 0)
+        settled = now + timedelta(seconds=settings.TRENDING["SETTLE_SECONDS"])
+        self.assertEqual(compute_trending(settled)["likes"], 4)
+
+    def test_decayed_scores_are_dropped(self):
+        now = timezone.now() + timedelta(minutes=1)
+        compute_trending(now)
+        with self.settings(TRENDING={**settings.TRENDING, "MIN_SCORE": 0.5}):
+            compute_trending(now + timedelta(hours=24))
+        self.assertEqual(
+            list(TrendingPost.objects.values_list("post_id", flat=True)),
+            [self.busy.post_id],
+        )
+
+
+class ExportTests(BlogTestCase):
+    url = "/api/blogs/export/"
+
+    def setUp(self):
+        super().setUp()
+        self.posts = self.create_posts(3)
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def read(self, response) -> list[dict]:
+        body = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_ndjson(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = self.read(response)
+        self.assertEqual(
+            [row["post_id"] for row in rows], [p.post_id for p in self.posts]
+        )
+        self.assertEqual(rows[0]["user"], "author")
+
+    def test_since_filters_on_updated_at(self):
+        cutoff = timezone.now()
+        Posts.objects.filter(pk=self.posts[0].pk).update(
+            updated_at=cutoff + timedelta(seconds=1)
+        )
+        rows = self.read(self.client.get(self.url, {"since": cutoff.isoformat()}))
+        self.assertEqual([row["post_id"] for row in rows], [self.posts[0].post_id])
+
+    def test_cursor_resumes_after_posts_changed_at_the_same_time(self):
+        changed_at = timezone.now().replace(microsecond=123456)
+        Posts.objects.update(updated_at=changed_at)
+        rows = self.read(self.client.get(self.url))
+        self.assertEqual(parse_datetime(rows[0]["updated_at"]), changed_at)
+
+        rows = self.read(self.client.get(self.url, {"cursor": rows[0]["cursor"]}))
+        self.assertEqual(
+            [row["post_id"] for row in rows], [p.post_id for p in self.posts[1:]]
+        )
+        response = self.client.get(self.url, {"cursor": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_counter_changes_and_deletions_are_exported(self):
+        cursor = self.read(self.client.get(self.url))[-1]["cursor"]
+        self.assertEqual(self.read(self.client.get(self.url, {"cursor": cursor})), [])
+
+        liked, deleted = self.posts[:2]
+        Likes.objects.toggle(self.admin.id, liked.post_id)
+        Posts.objects.filter(pk=deleted.pk).soft_delete()
+        rows = self.read(self.client.get(self.url, {"cursor": cursor}))
+        self.assertEqual(
+            [(row["post_id"], row["deleted"]) for row in rows],
+            [(liked.post_id, False), (deleted.post_id, True)],
+        )
+        self.assertEqual(rows[0]["like_count"], 1)
+        self.assertEqual(set(rows[1]), {"post_id", "deleted", "deleted_at", "cursor"})
+
+        # Hard deletes, e.g. cascading from their author, leave a tombstone too.
+        post_id = self.posts[2].post_id
+        self.posts[2].delete()
+        rows = self.read(self.client.get(self.url, {"cursor": rows[-1]["cursor"]}))
+        self.assertEqual(
+            [(row["post_id"], row["deleted"]) for row in rows], [(post_id, True)]
+        )
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("export_posts", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+class SparseFieldsetTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.create_engagement([self.post], self.create_users(2))
+
+    def test_list_loads_and_serializes_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(
+                "/api/blogs/getblog/", {"fields": "title,post_id"}
+            ).json()["data"]
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"content"', queries[0]["sql"])
+        self.assertNotIn("authentication_user", queries[0]["sql"])
+        self.assertEqual(
+            data["results"], [{"post_id": self.post.post_id, "title": "Post 0"}]
+        )
+
+        # Cursors still work with a sparse fieldset.
+        self.create_posts(2)
+        first = self.client.get(
+            "/api/blogs/getblog/", {"fields": "title", "page_size": 2}
+        ).json()["data"]
+        second = self.client.get(
+            "/api/blogs/getblog/",
+            {"fields": "title", "page_size": 2, "cursor": first["next"]},
+        ).json()["data"]
+        self.assertEqual(len(first["results"] + second["results"]), 3)
+
+    def test_detail_with_fields_and_expansion(self):
+        url = f"/api/blogs/getblog/{self.post.post_id}/"
+        data = self.client.get(url, {"fields": "user", "expand": "likes"}).json()[
+            "data"
+        ]
+        self.assertEqual(set(data), {"user", "like_post"})
+        self.assertEqual(data["user"], "author")
+
+        with self.assertNumQueries(2):
+            data = self.client.get(url, {"fields": "title"}).json()["data"]
+        self.assertEqual(data, {"title": "Post 0"})
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/blogs/getblog/", {"fields": "password"})
+        self.assertEqual(response.status_code, 400)
+
+
+class PostCommentsTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.url = f"/api/blogs/posts/{self.post.post_id}/comments/"
+        self.comments = [
+            Comments.objects.create(post=self.post, user=self.user, c_content=str(i))
+            for i in range(5)
+        ]
+
+    def test_pages_comments_with_authors(self):
+        with self.assertNumQueries(1):
+            first = self.client.get(self.url, {"page_size": 3}).json()["data"]
+        second = self.client.get(
+            self.url, {"page_size": 3, "cursor": first["next"]}
+        ).json()["data"]
+
+        comments = first["results"] + second["results"]
+        self.assertEqual([c["id"] for c in comments], [c.id for c in self.comments])
+        self.assertEqual(
+            comments[0]["author"], {"id": self.user.id, "username": "author"}
+        )
+        self.assertIsNone(second["next"])
+
+    def test_edited_comments_keep_their_place(self):
+        first = self.client.get(self.url, {"page_size": 3}).json()["data"]
+        self.client.force_authenticate(self.user)
+        response = self.client.put(
+            f"/api/blogs/editcomment/{self.comments[0].id}/", {"c_content": "Edit"}
+        )
+        self.assertEqual(response.status_code, 200)
+        second = self.client.get(
+            self.url, {"page_size": 3, "cursor": first["next"]}
+        ).json()["data"]
+
+        comments = first["results"] + second["results"]
+        self.assertEqual([c["id"] for c in comments], [c.id for c in self.comments])
+
+    def test_missing_post(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/blogs/posts/0/comments/")
+        self.assertEqual(response.status_code, 400)
+
+
+class LikeToggleTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+
+    def statements(self, queries) -> list[str]:
+        return [
+            query["sql"]
+            for query in queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))
+        ]
+
+    def test_toggle_statements(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(Likes.objects.toggle(self.user.id, self.post.post_id))
+        self.assertEqual(len(self.statements(queries)), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(Likes.objects.toggle(self.user.id, self.post.post_id))
+        self.assertEqual(len(self.statements(queries)), 2)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_missing_post(self):
+        self.assertIsNone(Likes.objects.toggle(self.user.id, 0))
+        self.client.force_authenticate(self.user)
+        response = self.client.put("/api/blogs/likepost/0/")
+        self.assertEqual(response.status_code, 400)
+
+    def test_duplicate_likes_are_rejected(self):
+        Likes.objects.create(user=self.user, post=self.post)
+        with self.assertRaises(IntegrityError):
+            Likes.objects.create(user=self.user, post=self.post)
+
+
+@override_settings(
+    LIKES={
+        "WRITE_BEHIND": True,
+        "FLUSH_INTERVAL": None,
+        "MAX_PENDING": 1000,
+        "BATCH_SIZE": 2,
+    }
+)
+class WriteBehindLikeTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.posts = self.create_posts(3)
+        self.readers = self.create_users(3)
+        self.addCleanup(like_buffer.flush)
+
+    def test_toggles_are_buffered_and_collapsed(self):
+        post = self.posts[0]
+        with self.assertNumQueries(1):
+            self.assertTrue(Likes.objects.toggle(self.user.id, post.post_id))
+        self.assertFalse(Likes.objects.toggle(self.user.id, post.post_id))
+        self.assertTrue(Likes.objects.toggle(self.user.id, post.post_id))
+        self.assertFalse(Likes.objects.filter(post=post).exists())
+        self.assertIsNone(Likes.objects.toggle(self.user.id, 0))
+
+        self.assertEqual(like_buffer.flush(), 1)
+        post.refresh_from_db()
+        self.assertEqual(post.like_count, 1)
+        self.assertEqual(Likes.objects.filter(post=post, user=self.user).count(), 1)
+        self.assertEqual(like_buffer.items(), [])
+
+    def test_reads_include_buffered_likes(self):
+        liked, unliked = self.posts[0], self.posts[1]
+        Likes.objects.create(post=unliked, user=self.user)
+        Likes.objects.toggle(self.user.id, liked.post_id)
+        Likes.objects.toggle(self.user.id, unliked.post_id)
+        self.client.force_authenticate(self.user)
+
+        post_ids = ",".join(str(post.post_id) for post in self.posts)
+        data = self.client.get("/api/blogs/likes/mine/", {"post_ids": post_ids}).json()
+        self.assertEqual(data["data"], {"liked": [liked.post_id]})
+
+        with self.assertNumQueries(1):
+            data = self.client.get(
+                "/api/blogs/getblog/", {"expand": "liked_by_me"}
+            ).json()["data"]
+        self.assertEqual(
+            {post["post_id"]: post["liked_by_me"] for post in data["results"]},
+            {post.post_id: post == liked for post in self.posts},
+        )
+
+    def test_flush_applies_likes_and_unlikes_in_batches(self):
+        for user in self.readers:
+            Likes.objects.create(post=self.posts[1], user=user)
+            Likes.objects.toggle(user.id, self.posts[0].post_id)
+            Likes.objects.toggle(user.id, self.posts[1].post_id)
+        Likes.objects.toggle(self.user.id, self.posts[2].post_id)
+        self.posts[2].delete()
+
+        self.assertEqual(like_buffer.flush(), 7)
+        counts = dict(Posts.objects.values_list("post_id", "like_count"))
+        self.assertEqual(counts, {self.posts[0].post_id: 3, self.posts[1].post_id: 0})
+        self.assertEqual(Likes.objects.filter(post=self.posts[1]).count(), 0)
+
+    def test_flush_invalidates_cached_posts(self):
+        post = self.posts[0]
+        url = f"/api/blogs/getblog/{post.post_id}/"
+        self.client.get(url)
+        Likes.objects.toggle(self.user.id, post.post_id)
+        like_buffer.flush()
+        self.assertEqual(self.client.get(url).json()["data"]["like_count"], 1)
+
+
+class LikeToggleLoadTests(TransactionTestCase):
+    def test_counts_stay_consistent_under_concurrency(self):
+        out = StringIO()
+        call_command(
+            "loadtest_likes",
+            "--users",
+            "5",
+            "--toggles",
+            "6",
+            "--threads",
+            "4",
+            stdout=out,
+        )
+        self.assertIn("Like counts are consistent.", out.getvalue())
+
+
+class LikedPostsTests(BlogTestCase):
+    url = "/api/blogs/likes/mine/"
+
+    def setUp(self):
+        super().setUp()
+        self.posts = self.create_posts(4)
+        self.reader = self.create_users(1)[0]
+        for post in self.posts[:2]:
+            Likes.objects.create(post=post, user=self.reader)
+        Likes.objects.create(post=self.posts[2], user=self.user)
+        self.client.force_authenticate(self.reader)
+
+    def test_returns_liked_ids_in_one_query(self):
+        post_ids = ",".join(str(post.post_id) for post in self.posts[1:])
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {"post_ids": post_ids}).json()["data"]
+        self.assertEqual(data, {"liked": [self.posts[1].post_id]})
+
+    def test_validates_ids(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        response = self.client.get(self.url, {"post_ids": "1,abc"})
+        self.assertEqual(response.status_code, 400)
+        with self.settings(PAGINATION={"PAGE_SIZE": 1, "MAX_PAGE_SIZE": 2}):
+            response = self.client.get(self.url, {"post_ids": "1,2,3"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_liked_by_me_annotation(self):
+        with self.assertNumQueries(1):
+            data = self.client.get(
+                "/api/blogs/getblog/", {"expand": "liked_by_me"}
+            ).json()["data"]
+        liked = {post["post_id"]: post["liked_by_me"] for post in data["results"]}
+        self.assertEqual(
+            liked,
+            {post.post_id: post in self.posts[:2] for post in self.posts},
+        )
+
+        self.client.force_authenticate(None)
+        data = self.client.get(
+            f"/api/blogs/getblog/{self.posts[0].post_id}/", {"expand": "liked_by_me"}
+        ).json()["data"]
+        self.assertFalse(data["liked_by_me"])
+
+
+@override_settings(BATCH={"MAX_ITEMS": 3, "READ_WORKERS": 1})
+class BatchRequestTests(BlogTestCase):
+    url = "/api/batch/"
+
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.comment = Comments.objects.create(
+            post=self.post, user=self.user, c_content="First"
+        )
+        access_token, _ = JWTAuthentication.create_tokens(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def batch(self, *requests):
+        return self.client.post(self.url, {"requests": list(requests)}, format="json")
+
+    def test_runs_items_with_a_single_authentication(self):
+        authenticate = JWTAuthentication.authenticate
+        with mock.patch.object(
+            JWTAuthentication, "authenticate", autospec=True, side_effect=authenticate
+        ) as patched:
+            response = self.batch(
+                {"method": "GET", "path": f"/api/blogs/getblog/{self.post.post_id}/"},
+                {"method": "GET", "path": f"/api/blogs/readcomment/{self.comment.id}/"},
+                {"method": "GET", "path": "/api/auth/profile/"},
+            )
+        self.assertEqual(patched.call_count, 1)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["data"]
+        self.assertEqual([result["status"] for result in results], [200, 200, 200])
+        self.assertEqual(results[0]["body"]["data"]["title"], self.post.title)
+        self.assertEqual(results[1]["body"]["data"]["c_content"], "First")
+
+    def test_runs_async_views(self):
+        authenticate = AsyncJWTAuthentication.aauthenticate
+        with mock.patch.object(
+            AsyncJWTAuthentication,
+            "aauthenticate",
+            autospec=True,
+            side_effect=authenticate,
+        ) as patched:
+            response = self.batch(
+                {
+                    "method": "GET",
+                    "path": f"/api/blogs/async/getblog/{self.post.post_id}/",
+                },
+                {
+                    "method": "GET",
+                    "path": f"/api/blogs/async/readcomment/{self.comment.id}/",
+                },
+                {"method": "GET", "path": "/api/blogs/async/getblog/0/"},
+            )
+        patched.assert_not_called()
+        results = response.json()["data"]
+        self.assertEqual([result["status"] for result in results], [200, 200, 400])
+        self.assertEqual(results[0]["body"]["data"]["title"], self.post.title)
+        self.assertEqual(results[1]["body"]["data"]["c_content"], "First")
+
+    def test_writes_run_in_order(self):
+        path = f"/api/blogs/likepost/{self.post.post_id}/"
+        results = self.batch(
+            {"method": "PUT", "path": path},
+            {"method": "GET", "path": f"/api/blogs/getblog/{self.post.post_id}/"},
+            {"method": "PUT", "path": "/api/blogs/likepost/0/"},
+        ).json()["data"]
+        self.assertEqual([result["status"] for result in results], [200, 200, 400])
+        self.assertEqual(results[1]["body"]["data"]["like_count"], 1)
+
+    def test_item_errors(self):
+        results = self.batch(
+            {"method": "GET", "path": "/api/blogs/missing/"},
+            {"method": "POST", "path": self.url, "body": {"requests": []}},
+            {"method": "GET", "path": "/api/blogs/getblog/?fields=nope"},
+        ).json()["data"]
+        self.assertEqual([result["status"] for result in results], [404, 400, 400])
+
+    def test_validates_the_batch(self):
+        item = {"method": "GET", "path": "/api/blogs/getblog/"}
+        self.assertEqual(self.batch(*[item] * 4).status_code, 400)
+        self.assertEqual(self.batch().status_code, 400)
+        response = self.batch({"method": "GET", "path": "/admin/"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(BATCH={"MAX_ITEMS": 5, "READ_WORKERS": 3})
+class ConcurrentBatchTests(TransactionTestCase):
+    def test_reads_run_concurrently(self):
+        user = User.objects.create_user(username="author", email="author@example.com")
+        posts = [
+            Posts.objects.create(title=f"Post {i}", content="-", user=user)
+            for i in range(5)
+        ]
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(
+            "/api/batch/",
+            {
+                "requests": [
+                    # The async views run on the worker threads as well.
+                    {"method": "GET", "path": f"/api/blogs/{path}{post.post_id}/"}
+                    for post, path in zip(posts, ["getblog/", "async/getblog/"] * 3)
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(
+            [result["body"]["data"]["title"] for result in response.json()["data"]],
+            [post.title for post in posts],
+        )
+
+
+@override_settings(BULK={"MAX_ITEMS": 4, "BATCH_SIZE": 2})
+class BulkCreateTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = self.create_users(1)[0]
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_posts(self):
+        Follow.objects.create(follower=self.reader, following=self.user)
+        response = self.client.post(
+            "/api/blogs/createblog/bulk/",
+            [
+                {"title": "First", "content": "One"},
+                {"content": "No title"},
+                {"title": "Third", "content": "Three"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([item["index"] for item in data["created"]], [0, 2])
+        self.assertEqual(data["errors"][0]["index"], 1)
+        self.assertIn("title", data["errors"][0]["errors"])
+
+        posts = Posts.objects.filter(user=self.user).order_by("post_id")
+        self.assertEqual([post.title for post in posts], ["First", "Third"])
+        self.assertEqual(
+            [item["id"] for item in data["created"]], [p.pk for p in posts]
+        )
+        self.assertEqual(FeedEntry.objects.filter(user=self.reader).count(), 2)
+
+    def test_bulk_posts_fan_out_once_per_author(self):
+        Follow.objects.create(follower=self.reader, following=self.user)
+        items = [{"title": str(index), "content": "-"} for index in range(3)]
+        with mock.patch.object(
+            FeedEntry.objects,
+            "schedule_fan_out",
+            wraps=FeedEntry.objects.schedule_fan_out,
+        ) as schedule_fan_out:
+            created, _ = bulk_create_posts(items, [self.user, self.reader, self.user])
+        self.assertEqual(
+            [call.args[0] for call in schedule_fan_out.call_args_list],
+            [[created[0], created[2]], [created[1]]],
+        )
+        self.assertEqual(FeedEntry.objects.filter(user=self.reader).count(), 2)
+
+    def test_bulk_create_comments(self):
+        posts = self.create_posts(2)
+        url = f"/api/blogs/getblog/{posts[0].post_id}/"
+        self.client.get(url)
+        items = [
+            {"post": posts[0].post_id, "c_content": "A"},
+            {"post": posts[0].post_id, "c_content": "B"},
+            {"post": posts[1].post_id, "c_content": "C"},
+            {"post": 0, "c_content": "D"},
+        ]
+        with self.assertNumQueries(7):
+            data = self.client.post(
+                "/api/blogs/createcomment/bulk/", items, format="json"
+            ).json()["data"]
+        self.assertEqual(len(data["created"]), 3)
+        self.assertEqual(data["errors"][0]["index"], 3)
+
+        counts = dict(Posts.objects.values_list("post_id", "comment_count"))
+        self.assertEqual(counts, {posts[0].post_id: 2, posts[1].post_id: 1})
+        self.assertEqual(self.client.get(url).json()["data"]["comment_count"], 2)
+
+    def test_rejects_invalid_batches(self):
+        url = "/api/blogs/createblog/bulk/"
+        self.assertEqual(self.client.post(url, {}, format="json").status_code, 400)
+        items = [{"title": "Post", "content": "-"}] * 5
+        self.assertEqual(self.client.post(url, items, format="json").status_code, 400)
+        response = self.client.post(url, [{"title": ""}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Posts.objects.exists())
+
+    def test_import_command(self):
+        lines = [
+            json.dumps({"user": "author", "title": "Imported", "content": "-"}),
+            "{not json",
+            json.dumps({"user": "nobody", "title": "Orphan", "content": "-"}),
+            json.dumps({"user": "author", "content": "No title"}),
+            json.dumps({"user": self.reader.username, "title": "Mine", "content": "-"}),
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as file:
+            file.write("\n".join(lines))
+            file.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                "import_content", file.name, "--chunk-size", "2", stdout=out, stderr=err
+            )
+        self.assertIn("Imported 2 posts, 3 failed.", out.getvalue())
+        self.assertIn("Line 2: Invalid JSON.", err.getvalue())
+        self.assertIn("Line 3: Unknown user.", err.getvalue())
+        self.assertIn("Line 4:", err.getvalue())
+        self.assertEqual(
+            dict(Posts.objects.values_list("title", "user__username")),
+            {"Imported": "author", "Mine": self.reader.username},
+        )
+
+
+class AsyncReadTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.posts = self.create_posts(3)
+        self.comment = Comments.objects.create(
+            post=self.posts[0], user=self.user, c_content="First"
+        )
+        access_token, _ = JWTAuthentication.create_tokens(self.user)
+        self.headers = {"Authorization": f"Bearer {access_token}"}
+
+    async def test_matches_the_sync_views(self):
+        paths = [
+            "getblog/",
+            "getblog/?page_size=2&fields=title,post_id&expand=liked_by_me",
+            f"getblog/{self.posts[0].post_id}/",
+            f"getblog/{self.posts[0].post_id}/?expand=comments,liked_by_me",
+            f"getblog/{self.posts[0].post_id}/?fields=title",
+            f"readcomment/{self.comment.id}/",
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                expected = await self.async_client.get(
+                    f"/api/blogs/{path}", headers=self.headers
+                )
+                response = await self.async_client.get(
+                    f"/api/blogs/async/{path}", headers=self.headers
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+    async def test_validators_and_errors(self):
+        url = f"/api/blogs/async/getblog/{self.posts[0].post_id}/"
+        response = await self.async_client.get(url)
+        response = await self.async_client.get(
+            url, headers={"If-None-Match": response.headers["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.get("/api/blogs/async/getblog/0/")
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get("/api/blogs/async/getblog/?fields=x")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.json()["errors"])
+        response = await self.async_client.post("/api/blogs/async/getblog/")
+        self.assertEqual(response.status_code, 405)
+        response = await self.async_client.get(
+            "/api/blogs/async/getblog/", headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class LiveUpdatePublishTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.channel = post_channel(self.post.post_id)
+        patcher = mock.patch("blogs.events.get_pubsub")
+        self.pubsub = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def published(self) -> list[tuple[str, dict]]:
+        return [call.args for call in self.pubsub.publish.call_args_list]
+
+    def test_comment_and_like_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comments.objects.create(
+                post=self.post, user=self.user, c_content="Hi"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            Likes.objects.toggle(self.user.id, self.post.post_id)
+        created = CommentSerializer(comment).data
+        with self.captureOnCommitCallbacks(execute=True):
+            comment_id = comment.id
+            comment.delete()
+
+        self.assertEqual(
+            self.published(),
+            [
+                (
+                    self.channel,
+                    {
+                        "event": "comment.created",
+                        "data": created,
+                    },
+                ),
+                (
+                    self.channel,
+                    {
+                        "event": "likes",
+                        "data": {"post_id": self.post.post_id, "like_count": 1},
+                    },
+                ),
+                (
+                    self.channel,
+                    {"event": "comment.deleted", "data": {"id": comment_id}},
+                ),
+            ],
+        )
+
+    def test_nothing_is_published_before_commit_or_without_subscribers(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Comments.objects.create(post=self.post, user=self.user, c_content="Hi")
+        self.pubsub.publish.assert_not_called()
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.pubsub.publish.call_count, 1)
+        self.pubsub.publish.reset_mock()
+
+        self.pubsub.has_subscribers.return_value = False
+        with self.captureOnCommitCallbacks() as callbacks:
+            Likes.objects.toggle(self.user.id, self.post.post_id)
+        # The like count isn't even read.
+        with self.assertNumQueries(0):
+            for callback in callbacks:
+                callback()
+        self.pubsub.publish.assert_not_called()
+
+        # Nor the comment serialized.
+        with mock.patch.object(CommentSerializer, "to_representation") as serialize:
+            with self.captureOnCommitCallbacks(execute=True):
+                Comments.objects.create(post=self.post, user=self.user, c_content="Hi")
+        serialize.assert_not_called()
+        self.pubsub.publish.assert_not_called()
+
+    def test_bulk_comments_and_post_deletion(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            comments, _ = bulk_create_comments(
+                [{"post": self.post.post_id, "c_content": "Bulk"}] * 2,
+                [self.user] * 2,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            Posts.objects.get(pk=self.post.pk).delete()
+
+        events = [message["event"] for _, message in self.published()]
+        self.assertEqual(events[:2], ["comment.created"] * 2)
+        self.assertEqual(events[-1], "post.deleted")
+
+
+@override_settings(SSE={**settings.SSE, "HEARTBEAT": 0.05, "MAX_QUEUED": 2})
+class PostEventsStreamTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.create_posts(1)[0]
+        self.url = f"/api/blogs/posts/{self.post.post_id}/events/"
+        self.channel = post_channel(self.post.post_id)
+
+    async def read(self, response) -> str:
+        return (await anext(response.streaming_content)).decode()
+
+    async def test_streams_published_events(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(await self.read(response), "retry: 3000\n\n")
+        self.assertTrue(get_pubsub().has_subscribers(self.channel))
+
+        get_pubsub().publish(
+            self.channel, {"event": "likes", "data": {"like_count": 2}}
+        )
+        self.assertEqual(
+            await self.read(response), 'event: likes\ndata: {"like_count":2}\n\n'
+        )
+        self.assertEqual(await self.read(response), ": heartbeat\n\n")
+
+        get_pubsub().publish(self.channel, {"event": "post.deleted", "data": {}})
+        self.assertEqual(await self.read(response), "event: post.deleted\ndata: {}\n\n")
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(response)
+        self.assertFalse(get_pubsub().has_subscribers(self.channel))
+
+    async def test_slow_clients_are_reset(self):
+        response = await self.async_client.get(self.url)
+        await self.read(response)
+        for count in range(3):
+            get_pubsub().publish(self.channel, {"event": "likes", "data": count})
+        await asyncio.sleep(0)
+
+        self.assertEqual(
+            await self.read(response),
+            f'event: reset\ndata: {{"post_id":{self.post.post_id}}}\n\n',
+        )
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(response)
+
+    async def test_errors(self):
+        response = await self.async_client.get("/api/blogs/posts/0/events/")
+        self.assertEqual(response.status_code, 400)
+        with override_settings(SSE={**settings.SSE, "MAX_CONNECTIONS": 0}):
+            response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+
+    @override_settings(SSE={**settings.SSE, "MAX_CONNECTIONS": 1})
+    async def test_abandoned_streams_hold_no_slot(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        del response
+        self.assertEqual(stream_slots.open, 0)
+
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SSE={**settings.SSE, "MAX_CONNECTIONS": 1})
+    async def test_streams_over_the_limit_are_told_to_retry(self):
+        first = await self.async_client.get(self.url)
+        second = await self.async_client.get(self.url)
+        await self.read(first)
+        self.assertEqual(stream_slots.open, 1)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+
+        self.assertEqual(await self.read(second), "retry: 3000\n\n")
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(second)
+        self.assertEqual(stream_slots.open, 1)
+
+        get_pubsub().publish(self.channel, {"event": "post.deleted", "data": {}})
+        await self.read(first)
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(first)
+        self.assertEqual(stream_slots.open, 0)
+
+    async def test_disconnected_clients_release_their_slot(self):
+        received = asyncio.Queue()
+        received.put_nowait({"type": "http.request"})
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body", b"").startswith(b"retry"):
+                self.assertEqual(stream_slots.open, 1)
+                received.put_nowait({"type": "http.disconnect"})
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": self.url,
+            "query_string": b"",
+            "headers": [],
+            "server": ("testserver", 80),
+        }
+        app = DisconnectMiddleware(ASGIHandler())
+        await asyncio.wait_for(app(scope, received.get, send), 5)
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertEqual(sent[-1], {"type": "http.response.body"})
+        self.assertEqual(stream_slots.open, 0)
+
+    def test_requires_asgi(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+
+
+class CompressionTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = Posts.objects.create(
+            title="Long", content="A long story. " * 200, user=self.user
+        )
+        self.url = f"/api/blogs/getblog/{self.post.post_id}/"
+
+    def test_negotiation(self):
+        cases = {
+            "": None,
+            "gzip, deflate, br": "gzip",
+            "GZIP;q=0.5": "gzip",
+            "gzip;q=0": None,
+            "*": "gzip",
+            "*, gzip;q=0": None,
+            "identity": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                codec = negotiate(header)
+                self.assertEqual(codec and codec.name, expected)
+
+    def test_compresses_and_reuses_cached_bodies(self):
+        plain = self.client.get(self.url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        with mock.patch.object(
+            GzipCodec, "compress", autospec=True, side_effect=GzipCodec.compress
+        ) as compress:
+            for _ in range(2):
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+                self.assertEqual(response["Content-Encoding"], "gzip")
+                self.assertEqual(gzip.decompress(response.content), plain.content)
+                self.assertEqual(response["ETag"], f"W/{plain['ETag']}")
+            self.assertEqual(compress.call_count, 1)
+
+            Likes.objects.toggle(self.user.id, self.post.post_id)
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(compress.call_count, 2)
+            self.assertIn('"like_count":1', gzip.decompress(response.content).decode())
+
+        # Revalidating the weak tag of the compressed body still gives a 304.
+        response = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_small_bodies_are_not_compressed(self):
+        with override_settings(
+            COMPRESSION={**settings.COMPRESSION, "MIN_SIZE": 10**6}
+        ):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streams_are_compressed_chunk_by_chunk(self):
+        admin = User.objects.create_user(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get("/api/blogs/export/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(json.loads(body)["post_id"], self.post.post_id)
+
+    async def test_event_streams_are_not_compressed(self):
+        response = await self.async_client.get(
+            f"/api/blogs/posts/{self.post.post_id}/events/",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(await anext(response.streaming_content), b"retry: 3000\n\n")
+        await response.streaming_content.aclose()
+
+
+class PostRowsTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reader = self.create_users(1)[0]
+        self.posts = self.create_posts(3)
+        self.create_engagement(self.posts[:2], [self.user, self.reader])
+        Posts.objects.filter(pk=self.posts[2].pk).update(title="Ünïcode\u2028title")
+
+    def render_both(self, expand=(), fields=None, viewer=None) -> tuple[bytes, bytes]:
+        ordering = ("-created_at", "-post_id")
+        posts = Posts.objects.for_read(expand, fields, viewer=viewer).order_by(
+            *ordering
+        )
+        expected = PostSerializer(posts, many=True, expand=expand, fields=fields).data
+        rows = Posts.objects.for_rows(expand, fields, viewer=viewer).order_by(*ordering)
+        actual = build_post_rows(list(rows), expand, fields)
+        return JSONRenderer().render(expected), JSONRenderer().render(actual)
+
+    @override_settings(LIKES={**settings.LIKES, "FLUSH_INTERVAL": None})
+    def test_matches_the_serializer(self):
+        # A buffered like the viewer hasn't written yet.
+        like_buffer.add((self.reader.id, self.posts[2].post_id), True)
+        self.addCleanup(like_buffer.flush)
+        cases = [
+            {},
+            {"expand": ("comments", "likes", "liked_by_me"), "viewer": self.reader},
+            {"expand": ("liked_by_me",), "viewer": None},
+            {"fields": {"title", "user"}, "expand": ("comments",)},
+            {"fields": {"post_id", "updated_at", "like_count"}},
+        ]
+        for case in cases:
+            with self.subTest(**case):
+                expected, actual = self.render_both(**case)
+                self.assertEqual(actual, expected)
+
+    def test_list_endpoints(self):
+        self.client.force_authenticate(self.reader)
+        response = self.client.get(
+            "/api/blogs/getblog/", {"page_size": 2, "expand": "comments,liked_by_me"}
+        )
+        results = response.json()["data"]["results"]
+        self.assertEqual(
+            [post["post_id"] for post in results],
+            [self.posts[2].post_id, self.posts[1].post_id],
+        )
+        self.assertEqual(len(results[1]["comment_post"]), 2)
+        self.assertTrue(results[1]["liked_by_me"])
+
+        response = self.client.get(
+            "/api/blogs/getblog/",
+            {"cursor": response.json()["data"]["next"], "fields": "title"},
+        )
+        self.assertEqual(response.json()["data"]["results"], [{"title": "Post 0"}])
+
+
+class FastJSONRendererTests(TestCase):
+    data = {
+        "text": 'Ünïcode \u2028 \u2029 "quoted"',
+        "when": timezone.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "day": timezone.datetime(2024, 1, 2).date(),
+        "amount": Decimal("1.50"),
+        "id": uuid.UUID(int=1),
+        "numbers": (1, 2.5, -0.1, 10**18),
+        "nested": [{1: None, "flag": True}],
+        "lazy": gettext_lazy("Not found."),
+    }
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_matches_the_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    @mock.patch("core.renderers.orjson", None)
+    def test_renders_without_orjson(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_falls_back_to_the_json_renderer(self):
+        for data, media_type in [
+            ({"big": 2**70}, None),
+            (self.data, "application/json; indent=4"),
+            (None, None),
+        ]:
+            with self.subTest(media_type=media_type):
+                self.assertEqual(
+                    FastJSONRenderer().render(data, media_type),
+                    JSONRenderer().render(data, media_type),
+                )
+
+
+@override_settings(DATABASE_REPLICATION={"REPLICAS": ["replica"], "STICKY_SECONDS": 5})
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="author", email="author@example.com"
+        )
+        self.post = Posts.objects.create(title="Post", content="-", user=self.user)
+        access_token, _ = JWTAuthentication.create_tokens(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.addCleanup(like_buffer.flush)
+
+    def count_queries(self, method: str, path: str) -> dict[str, int]:
+        reset_query_counts()
+        response = getattr(self.client, method)(path)
+        self.assertLess(response.status_code, 400)
+        counts = get_query_counts()
+        return {alias: counts[alias] for alias in ("default", "replica")}
+
+    def test_reads_go_to_the_replica(self):
+        for path in [
+            f"/api/blogs/getblog/{self.post.post_id}/",
+            "/api/blogs/getblog/",
+            "/api/auth/profile/",
+        ]:
+            with self.subTest(path=path):
+                counts = self.count_queries("get", path)
+                self.assertEqual(counts["default"], 0)
+                self.assertGreater(counts["replica"], 0)
+
+        reset_query_counts()
+        async_to_sync(self.async_client.get)(
+            f"/api/blogs/async/getblog/{self.post.post_id}/"
+        )
+        counts = get_query_counts()
+        self.assertEqual(counts["default"], 0)
+        self.assertGreater(counts["replica"], 0)
+
+        # Other views, and writes, stay on the primary.
+        counts = self.count_queries("get", "/api/blogs/trending/")
+        self.assertEqual(counts["replica"], 0)
+        counts = self.count_queries("put", f"/api/blogs/likepost/{self.post.post_id}/")
+        self.assertEqual(counts["replica"], 0)
+
+    def test_writers_read_from_the_primary_for_a_while(self):
+        path = f"/api/blogs/getblog/{self.post.post_id}/"
+        response = self.client.put(f"/api/blogs/likepost/{self.post.post_id}/")
+        self.assertIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+
+        self.assertEqual(self.count_queries("get", path)["replica"], 0)
+        # The pin follows the user without the cookie too.
+        self.client.cookies.clear()
+        self.assertEqual(self.count_queries("get", path)["replica"], 0)
+
+        cache.delete(ReplicaRoutingMiddleware.pin_key(self.user.id))
+        self.assertEqual(self.count_queries("get", path)["default"], 0)
+
+    def test_replica_reads_dont_fill_the_post_cache(self):
+        path = f"/api/blogs/getblog/{self.post.post_id}/"
+        self.assertEqual(self.count_queries("get", path)["default"], 0)
+        self.assertIsNone(cache.get(post_cache_key(self.post.post_id)))
+        async_to_sync(self.async_client.get)(
+            f"/api/blogs/async/getblog/{self.post.post_id}/"
+        )
+        self.assertIsNone(cache.get(post_cache_key(self.post.post_id)))
+
+        self.client.put(f"/api/blogs/likepost/{self.post.post_id}/")
+        self.assertEqual(self.count_queries("get", path)["replica"], 0)
+        _, payload = cache.get(post_cache_key(self.post.post_id))
+        self.assertEqual(payload["like_count"], 1)
+
+    def use_replica_snapshot(self) -> None:
+        """
+        Point the replica alias, a mirror of the primary in the tests, at a
+        separate SQLite file holding a copy of the primary as it is now, like a
+        replica that stopped replicating.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = f"{directory.name}/replica.sqlite3"
+        connections["default"].ensure_connection()
+        with closing(sqlite3.connect(path)) as snapshot:
+            connections["default"].connection.backup(snapshot)
+
+        replica = connections["replica"]
+        # Closing an in-memory SQLite database is a no-op, swap its connection.
+        original = replica.connection
+        replica.connection = None
+        # A test mirror shares the settings of the primary, don't change those.
+        patcher = mock.patch.object(
+            replica, "settings_dict", {**replica.settings_dict, "NAME": path}
+        )
+        patcher.start()
+
+        def restore():
+            if replica.connection is not None:
+                replica.connection.close()
+            replica.connection = original
+            patcher.stop()
+
+        self.addCleanup(restore)
+
+    def test_pinned_writer_reads_the_primary_and_others_the_replica(self):
+        reader = User.objects.create_user(username="reader", email="r@example.com")
+        self.use_replica_snapshot()
+        access_token, _ = JWTAuthentication.create_tokens(reader)
+        reader_client = APIClient()
+        reader_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        path = f"/api/blogs/getblog/{self.post.post_id}/"
+
+        response = self.client.put(
+            f"/api/blogs/createblog/{self.post.post_id}/",
+            {"title": "Edited", "content": "-"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Posts.objects.get(pk=self.post.pk).title, "Edited")
+
+        for client, title in [(self.client, "Edited"), (reader_client, "Post")]:
+            with self.subTest(title=title):
+                data = client.get(path, {"fields": "title"}).json()["data"]
+                self.assertEqual(data["title"], title)
+
+        # The replica's copy of the post is not cached, the writer's is.
+        reader_client.get(path)
+        self.assertIsNone(cache.get(post_cache_key(self.post.post_id)))
+        self.assertEqual(self.client.get(path).json()["data"]["title"], "Edited")
+        # The cached copy is of a version the replica doesn't have yet, its readers
+        # get a body that matches their validators.
+        self.assertEqual(reader_client.get(path).json()["data"]["title"], "Post")
+
+    def test_stats_endpoint(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/api/db/stats/")
+        self.assertEqual(set(response.json()["data"]), {"default", "replica"})
+
+
+@override_settings(
+    BACKGROUND_TASKS={**settings.BACKGROUND_TASKS, "MAX_WORKERS": 2},
+    BATCH={**settings.BATCH, "READ_WORKERS": 3},
+    LIKES={**settings.LIKES, "WRITE_BEHIND": False},
+    DATABASE_REPLICATION={"REPLICAS": ["replica"], "STICKY_SECONDS": 5},
+)
+class ConnectionPoolCheckTests(TestCase):
+    pool = {"MAX_CONNECTIONS": 20, "WORKERS": 2, "THREADS": 4, "ASGI_CONCURRENCY": 4}
+
+    def test_fails_when_workers_need_more_connections_than_allowed(self):
+        with override_settings(DATABASE_POOL=self.pool, WEB_INTERFACE="wsgi"):
+            self.assertEqual(get_connection_demand(), {"default": 20, "replica": 8})
+            self.assertEqual(check_connection_pool(None), [])
+
+            with override_settings(DATABASE_POOL={**self.pool, "WORKERS": 3}):
+                errors = check_connection_pool(None)
+        self.assertEqual([error.id for error in errors], ["core.E002"])
+        self.assertIn("30 connections to the 'default' database", errors[0].msg)
+
+    def test_counts_asgi_requests_in_flight(self):
+        pool = {**self.pool, "THREADS": 1, "ASGI_CONCURRENCY": 5}
+        with override_settings(DATABASE_POOL=pool, WEB_INTERFACE="asgi"):
+            self.assertEqual(get_connection_demand(), {"default": 22, "replica": 10})
+            self.assertEqual(
+                [error.id for error in check_connection_pool(None)], ["core.E002"]
+            )
+
+            with override_settings(DATABASE_POOL={**pool, "ASGI_CONCURRENCY": None}):
+                self.assertEqual(
+                    get_connection_demand(), {"default": None, "replica": None}
+                )
+                errors = check_connection_pool(None)
+        self.assertEqual([error.id for error in errors], ["core.E002", "core.E002"])
+
+    def test_asgi_requires_connections_closed_after_each_request(self):
+        default, replica = settings.DATABASES["default"], settings.DATABASES["replica"]
+        with mock.patch.dict(default, CONN_MAX_AGE=60), mock.patch.dict(
+            replica, CONN_MAX_AGE=0
+        ):
+            self.assertEqual(check_asgi_persistent_connections(None), [])
+            with override_settings(WEB_INTERFACE="asgi"):
+                errors = check_asgi_persistent_connections(None)
+        self.assertEqual([error.id for error in errors], ["core.E003"])
+        self.assertIn("'default' database", errors[0].msg)
+
+
+@override_settings(BACKGROUND_TASKS={"MAX_WORKERS": 1, "ALWAYS_EAGER": True})
+class SoftDeleteTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.readers = self.create_users(3)
+        Follow.objects.create(follower=self.readers[0], following=self.user)
+        self.post, self.other = self.create_posts(2)
+        self.create_engagement([self.post, self.other], self.readers)
+        TrendingPost.objects.create(post=self.post, score=1)
+        self.client.force_authenticate(self.user)
+
+    def delete_post(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.delete(f"/api/blogs/deleteblog/{self.post.post_id}/")
+        self.assertEqual(response.status_code, 200)
+        return callbacks
+
+    def test_deleted_post_disappears_from_reads_before_purge(self):
+        callbacks = self.delete_post()
+        self.assertEqual(Comments.objects.filter(post=self.post).count(), 3)
+
+        post_id = self.post.post_id
+        self.assertEqual(
+            self.client.get(f"/api/blogs/getblog/{post_id}/").status_code, 400
+        )
+        self.assertEqual(
+            self.client.get(f"/api/blogs/posts/{post_id}/comments/").status_code, 400
+        )
+        results = self.client.get("/api/blogs/getblog/").json()["data"]["results"]
+        self.assertEqual([post["post_id"] for post in results], [self.other.post_id])
+        self.assertEqual(self.client.get("/api/blogs/trending/").json()["data"], [])
+        self.client.force_authenticate(self.readers[0])
+        feed = self.client.get("/api/blogs/feed/").json()["data"]["results"]
+        self.assertEqual([post["post_id"] for post in feed], [self.other.post_id])
+        self.assertEqual(len(callbacks), 3)
+
+    def test_purge_removes_children_in_batches(self):
+        with self.settings(POST_PURGE={"BATCH_SIZE": 2}):
+            callbacks = self.delete_post()
+            with CaptureQueriesContext(connection) as queries:
+                for callback in callbacks:
+                    callback()
+        deletes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("DELETE FROM blogs_comments")
+        ]
+        # Three comments, in batches of two.
+        self.assertEqual(len(deletes), 2)
+        self.assertFalse(Posts.all_objects.filter(pk=self.post.pk).exists())
+        for model in (Comments, Likes, FeedEntry, TrendingPost):
+            self.assertFalse(model.objects.filter(post_id=self.post.pk).exists())
+        self.assertEqual(Comments.objects.filter(post=self.other).count(), 3)
+        self.assertEqual(Posts.objects.get(pk=self.other.pk).like_count, 3)
+
+    def test_command_purges_posts_whose_task_was_lost(self):
+        self.delete_post()
+        self.assertTrue(Posts.all_objects.filter(pk=self.post.pk).exists())
+
+        out = StringIO()
+        call_command("purge_deleted_posts", stdout=out)
+        self.assertIn("Purged 1 posts.", out.getvalue())
+        self.assertFalse(Posts.all_objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(Likes.objects.filter(post_id=self.post.pk).exists())
+
+    def test_comments_and_likes_of_deleted_post_are_hidden(self):
+        reader = self.readers[0]
+        comment = Comments.objects.get(post=self.post, user=reader)
+        self.delete_post()
+        self.client.force_authenticate(reader)
+
+        paths = [
+            ("get", f"/api/blogs/readcomment/{comment.id}/"),
+            ("get", f"/api/blogs/async/readcomment/{comment.id}/"),
+            ("put", f"/api/blogs/editcomment/{comment.id}/"),
+            ("delete", f"/api/blogs/deletecomment/{comment.id}/"),
+            ("put", f"/api/blogs/likepost/{self.post.post_id}/"),
+        ]
+        for method, path in paths:
+            with self.subTest(path=path):
+                response = getattr(self.client, method)(path, {"c_content": "Edit"})
+                self.assertEqual(response.status_code, 400)
+        comment.refresh_from_db()
+        self.assertEqual(comment.c_content, "Nice post")
+        self.assertTrue(Likes.objects.filter(post=self.post, user=reader).exists())
+
+        post_ids = f"{self.post.post_id},{self.other.post_id}"
+        data = self.client.get("/api/blogs/likes/mine/", {"post_ids": post_ids})
+        self.assertEqual(data.json()["data"], {"liked": [self.other.post_id]})
+
+    def test_deleting_twice_or_someone_elses_post_fails(self):
+        self.delete_post()
+        response = self.client.delete(f"/api/blogs/deleteblog/{self.post.post_id}/")
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.readers[0])
+        response = self.client.delete(f"/api/blogs/deleteblog/{self.other.post_id}/")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Posts.objects.filter(pk=self.other.pk).exists())
+
+
+class ViewCountTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post, self.other = self.create_posts(2)
+        self.url = f"/api/blogs/getblog/{self.post.post_id}/"
+
+    def test_views_are_buffered_and_flushed_as_one_update(self):
+        for _ in range(3):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.assertFalse(
+                [query for query in queries if not query["sql"].startswith("SELECT")]
+            )
+        async_to_sync(self.async_client.get)(
+            f"/api/blogs/async/getblog/{self.other.post_id}/"
+        )
+        self.assertEqual(view_buffer.get(self.post.post_id), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(view_buffer.flush(), 2)
+        counts = dict(Posts.objects.values_list("post_id", "view_count"))
+        self.assertEqual(counts, {self.post.post_id: 3, self.other.post_id: 1})
+
+        view_buffer.add(self.post.post_id, 1)
+        view_buffer.flush()
+        data = self.client.get(self.url, {"fields": "view_count"}).json()["data"]
+        self.assertEqual(data["view_count"], 4)
+
+    def test_views_dont_invalidate_cached_copies(self):
+        etag = self.client.get(self.url)["ETag"]
+        view_buffer.flush()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_flush_is_batched_and_failed_flushes_keep_the_counts(self):
+        view_buffer.add(self.post.post_id, 2)
+        view_buffer.add(self.other.post_id, 5)
+        with mock.patch.object(
+            Posts.objects, "add_views", side_effect=RuntimeError
+        ), self.assertLogs("core.buffer", "ERROR"):
+            self.assertEqual(view_buffer.flush(), 0)
+        view_buffer.add(self.post.post_id, 1)
+
+        with self.settings(VIEWS={**settings.VIEWS, "BATCH_SIZE": 1}):
+            with self.assertNumQueries(2):
+                view_buffer.flush()
+        self.assertEqual(Posts.objects.get(pk=self.post.pk).view_count, 3)
+        self.assertEqual(Posts.objects.get(pk=self.other.pk).view_count, 5)
@@ -0,0 +1,165 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blogs.models import Comments, Likes, Posts, TrendingPost, TrendingState
+
+
+def get_decay_rate() -> float:
+    """
+    Get the exponential decay rate (per second) for `TRENDING["HALF_LIFE_HOURS"]`.
+
+    Returns:
+        float: The decay rate.
+    """
+    return math.log(2) / (settings.TRENDING["HALF_LIFE_HOURS"] * 3600)
+
+
+def load_events(
+    model: type[models.Model], field: str, after: datetime, until: datetime
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Load the (post id, timestamp) pairs of the likes or comments made in a time
+    range, reading `TRENDING["CHUNK_SIZE"]` rows at a time.
+
+    Args:
+        model (type[Model]): `Likes` or `Comments`.
+        field (str): The immutable creation time of the model.
+        after (datetime): The end of the range read by the previous run.
+        until (datetime): The end of the range, included.
+
+    Returns:
+        tuple[ndarray, ndarray]: The post ids and the POSIX timestamps of the events.
+    """
+    chunk_size = settings.TRENDING["CHUNK_SIZE"]
+    post_ids, timestamps = [], []
+    rows = (
+        model.objects.filter(**{f"{field}__gt": after, f"{field}__lte": until})
+        .values_list("post_id", field)
+        .iterator(chunk_size=chunk_size)
+    )
+    for post_id, created_at in rows:
+        post_ids.append(post_id)
+        timestamps.append(created_at.timestamp())
+    return np.array(post_ids, dtype=np.int64), np.array(timestamps, dtype=np.float64)
+
+
+def decayed_scores(
+    post_ids: np.ndarray, timestamps: np.ndarray, weight: float, now: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sum the exponentially decayed weights of events per post.
+
+    Args:
+        post_ids (ndarray): The post id of each event.
+        timestamps (ndarray): The POSIX timestamp of each event.
+        weight (float): The weight of a single event.
+        now (float): The POSIX timestamp the scores are decayed to.
+
+    Returns:
+        tuple[ndarray, ndarray]: The unique post ids and their scores.
+    """
+    ages = np.maximum(now - timestamps, 0.0)
+    return merge_scores(post_ids, weight * np.exp(-get_decay_rate() * ages))
+
+
+def merge_scores(
+    post_ids: np.ndarray, scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Add up the scores of repeated post ids.
+
+    Args:
+        post_ids (ndarray): The post ids, possibly repeated.
+        scores (ndarray): The score for each entry of `post_ids`.
+
+    Returns:
+        tuple[ndarray, ndarray]: The unique post ids and their summed scores.
+    """
+    unique_ids, inverse = np.unique(post_ids, return_inverse=True)
+    return unique_ids, np.bincount(inverse, weights=scores, minlength=len(unique_ids))
+
+
+def compute_trending(now: datetime | None = None) -> dict[str, int]:
+    """
+    Update the trending scores with the likes and comments added since the last run.
+
+    Scores decay exponentially with `TRENDING["HALF_LIFE_HOURS"]`, so the stored
+    scores only need to be decayed by the time elapsed since the last run before
+    the new events are added on top, and only the posts with new events are
+    written. Old events are never read again: a removed like or comment keeps
+    counting until it has decayed away.
+
+    Args:
+        now (datetime, optional): The time to score at. Defaults to now.
+
+    Returns:
+        dict[str, int]: The number of events processed and posts updated.
+    """
+    conf = settings.TRENDING
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        state = TrendingState.objects.select_for_update().first()
+        if state is None:
+            state = TrendingState.objects.create()
+
+        after = state.events_until or now - timedelta(hours=conf["WINDOW_HOURS"])
+        until = max(now - timedelta(seconds=conf["SETTLE_SECONDS"]), after)
+        like_ids, like_times = load_events(Likes, "created_at", after, until)
+        comment_ids, comment_times = load_events(Comments, "posted_at", after, until)
+
+        if state.scored_at:
+            elapsed = max((now - state.scored_at).total_seconds(), 0)
+            if elapsed:
+                decay = math.exp(-get_decay_rate() * elapsed)
+                TrendingPost.objects.update(score=F("score") * decay)
+                TrendingPost.objects.filter(score__lt=conf["MIN_SCORE"]).delete()
+
+        parts = [
+            decayed_scores(like_ids, like_times, conf["LIKE_WEIGHT"], now.timestamp()),
+            decayed_scores(
+                comment_ids, comment_times, conf["COMMENT_WEIGHT"], now.timestamp()
+            ),
+        ]
+        post_ids, scores = merge_scores(
+            np.concatenate([ids for ids, _ in parts]),
+            np.concatenate([values for _, values in parts]),
+        )
+        post_ids = post_ids.tolist()
+        stored = dict(
+            TrendingPost.objects.filter(post_id__in=post_ids).values_list(
+                "post_id", "score"
+            )
+        )
+        # Posts may have been deleted since their events were written.
+        existing = set(
+            Posts.objects.filter(pk__in=post_ids).values_list("pk", flat=True)
+        )
+        changed = [
+            TrendingPost(post_id=post_id, score=stored.get(post_id, 0.0) + score)
+            for post_id, score in zip(post_ids, scores.tolist())
+            if post_id in existing
+        ]
+        TrendingPost.objects.bulk_create(
+            [entry for entry in changed if entry.score >= conf["MIN_SCORE"]],
+            update_conflicts=True,
+            unique_fields=["post"],
+            update_fields=["score"],
+            batch_size=conf["CHUNK_SIZE"],
+        )
+
+        state.events_until = until
+        state.scored_at = now
+        state.save()
+
+    return {
+        "likes": len(like_ids),
+        "comments": len(comment_ids),
+        "posts": len(changed),
+    }
@@ -1,23 +1,49 @@
 from django.urls import include, path
 
 from blogs.views import (
+    AsyncGetBlogView,
+    AsyncReadCommentView,
+    BulkCreateBlogView,
+    BulkCreateCommentView,
     CreateBlogView,
     CreateCommentView,
     EditCommentView,
+    ExportBlogView,
+    FeedView,
     GetBlogView,
+    LikedPostsView,
     LikeView,
+    PostCacheStatsView,
+    PostCommentsView,
+    PostEventsView,
     ReadCommentView,
+    SearchBlogView,
+    TrendingBlogView,
 )
 
 urlpatterns = [
     path("getblog/", GetBlogView.as_view()),
     path("getblog/<int:post_id>/", GetBlogView.as_view()),
+    path("search/", SearchBlogView.as_view()),
+    path("feed/", FeedView.as_view()),
+    path("trending/", TrendingBlogView.as_view()),
+    path("export/", ExportBlogView.as_view()),
     path("createblog/", CreateBlogView.as_view()),
+    path("createblog/bulk/", BulkCreateBlogView.as_view()),
     path("createblog/<int:post_id>/", CreateBlogView.as_view()),
     path("deleteblog/<int:post_id>/", CreateBlogView.as_view()),
     path("createcomment/", CreateCommentView.as_view()),
+    path("createcomment/bulk/", BulkCreateCommentView.as_view()),
     path("readcomment/<int:id>/", ReadCommentView.as_view()),
+    path("posts/<int:post_id>/comments/", PostCommentsView.as_view()),
     path("editcomment/<int:id>/", EditCommentView.as_view()),
     path("deletecomment/<int:id>/", CreateCommentView.as_view()),
     path("likepost/<int:post_id>/", LikeView.as_view()),
+    path("likes/mine/", LikedPostsView.as_view()),
+    # Native async versions of the read paths, for ASGI deployments.
+    path("async/getblog/", AsyncGetBlogView.as_view()),
+    path("async/getblog/<int:post_id>/", AsyncGetBlogView.as_view()),
+    path("async/readcomment/<int:id>/", AsyncReadCommentView.as_view()),
+    path("posts/<int:post_id>/events/", PostEventsView.as_view()),
+    path("cache/stats/", PostCacheStatsView.as_view()),
 ]
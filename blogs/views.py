@@ -1,27 +1,171 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from rest_framework.permissions import IsAuthenticated
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from blogs.bulk import bulk_create_comments, bulk_create_posts
+from blogs.cache import (
+    aget_or_build_post,
+    can_fill,
+    get_cache_stats,
+    get_or_build_post,
+    post_cache_key,
+)
+from blogs.events import format_event, post_channel, stream_slots
+from blogs.export import decode_cursor, export_posts
+from blogs.rows import abuild_post_rows, build_post_rows
+from blogs.search import search_posts
 from blogs.serializers import (
     CommentEditSerializer,
     CommentSerializer,
     CreatePostSerializer,
+    LikedPostsSerializer,
     LikeSerializer,
+    PostCommentSerializer,
     PostSerializer,
 )
+from core.conditional import get_not_modified_response, make_etag, set_validators
+from core.pagination import KeysetPagination, get_page_size
+from core.pubsub import OVERFLOW, get_pubsub
 from core.response import CustomResponse as cr
+from core.views import AsyncAPIView
+
+from .models import (
+    Comments,
+    FeedEntry,
+    Likes,
+    Posts,
+    TrendingPost,
+    like_buffer,
+    view_buffer,
+)
 
-from .models import Comments, Likes, Posts
 
+class PostReadMixin:
+    """
+    The query parameters and validators shared by the sync and async blog reads.
+    """
 
-class GetBlogView(APIView):
     serializer_class = PostSerializer
+    ordering = ("-created_at", "-post_id")
+    default_expand = ("comments", "likes")
+
+    def get_version_queryset(self, post_id: int) -> QuerySet:
+        """
+        Get the queryset loading the columns that identify the version of a post.
+
+        Args:
+            post_id (int): The id of the post.
+
+        Returns:
+            QuerySet: The queryset.
+        """
+        return Posts.objects.filter(post_id=post_id).only(
+            "updated_at", "last_activity_at", "like_count", "comment_count"
+        )
+
+    def get_etag(self, request: Request, version: Posts) -> str:
+        """
+        Get the ETag of a post for the current user and query.
+
+        Args:
+            request (Request): The HTTP request object.
+            version (Posts): The post, loaded with `get_version_queryset`.
+
+        Returns:
+            str: The quoted ETag.
+        """
+        return make_etag(
+            request,
+            version.post_id,
+            request.user.pk,  # `liked_by_me` differs per user
+            like_buffer.get((request.user.pk, version.post_id)),
+            version.updated_at.isoformat(),
+            version.last_activity_at and version.last_activity_at.isoformat(),
+            version.like_count,
+            version.comment_count,
+        )
+
+    def get_expand(self, request: Request, default=()) -> set[str]:
+        """
+        Get the relations the client asked to expand with the `expand` query parameter.
+
+        Args:
+            request (Request): The HTTP request object.
+            default (Iterable[str]): The relations expanded if the parameter is absent.
+
+        Returns:
+            set[str]: The relations to expand.
+
+        Raises:
+            ValidationError: If an unknown relation is requested.
+        """
+        expand = self.get_list_param(
+            request, "expand", self.serializer_class.expandable_fields
+        )
+        return set(default) if expand is None else expand
+
+    def get_fields(self, request: Request) -> set[str] | None:
+        """
+        Get the sparse fieldset the client asked for with the `fields` query parameter.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            set[str] | None: The fields to include, or None for all of them.
+
+        Raises:
+            ValidationError: If an unknown field is requested.
+        """
+        return self.get_list_param(
+            request, "fields", self.serializer_class.get_selectable_fields()
+        )
+
+    @staticmethod
+    def get_list_param(request: Request, name: str, allowed) -> set[str] | None:
+        if name not in request.query_params:
+            return None
+        values = {value for value in request.query_params[name].split(",") if value}
+        unknown = values - set(allowed)
+        if unknown:
+            raise ValidationError(
+                {name: f"Unknown fields: {', '.join(sorted(unknown))}"}
+            )
+        return values
+
+
+class GetBlogView(PostReadMixin, APIView):
+    replica_reads = True
 
     def get(self, request: Request, post_id=None) -> Response:
         """
-        Get the information about a blog post.
+        Get the information about a blog post, or a page of blog posts if no
+        `post_id` is given. Pages are navigated with the `cursor` query parameter
+        and sized with `page_size`.
+
+        Posts carry their like, comment and view counts. Every read of a single post
+        counts as a view; views are written in batches, so `view_count` lags behind
+        by a few seconds, longer for cached copies. The comments and likes themselves
+        are only included when asked for with `expand=comments,likes`, which is the
+        default for a single post. `expand=liked_by_me` tells whether the current
+        user liked each post. `fields=title,post_id,...` limits the posts to a
+        sparse fieldset; unrequested fields are neither loaded nor serialized.
+
+        The default representation of a single post is served from the post cache,
+        and a single post carries `ETag` and `Last-Modified` validators so clients
+        can revalidate their copy for a 304.
 
         Args:
             request (Request): The HTTP request object.
@@ -29,18 +173,266 @@ class GetBlogView(APIView):
         Returns:
             Response: The HTTP response object.
         """
+        fields = self.get_fields(request)
         if post_id is None:
-            posts = Posts.objects.all()
-            serializer = self.serializer_class(posts, many=True)
+            expand = self.get_expand(request)
+            paginator = KeysetPagination(self.ordering)
+            rows = paginator.paginate_queryset(
+                Posts.objects.for_rows(expand, fields, viewer=request.user), request
+            )
             return cr.success(
-                data=serializer.data, message="Blogs fetched successfully!"
+                data=paginator.get_paginated_data(
+                    build_post_rows(rows, expand, fields)
+                ),
+                message="Blogs fetched successfully!",
             )
 
-        posts = Posts.objects.filter(post_id=post_id).first()
-        if not posts:
+        version = self.get_version_queryset(post_id).first()
+        if not version:
             return cr.error(message="Post not found.")
-        serializer = self.serializer_class(posts)
-        return cr.success(data=serializer.data, message="Blog fetched successfully!")
+        # Counted in memory, the request path never writes.
+        view_buffer.add(post_id, 1)
+        etag = self.get_etag(request, version)
+        not_modified = get_not_modified_response(request, etag, version.last_modified)
+        if not_modified:
+            return not_modified
+
+        # A sparse fieldset only gets the relations it asks for.
+        default = self.default_expand if fields is None else ()
+        expand = self.get_expand(request, default=default)
+        cached = fields is None and "expand" not in request.query_params
+        if cached:
+            data = get_or_build_post(
+                post_id, version.version, lambda: self.serialize_post(post_id, expand)
+            )
+        else:
+            data = self.serialize_post(post_id, expand, fields)
+        if data is None:
+            return cr.error(message="Post not found.")
+        response = cr.success(data=data, message="Blog fetched successfully!")
+        if cached and can_fill():
+            # Lets the compression middleware reuse the compressed body.
+            response.compression_cache_key = post_cache_key(post_id)
+        return set_validators(response, etag, version.last_modified)
+
+    def serialize_post(self, post_id: int, expand, fields=None) -> dict | None:
+        """
+        Serialize a single post.
+
+        Args:
+            post_id (int): The id of the post.
+            expand (Iterable[str]): The relations to include.
+            fields (Iterable[str], optional): The fields to include. Defaults to all.
+
+        Returns:
+            dict | None: The serialized post, or None if it doesn't exist.
+        """
+        post = (
+            Posts.objects.for_read(expand, fields, viewer=self.request.user)
+            .filter(post_id=post_id)
+            .first()
+        )
+        if not post:
+            return None
+        return self.serializer_class(post, expand=expand, fields=fields).data
+
+
+class AsyncGetBlogView(PostReadMixin, AsyncAPIView):
+    replica_reads = True
+
+    async def get(self, request: HttpRequest, post_id=None) -> JsonResponse:
+        """
+        Async counterpart of `GetBlogView.get`, with the same parameters, cache and
+        validators.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The HTTP response object.
+        """
+        fields = self.get_fields(request)
+        if post_id is None:
+            expand = self.get_expand(request)
+            paginator = KeysetPagination(self.ordering)
+            page = paginator.get_page_queryset(
+                Posts.objects.for_rows(expand, fields, viewer=request.user), request
+            )
+            rows = paginator.paginate_results([row async for row in page])
+            return self.success(
+                data=paginator.get_paginated_data(
+                    await abuild_post_rows(rows, expand, fields)
+                ),
+                message="Blogs fetched successfully!",
+            )
+
+        version = await self.get_version_queryset(post_id).afirst()
+        if not version:
+            return self.error(message="Post not found.")
+        view_buffer.add(post_id, 1)
+        etag = self.get_etag(request, version)
+        not_modified = get_not_modified_response(request, etag, version.last_modified)
+        if not_modified:
+            return not_modified
+
+        # A sparse fieldset only gets the relations it asks for.
+        default = self.default_expand if fields is None else ()
+        expand = self.get_expand(request, default=default)
+        cached = fields is None and "expand" not in request.query_params
+        if cached:
+            data = await aget_or_build_post(
+                post_id, version.version, lambda: self.serialize_post(post_id, expand)
+            )
+        else:
+            data = await self.serialize_post(post_id, expand, fields)
+        if data is None:
+            return self.error(message="Post not found.")
+        response = self.success(data=data, message="Blog fetched successfully!")
+        if cached and can_fill():
+            # Lets the compression middleware reuse the compressed body.
+            response.compression_cache_key = post_cache_key(post_id)
+        return set_validators(response, etag, version.last_modified)
+
+    async def serialize_post(self, post_id: int, expand, fields=None) -> dict | None:
+        """
+        Serialize a single post.
+
+        Args:
+            post_id (int): The id of the post.
+            expand (Iterable[str]): The relations to include.
+            fields (Iterable[str], optional): The fields to include. Defaults to all.
+
+        Returns:
+            dict | None: The serialized post, or None if it doesn't exist.
+        """
+        post = (
+            await Posts.objects.for_read(expand, fields, viewer=self.request.user)
+            .filter(post_id=post_id)
+            .afirst()
+        )
+        if not post:
+            return None
+        return self.serializer_class(post, expand=expand, fields=fields).data
+
+
+class SearchBlogView(APIView):
+    ordering = ("-rank", "-post_id")
+
+    def get(self, request: Request) -> Response:
+        """
+        Search blog posts by title and content. Results are ranked by relevance and
+        paged with the `cursor` and `page_size` query parameters.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return cr.error(message="Search query is required.")
+
+        paginator = KeysetPagination(self.ordering)
+        rows = paginator.paginate_queryset(
+            search_posts(Posts.objects.for_rows(), query), request
+        )
+        return cr.success(
+            data=paginator.get_paginated_data(build_post_rows(rows)),
+            message="Blogs searched successfully!",
+        )
+
+
+class FeedView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = PostSerializer
+    ordering = ("-created_at", "-post_id")
+
+    def get(self, request: Request) -> Response:
+        """
+        Get a page of posts from the authors the user follows, newest first. Pages
+        are navigated with the `cursor` query parameter and sized with `page_size`.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        paginator = KeysetPagination(self.ordering)
+        entries = paginator.paginate_queryset(
+            FeedEntry.objects.filter(
+                user=request.user, post__deleted_at__isnull=True
+            ).select_related("post__user"),
+            request,
+        )
+        serializer = self.serializer_class([entry.post for entry in entries], many=True)
+        return cr.success(
+            data=paginator.get_paginated_data(serializer.data),
+            message="Feed fetched successfully!",
+        )
+
+
+class TrendingBlogView(APIView):
+    serializer_class = PostSerializer
+
+    def get(self, request: Request) -> Response:
+        """
+        Get the trending blog posts, best first. The ranking is computed periodically
+        by the `compute_trending` command; `page_size` limits the number of posts.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        limit = get_page_size(request)
+        trending = (
+            TrendingPost.objects.filter(post__deleted_at__isnull=True)
+            .select_related("post__user")
+            .order_by("-score", "-post_id")[:limit]
+        )
+        serializer = self.serializer_class(
+            [entry.post for entry in trending], many=True
+        )
+        return cr.success(
+            data=serializer.data, message="Trending blogs fetched successfully!"
+        )
+
+
+class ExportBlogView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response | StreamingHttpResponse:
+        """
+        Stream every post as newline delimited JSON, oldest change first, with a
+        tombstone for each deleted post. For incremental pulls, the `cursor` query
+        parameter resumes after the line that carried it, and `since` (ISO 8601)
+        limits the export to the changes after a time.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            StreamingHttpResponse: The streamed export.
+        """
+        since = request.query_params.get("since")
+        if since:
+            since = parse_datetime(since)
+            if since is None:
+                return cr.error(message="`since` must be an ISO 8601 timestamp.")
+        cursor = request.query_params.get("cursor") or None
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                return cr.error(message="Invalid cursor.")
+
+        return StreamingHttpResponse(
+            export_posts(since=since, cursor=cursor),
+            content_type="application/x-ndjson",
+        )
 
 
 class CreateBlogView(APIView):
@@ -90,7 +482,8 @@ class CreateBlogView(APIView):
 
     def delete(self, request: Request, post_id) -> Response:
         """
-        Delete the posts.
+        Delete the posts. The post disappears right away, its comments and likes
+        are purged in the background.
 
         Args:
             request (Request): The HTTP request object.
@@ -99,11 +492,8 @@ class CreateBlogView(APIView):
             Response: The HTTP response object.
         """
 
-        post = Posts.objects.filter(post_id=post_id, user=request.user).first()
-        if not post:
+        if not Posts.objects.filter(post_id=post_id, user=request.user).soft_delete():
             return cr.error(message="Post not found.")
-
-        post.delete()
         return cr.success(message="Post deleted successfully.")
 
 
@@ -143,7 +533,9 @@ class CreateCommentView(APIView):
             Response: The HTTP response object.
         """
 
-        comment = Comments.objects.filter(id=id, user=request.user).first()
+        comment = Comments.objects.filter(
+            id=id, user=request.user, post__deleted_at__isnull=True
+        ).first()
         if not comment:
             return cr.error(message="Comment not found.")
 
@@ -151,6 +543,57 @@ class CreateCommentView(APIView):
         return cr.success(message="Comment deleted successfully.")
 
 
+class BulkCreateView(APIView):
+    """
+    Create many objects in one request, reporting the rejected items by index
+    instead of failing the whole batch.
+    """
+
+    permission_classes = [IsAuthenticated]
+    bulk_create = None
+    noun = "items"
+
+    def post(self, request: Request) -> Response:
+        """
+        Create a list of objects, at most `BULK["MAX_ITEMS"]` of them, authored by
+        the authenticated user.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object containing the ids of the created
+            objects and the errors of the rejected ones, by index.
+        """
+        items = request.data
+        max_items = settings.BULK["MAX_ITEMS"]
+        if not isinstance(items, list) or not 0 < len(items) <= max_items:
+            return cr.error(message=f"Send a list of 1 to {max_items} {self.noun}.")
+
+        created, errors = self.bulk_create(items, [request.user] * len(items))
+        data = {
+            "created": [
+                {"index": index, "id": obj.pk} for index, obj in created.items()
+            ],
+            "errors": [
+                {"index": index, "errors": error} for index, error in errors.items()
+            ],
+        }
+        if not created:
+            return cr.error(data=data, message=f"No {self.noun} were added.")
+        return cr.success(data=data, message=f"{len(created)} {self.noun} added.")
+
+
+class BulkCreateBlogView(BulkCreateView):
+    bulk_create = staticmethod(bulk_create_posts)
+    noun = "blogs"
+
+
+class BulkCreateCommentView(BulkCreateView):
+    bulk_create = staticmethod(bulk_create_comments)
+    noun = "comments"
+
+
 class EditCommentView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -167,7 +610,9 @@ class EditCommentView(APIView):
             Response: The HTTP response object.
         """
 
-        comment = Comments.objects.filter(id=id, user=request.user).first()
+        comment = Comments.objects.filter(
+            id=id, user=request.user, post__deleted_at__isnull=True
+        ).first()
         if not comment:
             return cr.error(message="Comment not found.")
 
@@ -180,11 +625,13 @@ class EditCommentView(APIView):
 
 
 class ReadCommentView(APIView):
+    replica_reads = True
     serializer_class = CommentSerializer
 
     def get(self, request: Request, id) -> Response:
         """
-        Get the information about a blog post.
+        Get the information about a comment. The response carries `ETag` and
+        `Last-Modified` validators so clients can revalidate their copy for a 304.
 
         Args:
             request (Request): The HTTP request object.
@@ -193,11 +640,176 @@ class ReadCommentView(APIView):
             Response: The HTTP response object.
         """
 
-        comment = Comments.objects.filter(id=id).first()
+        comment = Comments.objects.filter(id=id, post__deleted_at__isnull=True).first()
         if not comment:
             return cr.error(message="Comment not found.")
+
+        # `created_at` is refreshed on every edit of the comment.
+        etag = make_etag(request, comment.id, comment.created_at.isoformat())
+        not_modified = get_not_modified_response(request, etag, comment.created_at)
+        if not_modified:
+            return not_modified
+
+        serializer = self.serializer_class(comment)
+        response = cr.success(
+            data=serializer.data, message="Comment fetched successfully!"
+        )
+        return set_validators(response, etag, comment.created_at)
+
+
+class AsyncReadCommentView(AsyncAPIView):
+    replica_reads = True
+    serializer_class = CommentSerializer
+
+    async def get(self, request: HttpRequest, id) -> JsonResponse:
+        """
+        Async counterpart of `ReadCommentView.get`.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The HTTP response object.
+        """
+        comment = await Comments.objects.filter(
+            id=id, post__deleted_at__isnull=True
+        ).afirst()
+        if not comment:
+            return self.error(message="Comment not found.")
+
+        etag = make_etag(request, comment.id, comment.created_at.isoformat())
+        not_modified = get_not_modified_response(request, etag, comment.created_at)
+        if not_modified:
+            return not_modified
+
         serializer = self.serializer_class(comment)
-        return cr.success(data=serializer.data, message="Comment fetched successfully!")
+        response = self.success(
+            data=serializer.data, message="Comment fetched successfully!"
+        )
+        return set_validators(response, etag, comment.created_at)
+
+
+class PostCommentsView(APIView):
+    serializer_class = PostCommentSerializer
+    ordering = ("id",)
+
+    def get(self, request: Request, post_id: int) -> Response:
+        """
+        Get a page of the comments on a blog post, oldest first, each with a summary
+        of its author. Pages are navigated with the `cursor` query parameter and
+        sized with `page_size`.
+
+        Args:
+            request (Request): The HTTP request object.
+            post_id (int): The id of the post.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        paginator = KeysetPagination(self.ordering)
+        comments = paginator.paginate_queryset(
+            Comments.objects.filter(post_id=post_id, post__deleted_at__isnull=True)
+            .select_related("user")
+            .only("post_id", "c_content", "created_at", "user__username"),
+            request,
+        )
+        # An empty page is the only case where the post may not exist.
+        if not comments and not Posts.objects.filter(post_id=post_id).exists():
+            return cr.error(message="Post not found.")
+
+        serializer = self.serializer_class(comments, many=True)
+        return cr.success(
+            data=paginator.get_paginated_data(serializer.data),
+            message="Comments fetched successfully!",
+        )
+
+
+class PostEventsView(AsyncAPIView):
+    async def get(self, request: HttpRequest, post_id: int):
+        """
+        Stream the live updates of a blog post as Server-Sent Events: the
+        `comment.created`, `comment.updated` and `comment.deleted` events with the
+        comment, `likes` with the new like count and `post.deleted`, after which
+        the stream ends. Idle streams get a comment every `SSE["HEARTBEAT"]`
+        seconds and all streams are closed after `SSE["MAX_DURATION"]` seconds, the
+        client reconnects on its own. It is also told to come back later when the
+        process already streams to `SSE["MAX_CONNECTIONS"]` clients. A client that
+        falls behind gets a `reset` event and should refetch the post.
+
+        Only available under ASGI, a WSGI worker would be held for the whole stream.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            post_id (int): The id of the post.
+
+        Returns:
+            StreamingHttpResponse | JsonResponse: The event stream, or an error.
+        """
+        if not isinstance(request, ASGIRequest):
+            return self.error(
+                message="Live updates require an ASGI server.",
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        if not await Posts.objects.filter(post_id=post_id).aexists():
+            return self.error(message="Post not found.")
+        if stream_slots.open >= settings.SSE["MAX_CONNECTIONS"]:
+            return self.error(
+                message="Too many live connections, try again later.",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        response = StreamingHttpResponse(
+            self.stream(request, post_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stops nginx from buffering the events.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, request: HttpRequest, post_id: int):
+        conf = settings.SSE
+        # The slot is taken by the stream itself, so a response that is never sent
+        # holds none. Streams started since the check may have taken the last ones.
+        if not stream_slots.acquire(conf["MAX_CONNECTIONS"]):
+            yield f"retry: {conf['RETRY']}\n\n"
+            return
+        try:
+            subscription = get_pubsub().subscribe(
+                post_channel(post_id), conf["MAX_QUEUED"]
+            )
+            # Set by `core.asgi.DisconnectMiddleware` when the client goes away.
+            disconnected = request.scope.get("disconnected") or asyncio.Event()
+            gone = asyncio.ensure_future(disconnected.wait())
+            received = None
+            deadline = time.monotonic() + conf["MAX_DURATION"]
+            try:
+                yield f"retry: {conf['RETRY']}\n\n"
+                while (remaining := deadline - time.monotonic()) > 0:
+                    received = received or asyncio.ensure_future(subscription.get())
+                    done, _ = await asyncio.wait(
+                        {received, gone},
+                        timeout=min(conf["HEARTBEAT"], remaining),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if gone in done:
+                        break
+                    if received not in done:
+                        yield ": heartbeat\n\n"
+                        continue
+                    message, received = received.result(), None
+                    if message is OVERFLOW:
+                        yield format_event("reset", {"post_id": post_id})
+                        break
+                    yield format_event(message["event"], message["data"])
+                    if message["event"] == "post.deleted":
+                        break
+            finally:
+                gone.cancel()
+                if received is not None:
+                    received.cancel()
+                await subscription.close()
+        finally:
+            stream_slots.release()
 
 
 class LikeView(APIView):
@@ -205,7 +817,7 @@ class LikeView(APIView):
 
     def put(self, request, post_id):
         """
-        Likes the blog post if not liked.
+        Likes the blog post if not liked, removes the like otherwise.
 
         Args:
             request (Request): The HTTP request object.
@@ -213,19 +825,55 @@ class LikeView(APIView):
         Returns:
             Response: The HTTP response object.
         """
-        post = Posts.objects.filter(post_id=post_id).first()
-        user = request.user
-
-        if not post:
+        liked = Likes.objects.toggle(request.user.id, post_id)
+        if liked is None:
             return cr.error(message="Post not found.")
+        if liked:
+            return cr.success(message="Post liked successfully.")
+        return cr.success(message="Like removed successfully.")
 
-        like_exists = Likes.objects.filter(user=user, post=post).exists()
-        if like_exists:
-            like = Likes.objects.filter(user=user, post=post).first()
-            like.delete()
-            return cr.success(message="Like removed successfully.")
 
-        else:
-            like = Likes(user=user, post=post)
-            like.save()
-            return cr.success(message="Post liked successfully.")
+class LikedPostsView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = LikedPostsSerializer
+
+    def get(self, request: Request) -> Response:
+        """
+        Tell which of the given posts the user liked, for `post_ids=1,2,3`.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object containing the ids of the liked posts.
+        """
+        post_ids = request.query_params.get("post_ids", "")
+        serializer = self.serializer_class(
+            data={"post_ids": [post_id for post_id in post_ids.split(",") if post_id]}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        liked = Likes.objects.liked_post_ids(
+            request.user.id, serializer.validated_data["post_ids"]
+        )
+        return cr.success(
+            data={"liked": liked}, message="Liked posts fetched successfully!"
+        )
+
+
+class PostCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Get the hit and miss counters of the post cache.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        return cr.success(
+            data=get_cache_stats(), message="Cache stats fetched successfully!"
+        )
@@ -0,0 +1,43 @@
+import asyncio
+
+
+class DisconnectMiddleware:
+    """
+    ASGI middleware telling the views when the client of an HTTP request is gone.
+
+    Django 4.2 stops reading from the server once it has the request body, so a
+    streaming view never learns that its client left and streams on until it ends
+    by itself. This keeps reading and sets `scope["disconnected"]`, an
+    `asyncio.Event`, on `http.disconnect`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        disconnected = asyncio.Event()
+        watcher = None
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def receive_body():
+            nonlocal watcher
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False) and watcher is None:
+                # The app has the whole body and won't read again.
+                watcher = asyncio.create_task(watch())
+            return message
+
+        try:
+            await self.app({**scope, "disconnected": disconnected}, receive_body, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
@@ -0,0 +1,49 @@
+import logging
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def run_in_background(func: t.Callable[..., t.Any], *args, **kwargs) -> None:
+    """
+    Run a function in a background thread once the current transaction commits.
+
+    Tasks live in process memory and are lost if the process dies before they
+    finish, so they must be repairable by a management command.
+
+    Args:
+        func (Callable): The function to run.
+        *args: The positional arguments for the function.
+        **kwargs: The keyword arguments for the function.
+    """
+    if settings.BACKGROUND_TASKS["ALWAYS_EAGER"]:
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_TASKS["MAX_WORKERS"],
+            thread_name_prefix="background",
+        )
+    return _executor
+
+
+def _run(func, args, kwargs) -> None:
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__qualname__)
+    finally:
+        # Worker threads get their own connections, don't leave them open.
+        connections.close_all()
@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+import typing as t
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    """
+    Collect writes in process memory and apply them to the database in batches.
+
+    Writes to the same key are collapsed with `merge`, by default the last write
+    wins. A daemon thread flushes the buffer every `FLUSH_INTERVAL` seconds, or as
+    soon as `MAX_PENDING` keys are waiting, and once more when the process exits.
+    Without a `FLUSH_INTERVAL` there is no thread and a full buffer is flushed by
+    the write that filled it. The settings are read from the dict setting named by
+    `setting`.
+
+    Like background tasks, buffered writes are lost if the process is killed before
+    they are flushed, so what they feed must be repairable.
+
+    The buffer is private to its process. Buffers whose pending values are read
+    back, rather than only written, are only consistent with a single worker
+    process.
+    """
+
+    def __init__(self, apply: t.Callable[[dict], t.Any], setting: str):
+        """
+        Args:
+            apply (Callable[[dict], Any]): Writes a batch of pending values, keyed
+                like the buffer, to the database.
+            setting (str): The name of the setting holding `FLUSH_INTERVAL` and
+                `MAX_PENDING`.
+        """
+        self.apply = apply
+        self.setting = setting
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict = {}
+        # Values being written by a flush stay visible until it finishes.
+        self._flushing: dict = {}
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def conf(self) -> dict:
+        return getattr(settings, self.setting)
+
+    def merge(self, current, value):
+        """
+        Combine a new value with the one already pending for the same key.
+
+        Args:
+            current: The pending value.
+            value: The new value.
+
+        Returns:
+            The value to keep pending. Defaults to the new value.
+        """
+        return value
+
+    def add(self, key, value) -> None:
+        """
+        Buffer a value to be written, merged with the value already pending.
+
+        Args:
+            key: The key identifying the row(s) the value is written to.
+            value: The value.
+        """
+        with self._lock:
+            if key in self._pending:
+                value = self.merge(self._pending[key], value)
+            self._pending[key] = value
+        self._added()
+
+    def update(self, key, func: t.Callable[[t.Any], t.Any]):
+        """
+        Atomically buffer a value computed from the one currently buffered.
+
+        Args:
+            key: The key.
+            func (Callable): Gets the buffered value (None if there is none) and
+                returns the value to buffer in its place.
+
+        Returns:
+            The value buffered.
+        """
+        with self._lock:
+            current = self._pending.get(key, self._flushing.get(key))
+            value = self._pending[key] = func(current)
+        self._added()
+        return value
+
+    def get(self, key, default=None):
+        """
+        Get the value buffered for a key.
+
+        Args:
+            key: The key.
+            default: The value returned when nothing is buffered. Defaults to None.
+
+        Returns:
+            The buffered value, or `default`.
+        """
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            return self._flushing.get(key, default)
+
+    def items(self) -> list[tuple]:
+        """
+        Get a snapshot of all buffered values.
+
+        Returns:
+            list[tuple]: The (key, value) pairs.
+        """
+        with self._lock:
+            return list({**self._flushing, **self._pending}.items())
+
+    def flush(self) -> int:
+        """
+        Write the buffered values to the database.
+
+        On failure the values are put back, merged with the values buffered for the
+        same keys in the meantime.
+
+        Returns:
+            int: The number of keys written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            if not batch:
+                return 0
+            try:
+                self.apply(batch)
+            except Exception:
+                logger.exception("Flushing %s buffer failed", self.setting)
+                with self._lock:
+                    for key, value in batch.items():
+                        if key in self._pending:
+                            value = self.merge(value, self._pending[key])
+                        self._pending[key] = value
+                    self._flushing = {}
+                return 0
+            with self._lock:
+                self._flushing = {}
+            return len(batch)
+
+    def _added(self) -> None:
+        with self._lock:
+            full = len(self._pending) >= self.conf["MAX_PENDING"]
+        if self.conf["FLUSH_INTERVAL"] is None:
+            if full:
+                self.flush()
+            return
+        self._start()
+        if full:
+            self._wakeup.set()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.setting.lower()}-buffer", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.conf["FLUSH_INTERVAL"])
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                # The flusher thread gets its own connection, don't leave it open.
+                connections.close_all()
+
+
+class CounterBuffer(WriteBuffer):
+    """
+    `WriteBuffer` of counter increments: the increments to the same key add up, so
+    a flush writes one delta per key however many times it was incremented.
+    """
+
+    def merge(self, current: int, value: int) -> int:
+        return current + value
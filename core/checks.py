@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from core.db import PRIMARY, get_replicas
+
+
+def get_connection_demand() -> dict[str, int | None]:
+    """
+    Work out how many connections the app may have open at once on each database
+    server, with every thread using its own connection.
+
+    Web threads may connect to the primary and every replica. Under ASGI each
+    request in flight runs its queries in a thread of its own, so there are as many
+    web threads as ASGI_CONCURRENCY allows. The background task, batch and write
+    buffer flusher threads only use the primary.
+
+    Returns:
+        dict[str, int | None]: The connections, by alias. None when unbounded, under
+            ASGI without a concurrency limit.
+    """
+    pool = settings.DATABASE_POOL
+    if settings.WEB_INTERFACE == "asgi":
+        threads = pool["ASGI_CONCURRENCY"]
+        if threads is None:
+            return {alias: None for alias in [PRIMARY, *get_replicas()]}
+    else:
+        threads = pool["THREADS"]
+    # The view counts are always buffered, the likes only when written behind.
+    flushers = 1 + settings.LIKES["WRITE_BEHIND"]
+    demand = {
+        PRIMARY: pool["WORKERS"]
+        * (
+            threads
+            + settings.BACKGROUND_TASKS["MAX_WORKERS"]
+            + settings.BATCH["READ_WORKERS"]
+            + flushers
+        )
+    }
+    for alias in get_replicas():
+        demand[alias] = pool["WORKERS"] * threads
+    return demand
+
+
+@register()
+def check_connection_pool(app_configs, **kwargs) -> list[Error]:
+    # Past the limit the database refuses connections and requests fail.
+    limit = settings.DATABASE_POOL["MAX_CONNECTIONS"]
+    if limit is None:
+        return []
+    errors = []
+    for alias, demand in get_connection_demand().items():
+        if demand is None:
+            errors.append(
+                Error(
+                    f"The app may open any number of connections to the '{alias}' "
+                    "database, each ASGI request holds its own.",
+                    hint="Set UVICORN_LIMIT_CONCURRENCY so the requests in flight "
+                    "fit in DATABASE_MAX_CONNECTIONS.",
+                    id="core.E002",
+                )
+            )
+        elif demand > limit:
+            errors.append(
+                Error(
+                    f"The app may open {demand} connections to the '{alias}' "
+                    f"database, more than DATABASE_MAX_CONNECTIONS ({limit}).",
+                    hint="Lower WEB_CONCURRENCY, WEB_THREADS, "
+                    "UVICORN_LIMIT_CONCURRENCY or the background and batch "
+                    "workers, or put a pooler such as PgBouncer in front of the "
+                    "database.",
+                    id="core.E002",
+                )
+            )
+    return errors
+
+
+@register()
+def check_asgi_persistent_connections(app_configs, **kwargs) -> list[Error]:
+    # Under ASGI each request gets a new thread, and so a new connection: a kept
+    # connection is never reused and stays open until its thread is collected.
+    if settings.WEB_INTERFACE != "asgi":
+        return []
+    return [
+        Error(
+            f"CONN_MAX_AGE of the '{alias}' database is {options['CONN_MAX_AGE']}, "
+            "persistent connections leak under ASGI.",
+            hint="Set DATABASE_CONN_MAX_AGE=0, or serve the app with WSGI.",
+            id="core.E003",
+        )
+        for alias, options in settings.DATABASES.items()
+        if options.get("CONN_MAX_AGE", 0) != 0
+    ]
+
+
+@register()
+def check_write_behind_likes(app_configs, **kwargs) -> list[Error]:
+    # The pending likes live in the memory of each process: a like buffered by one
+    # worker is invisible to the others, which toggle from stale database state.
+    if not settings.LIKES["WRITE_BEHIND"] or settings.DATABASE_POOL["WORKERS"] == 1:
+        return []
+    return [
+        Error(
+            "LIKES_WRITE_BEHIND requires a single worker process, WEB_CONCURRENCY "
+            f"is {settings.DATABASE_POOL['WORKERS']}.",
+            hint="Set WEB_CONCURRENCY=1 and scale with WEB_THREADS, or disable "
+            "LIKES_WRITE_BEHIND.",
+            id="core.E001",
+        )
+    ]
@@ -0,0 +1,188 @@
+import gzip
+import typing as t
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class Codec:
+    """
+    A content coding the compression middleware can negotiate.
+    """
+
+    name: str
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress a whole body.
+
+        Args:
+            data (bytes): The body.
+
+        Returns:
+            bytes: The compressed body.
+        """
+        raise NotImplementedError
+
+    def compressor(self) -> tuple[t.Callable[[bytes], bytes], t.Callable[[], bytes]]:
+        """
+        Start compressing a stream.
+
+        Returns:
+            tuple[Callable[[bytes], bytes], Callable[[], bytes]]: A function
+            compressing the next chunk, flushed so the chunk can be decoded as soon
+            as it arrives, and one ending the stream.
+        """
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, settings.COMPRESSION["GZIP_LEVEL"], mtime=0)
+
+    def compressor(self):
+        # wbits 31 writes the gzip header and trailer around the deflate stream.
+        compressor = zlib.compressobj(
+            settings.COMPRESSION["GZIP_LEVEL"], zlib.DEFLATED, 31
+        )
+        return (
+            lambda chunk: compressor.compress(chunk)
+            + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=settings.COMPRESSION["BROTLI_QUALITY"])
+
+    def compressor(self):
+        compressor = brotli.Compressor(quality=settings.COMPRESSION["BROTLI_QUALITY"])
+        return (
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+def get_codecs() -> list[Codec]:
+    """
+    Get the available codecs, the preferred one first. Brotli is only offered when
+    the `brotli` package is installed.
+
+    Returns:
+        list[Codec]: The codecs.
+    """
+    codecs: list[Codec] = [GzipCodec()]
+    if brotli is not None:
+        codecs.insert(0, BrotliCodec())
+    return codecs
+
+
+def negotiate(accept_encoding: str) -> Codec | None:
+    """
+    Pick the codec of a response from the `Accept-Encoding` header of the request.
+
+    Args:
+        accept_encoding (str): The header value.
+
+    Returns:
+        Codec | None: The accepted codec with the highest weight, ties going to the
+        preferred one, or None if the client accepts none.
+    """
+    weights = {}
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.lower()] = weight
+
+    best, best_weight = None, 0.0
+    for codec in get_codecs():
+        weight = weights.get(codec.name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = codec, weight
+    return best
+
+
+def compress_sequence(codec: Codec, chunks: t.Iterable[bytes]) -> t.Iterator[bytes]:
+    """
+    Compress a streamed body chunk by chunk.
+
+    Args:
+        codec (Codec): The codec.
+        chunks (Iterable[bytes]): The body.
+
+    Yields:
+        bytes: The compressed body.
+    """
+    compress, finish = codec.compressor()
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_sequence(
+    codec: Codec, chunks: t.AsyncIterable[bytes]
+) -> t.AsyncIterator[bytes]:
+    """
+    Async counterpart of `compress_sequence`.
+
+    Args:
+        codec (Codec): The codec.
+        chunks (AsyncIterable[bytes]): The body.
+
+    Yields:
+        bytes: The compressed body.
+    """
+    compress, finish = codec.compressor()
+    async for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def compressed_cache_key(key: str, codec: str) -> str:
+    """
+    Get the cache key of a compressed variant of a cached body.
+
+    Args:
+        key (str): The cache key of the body.
+        codec (str): The name of the codec.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{key}:{codec}"
+
+
+def compressed_cache_keys(key: str) -> list[str]:
+    """
+    Get the cache keys of every compressed variant of a cached body, to drop them
+    along with it.
+
+    Args:
+        key (str): The cache key of the body.
+
+    Returns:
+        list[str]: A key per codec, available or not.
+    """
+    return [compressed_cache_key(key, codec) for codec in ("br", "gzip")]
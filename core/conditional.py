@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime
+
+from django.http import HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+
+def make_etag(request: Request, *parts) -> str:
+    """
+    Build a strong ETag from the given version parts.
+
+    The query string and the negotiated format are part of the tag, since they
+    change the representation of the same resource.
+
+    Args:
+        request (Request): The HTTP request object.
+        *parts: The values identifying the version of the resource.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    accepted_renderer = getattr(request, "accepted_renderer", None)
+    version = ":".join(
+        [
+            *(str(part) for part in parts),
+            request.query_params.urlencode(),
+            getattr(accepted_renderer, "format", ""),
+        ]
+    )
+    return quote_etag(hashlib.sha1(version.encode()).hexdigest())
+
+
+def get_not_modified_response(
+    request: Request, etag: str, last_modified: datetime
+) -> HttpResponse | None:
+    """
+    Evaluate the `If-None-Match` and `If-Modified-Since` headers of the request.
+
+    Args:
+        request (Request): The HTTP request object, or the Django request of an
+            async view.
+        etag (str): The current ETag of the resource.
+        last_modified (datetime): The last modification time of the resource.
+
+    Returns:
+        HttpResponse | None: A 304 (or 412) response carrying the validators if the
+        client's copy is current, otherwise None.
+    """
+    response = get_conditional_response(
+        getattr(request, "_request", request),
+        etag=etag,
+        last_modified=int(last_modified.timestamp()),
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(
+    response: HttpResponseBase, etag: str, last_modified: datetime
+) -> HttpResponseBase:
+    """
+    Set the `ETag` and `Last-Modified` headers of a response.
+
+    Args:
+        response (HttpResponseBase): The response to update.
+        etag (str): The ETag of the resource.
+        last_modified (datetime): The last modification time of the resource.
+
+    Returns:
+        HttpResponseBase: The updated response.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
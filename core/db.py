@@ -0,0 +1,123 @@
+import contextvars
+import random
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+PRIMARY = "default"
+
+_query_counts: Counter = Counter()
+_query_counts_lock = threading.Lock()
+
+
+class RoutingState:
+    """
+    Where the reads of the current request go.
+    """
+
+    def __init__(self, replica: str | None = None):
+        # The replica serving the reads, or None for the primary.
+        self.replica = replica
+        self.wrote = False
+
+
+_routing = contextvars.ContextVar("db_routing", default=None)
+
+
+def get_routing() -> RoutingState | None:
+    return _routing.get()
+
+
+def set_routing(state: RoutingState | None) -> None:
+    _routing.set(state)
+
+
+def get_replicas() -> list[str]:
+    return settings.DATABASE_REPLICATION["REPLICAS"]
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the requests `ReplicaRoutingMiddleware` marked for it to a
+    random replica, and everything else to the primary. Once a request writes, its
+    remaining reads go to the primary too.
+
+    Code running outside a request (commands, background tasks, tests) always uses
+    the primary.
+    """
+
+    def __init__(self):
+        # Count the queries of connections opened before the router was loaded.
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection=connection)
+
+    def db_for_read(self, model, **hints) -> str:
+        state = get_routing()
+        if state is None or state.replica is None:
+            return PRIMARY
+        return state.replica
+
+    def db_for_write(self, model, **hints) -> str:
+        state = get_routing()
+        if state is not None:
+            state.wrote = True
+            state.replica = None
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        aliases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool | None:
+        # Replicas get the schema from the primary.
+        if db in get_replicas():
+            return False
+        return None
+
+
+def pick_replica() -> str | None:
+    """
+    Pick the replica serving a request.
+
+    Returns:
+        str | None: The alias of a replica, or None if there are none.
+    """
+    replicas = get_replicas()
+    return random.choice(replicas) if replicas else None
+
+
+def count_query(execute, sql, params, many, context):
+    with _query_counts_lock:
+        _query_counts[context["connection"].alias] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender=None, connection=None, **kwargs) -> None:
+    # Connections are reopened on the same wrapper, only install the counter once.
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+connection_created.connect(install_query_counter)
+
+
+def get_query_counts() -> dict[str, int]:
+    """
+    Get the number of queries run on each database alias by this process.
+
+    Returns:
+        dict[str, int]: The counts, by alias.
+    """
+    with _query_counts_lock:
+        counts = dict(_query_counts)
+    return {alias: counts.get(alias, 0) for alias in settings.DATABASES} | counts
+
+
+def reset_query_counts() -> None:
+    with _query_counts_lock:
+        _query_counts.clear()
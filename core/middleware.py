@@ -0,0 +1,253 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from authentication.authentication import JWTAuthentication
+from core.compression import (
+    Codec,
+    acompress_sequence,
+    compress_sequence,
+    compressed_cache_key,
+    negotiate,
+)
+from core.db import (
+    RoutingState,
+    get_replicas,
+    get_routing,
+    pick_replica,
+    set_routing,
+)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best codec the client accepts, brotli when the
+    `brotli` package is installed and gzip otherwise.
+
+    Only the `COMPRESSION["CONTENT_TYPES"]` are compressed, and bodies under
+    `COMPRESSION["MIN_SIZE"]` bytes are sent as is. Streamed bodies are compressed
+    chunk by chunk, except event streams whose events must not wait in a
+    compressor.
+
+    A view can set `compression_cache_key` on a response whose body is built from
+    a cached value, the compressed body is then cached under that key too and
+    reused while the body stays the same. Whoever drops the cached value drops
+    the `compressed_cache_keys` with it.
+    """
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        response = await self.get_response(request)
+        codec = self.get_codec(request, response)
+        if codec is None:
+            return response
+        if response.streaming:
+            return self.compress_response(codec, response)
+        # Compressing, and the cache of compressed bodies, would block the loop.
+        return await sync_to_async(self.compress_response)(codec, response)
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        codec = self.get_codec(request, response)
+        if codec is None:
+            return response
+        return self.compress_response(codec, response)
+
+    def get_codec(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> Codec | None:
+        """
+        Get the codec to compress a response with.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponseBase): The response.
+
+        Returns:
+            Codec | None: The codec, or None if the response is sent as is.
+        """
+        conf = settings.COMPRESSION
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if (
+            response.has_header("Content-Encoding")
+            or content_type == "text/event-stream"
+            or not content_type.startswith(tuple(conf["CONTENT_TYPES"]))
+        ):
+            return None
+        if not response.streaming and len(response.content) < conf["MIN_SIZE"]:
+            return None
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+    def compress_response(
+        self, codec: Codec, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        """
+        Compress the body of a response and set its headers.
+
+        Args:
+            codec (Codec): The codec.
+            response (HttpResponseBase): The response.
+
+        Returns:
+            HttpResponseBase: The response.
+        """
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(
+                    codec, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    codec, response.streaming_content
+                )
+            # The compressed size isn't known until the stream ends.
+            del response.headers["Content-Length"]
+        else:
+            content = self.compress(codec, response)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # The compressed body is a different representation, a strong ETag must
+        # not be shared with the uncompressed one.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codec.name
+        return response
+
+    def compress(self, codec: Codec, response: HttpResponseBase) -> bytes:
+        """
+        Compress the body of a response, through the cache if the view allows it.
+
+        Args:
+            codec (Codec): The codec.
+            response (HttpResponseBase): The response.
+
+        Returns:
+            bytes: The compressed body.
+        """
+        key = getattr(response, "compression_cache_key", None)
+        if key is None:
+            return codec.compress(response.content)
+
+        cache = caches[settings.COMPRESSION["CACHE_ALIAS"]]
+        key = compressed_cache_key(key, codec.name)
+        # Hashing is much cheaper than compressing, and tells whether the cached
+        # variant was made from this very body.
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        cached = cache.get(key)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        content = codec.compress(response.content)
+        cache.set(key, (digest, content), settings.COMPRESSION["CACHE_TIMEOUT"])
+        return content
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Route the reads of safe requests to views with `replica_reads = True` to a
+    replica, through `core.db.ReplicaRouter`.
+
+    A request that writes pins its user to the primary for
+    `DATABASE_REPLICATION["STICKY_SECONDS"]`, so they read their own writes while
+    the replicas catch up. The pin is kept in the cache under the user id, found
+    from the access token without a query, and in a cookie for clients without
+    one.
+    """
+
+    cookie_name = "db_pinned"
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(self):
+            # The handler adapts the hook to the mode it finds when loading the
+            # middleware, an async one runs on the event loop.
+            self.process_view = self.aprocess_view
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        self.process_request(request)
+        response = await self.get_response(request)
+        state = get_routing()
+        if state is not None and state.wrote:
+            # The pin is written to the cache.
+            return await sync_to_async(self.process_response)(request, response)
+        set_routing(None)
+        return response
+
+    def process_request(self, request: HttpRequest) -> None:
+        set_routing(RoutingState())
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        if self.reads_replica(request, view_func) and not self.is_pinned(request):
+            get_routing().replica = pick_replica()
+
+    async def aprocess_view(
+        self, request: HttpRequest, view_func, view_args, view_kwargs
+    ):
+        if self.reads_replica(request, view_func) and not await self.ais_pinned(
+            request
+        ):
+            get_routing().replica = pick_replica()
+
+    def reads_replica(self, request: HttpRequest, view_func) -> bool:
+        view_class = getattr(view_func, "view_class", None)
+        return bool(
+            get_replicas()
+            and request.method in SAFE_METHODS
+            and getattr(view_class, "replica_reads", False)
+        )
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        state = get_routing()
+        set_routing(None)
+        if state is not None and state.wrote:
+            self.pin(request, response)
+        return response
+
+    def is_pinned(self, request: HttpRequest) -> bool:
+        if self.cookie_name in request.COOKIES:
+            return True
+        user_id = self.get_token_user_id(request)
+        return user_id is not None and bool(cache.get(self.pin_key(user_id)))
+
+    async def ais_pinned(self, request: HttpRequest) -> bool:
+        if self.cookie_name in request.COOKIES:
+            return True
+        user_id = self.get_token_user_id(request)
+        return user_id is not None and bool(await cache.aget(self.pin_key(user_id)))
+
+    def pin(self, request: HttpRequest, response: HttpResponseBase) -> None:
+        seconds = settings.DATABASE_REPLICATION["STICKY_SECONDS"]
+        # DRF sets the user it authenticated on the Django request too.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            cache.set(self.pin_key(user.id), True, seconds)
+        response.set_cookie(self.cookie_name, "1", max_age=seconds, httponly=True)
+
+    @staticmethod
+    def pin_key(user_id) -> str:
+        return f"db:pinned:{user_id}"
+
+    @staticmethod
+    def get_token_user_id(request: HttpRequest) -> str | None:
+        authentication = JWTAuthentication()
+        try:
+            token = authentication.get_token(request)
+            if not token:
+                return None
+            return authentication.decode_access_token(token).get("user_id")
+        except (ValueError, APIException):
+            return None
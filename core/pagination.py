@@ -0,0 +1,250 @@
+import base64
+import binascii
+import json
+import typing as t
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+
+def get_page_size(
+    request: Request, default: int | None = None, query_param: str = "page_size"
+) -> int:
+    """
+    Get the number of items the client asked for, capped at
+    `PAGINATION["MAX_PAGE_SIZE"]`.
+
+    Args:
+        request (Request): The HTTP request object.
+        default (int, optional): The size used when the client asked for none, or
+            for an invalid one. Defaults to `PAGINATION["PAGE_SIZE"]`.
+        query_param (str): The query parameter holding the size. Defaults to
+            "page_size".
+
+    Returns:
+        int: The page size to use.
+    """
+    default = default or settings.PAGINATION["PAGE_SIZE"]
+    try:
+        page_size = int(request.query_params[query_param])
+    except (KeyError, ValueError):
+        return default
+    if page_size <= 0:
+        return default
+    return min(page_size, settings.PAGINATION["MAX_PAGE_SIZE"])
+
+
+class KeysetPagination:
+    """
+    Cursor based pagination over a fixed, unique ordering.
+
+    Each page is fetched with a `WHERE (a, b) < (x, y)` style filter on the last
+    row seen instead of an OFFSET, so every page costs the same as the first one
+    as long as the ordering is backed by an index. Cursors are opaque base64
+    tokens holding the ordering values of the boundary row.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering: tuple[str, ...], page_size: int | None = None):
+        """
+        Args:
+            ordering (tuple[str, ...]): The ordering of the pages, e.g.
+                `("-created_at", "-post_id")`. The last field must be unique.
+            page_size (int, optional): The default page size. Defaults to
+                `PAGINATION["PAGE_SIZE"]`.
+        """
+        self.ordering = ordering
+        self.default_page_size = page_size or settings.PAGINATION["PAGE_SIZE"]
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        Get the page size requested by the client, capped at `PAGINATION["MAX_PAGE_SIZE"]`.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            int: The page size to use.
+        """
+        return get_page_size(
+            request, self.default_page_size, self.page_size_query_param
+        )
+
+    def get_page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """
+        Build the (lazy) queryset for the requested page.
+
+        The queryset fetches one extra row so `paginate_results` can tell whether
+        another page exists without a COUNT query.
+
+        Args:
+            queryset (QuerySet): The unordered queryset to paginate.
+            request (Request): The HTTP request object.
+
+        Returns:
+            QuerySet: The sliced queryset for the requested page.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param)
+        )
+        self.reverse = bool(self.cursor and self.cursor["r"])
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+        if self.cursor:
+            queryset = queryset.filter(
+                self._boundary_filter(ordering, self.cursor["v"])
+            )
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def paginate_results(self, rows: t.Sequence[Model | dict]) -> list[Model | dict]:
+        """
+        Trim the fetched rows down to the page and work out the neighbouring cursors.
+
+        Args:
+            rows (Sequence[Model | dict]): The evaluated page queryset, of objects
+                or of `values()` rows.
+
+        Returns:
+            list[Model | dict]: The objects on the current page, in display order.
+        """
+        rows = list(rows)
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            if has_more or self.reverse:
+                self.next_cursor = self.encode_cursor(rows[-1], reverse=False)
+            if (has_more and self.reverse) or (self.cursor and not self.reverse):
+                self.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return rows
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> list[Model | dict]:
+        """
+        Paginate the given queryset.
+
+        Args:
+            queryset (QuerySet): The unordered queryset to paginate.
+            request (Request): The HTTP request object.
+
+        Returns:
+            list[Model | dict]: The objects on the current page.
+        """
+        return self.paginate_results(self.get_page_queryset(queryset, request))
+
+    def get_paginated_data(self, data: list) -> dict[str, t.Any]:
+        """
+        Wrap the serialized page with the cursors for the neighbouring pages.
+
+        Args:
+            data (list): The serialized objects on the current page.
+
+        Returns:
+            dict[str, Any]: The paginated payload.
+        """
+        return {
+            "next": self.next_cursor,
+            "previous": self.previous_cursor,
+            "results": data,
+        }
+
+    def encode_cursor(self, obj: Model | dict, reverse: bool) -> str:
+        """
+        Encode the ordering values of the given object into an opaque cursor.
+
+        Args:
+            obj (Model | dict): The boundary object, or row of a `values()` queryset.
+            reverse (bool): Whether the cursor points to the previous page.
+
+        Returns:
+            str: The encoded cursor.
+        """
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(obj, dict):
+            values = [obj[name] for name in names]
+        else:
+            values = [getattr(obj, name) for name in names]
+        payload = json.dumps({"v": values, "r": int(reverse)}, default=self._encode)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor: str | None) -> dict[str, t.Any] | None:
+        """
+        Decode a cursor created by `encode_cursor`.
+
+        Args:
+            cursor (str | None): The cursor sent by the client.
+
+        Returns:
+            dict[str, Any] | None: The decoded cursor, or None if no cursor was sent.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = [
+                self._to_python(field.lstrip("-"), value)
+                for field, value in zip(self.ordering, payload["v"], strict=True)
+            ]
+            return {"v": values, "r": bool(payload["r"])}
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _to_python(self, field_name: str, value: t.Any) -> t.Any:
+        try:
+            field = self.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) are kept as plain JSON values.
+            return value
+        return field.to_python(value)
+
+    @staticmethod
+    def _encode(value: t.Any) -> t.Any:
+        # Keep full microsecond precision, the boundary comparison relies on it.
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _boundary_filter(ordering: tuple[str, ...], values: list) -> Q:
+        """
+        Build the row-value comparison `(a, b, c) > (x, y, z)` as a chain of Q objects,
+        honouring the direction of each field in the ordering.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {ordering[i].lstrip("-"): values[i] for i in range(index)}
+            condition |= Q(**equal, **{f"{name}__{lookup}": values[index]})
+        return condition
@@ -0,0 +1,302 @@
+import asyncio
+import functools
+import json
+import threading
+import typing as t
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+# Queued in place of the messages a subscriber fell too far behind on.
+OVERFLOW = object()
+
+
+class Subscription:
+    """
+    The messages of one channel for one listener, in a bounded queue.
+
+    A subscriber that doesn't keep up is not allowed to buffer without limit: once
+    `max_queued` messages are waiting, the queue is replaced by `OVERFLOW` and no
+    more messages are delivered.
+    """
+
+    def __init__(self, pubsub: "BasePubSub", channel: str, max_queued: int):
+        self.pubsub = pubsub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def deliver(self, message: dict) -> None:
+        """
+        Queue a message. Must be called from the subscriber's event loop.
+
+        Args:
+            message (dict): The message.
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self) -> dict | object:
+        """
+        Wait for the next message.
+
+        Returns:
+            dict | object: The message, or `OVERFLOW`.
+        """
+        return await self.queue.get()
+
+    async def close(self) -> None:
+        """
+        Stop receiving messages.
+        """
+        self.pubsub.unsubscribe(self)
+
+
+class BasePubSub:
+    """
+    Publish messages to channels and listen to them from async code.
+
+    `publish` may be called from any thread, `subscribe` from a running event loop.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+
+    def publish(self, channel: str, message: dict) -> None:
+        """
+        Send a message to the subscribers of a channel.
+
+        Args:
+            channel (str): The channel.
+            message (dict): The JSON serializable message.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, max_queued: int) -> Subscription:
+        """
+        Start listening to a channel.
+
+        Args:
+            channel (str): The channel.
+            max_queued (int): The number of messages that may wait to be consumed.
+
+        Returns:
+            Subscription: The subscription, to be closed when done.
+        """
+        subscription = Subscription(self, channel, max_queued)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def get_subscriptions(self, channel: str | None = None) -> list[Subscription]:
+        """
+        Get the subscriptions of this process.
+
+        Args:
+            channel (str, optional): Only those of this channel. Defaults to all.
+
+        Returns:
+            list[Subscription]: The subscriptions.
+        """
+        with self._lock:
+            if channel is not None:
+                return list(self._subscriptions.get(channel, ()))
+            return [
+                subscription
+                for subscriptions in self._subscriptions.values()
+                for subscription in subscriptions
+            ]
+
+    def has_subscribers(self, channel: str) -> bool:
+        """
+        Tell whether anyone may be listening to a channel, so publishers can skip
+        building messages nobody receives.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            bool: False only if there is certainly no subscriber.
+        """
+        return True
+
+
+class LocalPubSub(BasePubSub):
+    """
+    Delivers messages to the subscribers in the current process only, so it fits a
+    single process deployment and the tests.
+    """
+
+    def has_subscribers(self, channel: str) -> bool:
+        return bool(self.get_subscriptions(channel))
+
+    def publish(self, channel: str, message: dict) -> None:
+        for subscription in self.get_subscriptions(channel):
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's event loop is gone.
+                self.unsubscribe(subscription)
+
+
+class RedisPubSub(BasePubSub):
+    """
+    Delivers messages across processes through Redis pub/sub. Needs the `redis`
+    package and the `url` option.
+
+    The subscribers of an event loop share one Redis connection, subscribed to the
+    channels they listen to, which is closed once the last of them is gone. Under
+    ASGI that is one connection per worker process.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisPubSub requires the redis package.")
+        if not options.get("url"):
+            raise ImproperlyConfigured("RedisPubSub requires the url option.")
+        self.client = redis.Redis.from_url(options["url"])
+        self._listeners: dict[asyncio.AbstractEventLoop, RedisListener] = {}
+
+    def publish(self, channel: str, message: dict) -> None:
+        self.client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    def subscribe(self, channel: str, max_queued: int) -> Subscription:
+        subscription = super().subscribe(channel, max_queued)
+        with self._lock:
+            listener = self._listeners.get(subscription.loop)
+            if listener is None:
+                listener = RedisListener(self, self.options["url"])
+                self._listeners[subscription.loop] = listener
+        listener.add(channel)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        super().unsubscribe(subscription)
+        with self._lock:
+            listener = self._listeners.get(subscription.loop)
+            if listener is None or not listener.discard(subscription.channel):
+                return
+            del self._listeners[subscription.loop]
+        listener.close()
+
+
+class RedisListener:
+    """
+    The Redis connection of the `RedisPubSub` subscribers of one event loop. Must
+    be used from that loop.
+
+    The SUBSCRIBE and UNSUBSCRIBE commands are sent in order, while one task reads
+    the messages and hands them to the subscribers of their channel.
+    """
+
+    def __init__(self, pubsub: RedisPubSub, url: str):
+        import redis.asyncio
+
+        self.pubsub = pubsub
+        self.loop = asyncio.get_running_loop()
+        self.client = redis.asyncio.Redis.from_url(url)
+        self.connection = self.client.pubsub()
+        # The subscribers of each channel.
+        self.channels: dict[str, int] = defaultdict(int)
+        self.commands = asyncio.Lock()
+        self.reader: asyncio.Task | None = None
+
+    def add(self, channel: str) -> None:
+        """
+        Count a subscriber of a channel, subscribing the connection to it first.
+
+        Args:
+            channel (str): The channel.
+        """
+        self.channels[channel] += 1
+        if self.channels[channel] == 1:
+            self.loop.create_task(self._send(self.connection.subscribe, channel))
+        if self.reader is None:
+            # Created after the first SUBSCRIBE, which it waits for.
+            self.reader = self.loop.create_task(self._read())
+
+    def discard(self, channel: str) -> bool:
+        """
+        Forget a subscriber of a channel, unsubscribing the connection from it if
+        it was the last one.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            bool: Whether no subscriber is left, so the listener should be closed.
+        """
+        self.channels[channel] -= 1
+        if self.channels[channel]:
+            return False
+        del self.channels[channel]
+        if not self.channels:
+            return True
+        self.loop.create_task(self._send(self.connection.unsubscribe, channel))
+        return False
+
+    def close(self) -> None:
+        """
+        Stop reading and close the connection.
+        """
+        if self.reader is not None:
+            self.reader.cancel()
+        self.loop.create_task(self._close())
+
+    async def _send(self, command, channel: str) -> None:
+        async with self.commands:
+            await command(channel)
+
+    async def _read(self) -> None:
+        async with self.commands:
+            pass
+        async for message in self.connection.listen():
+            if message["type"] != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            data = json.loads(message["data"])
+            for subscription in self.pubsub.get_subscriptions(channel):
+                if subscription.loop is self.loop:
+                    subscription.deliver(data)
+
+    async def _close(self) -> None:
+        async with self.commands:
+            await self.connection.reset()
+            await self.client.close()
+
+
+@functools.cache
+def get_pubsub() -> BasePubSub:
+    """
+    Get the pub/sub backend configured with `PUBSUB`.
+
+    Returns:
+        BasePubSub: The backend, shared by the whole process.
+    """
+    backend: t.Callable[..., BasePubSub] = import_string(settings.PUBSUB["BACKEND"])
+    return backend(**settings.PUBSUB["OPTIONS"])
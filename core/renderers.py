@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with orjson when it is installed, and with the standard
+    library otherwise.
+
+    The output is the same as `JSONRenderer`'s: compact, UTF-8, with U+2028 and
+    U+2029 escaped and everything orjson doesn't handle natively (datetimes
+    included) going through DRF's `JSONEncoder`. Floats are written in their
+    shortest form by both, only the exponent notation of very large or small ones
+    differs. Indented output, and data orjson rejects, such as integers over 64
+    bits, fall back to `JSONRenderer`.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Like `JSONRenderer`, keep the output a strict subset of JavaScript.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
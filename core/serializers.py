@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from core.batch import READ_METHODS
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=[*READ_METHODS, "POST", "PUT", "PATCH", "DELETE"]
+    )
+    path = serializers.RegexField(r"^/api/", max_length=2048)
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=BatchItemSerializer(), min_length=1)
+
+    def validate_requests(self, value):
+        max_items = settings.BATCH["MAX_ITEMS"]
+        if len(value) > max_items:
+            raise serializers.ValidationError(
+                f"A batch can hold at most {max_items} requests."
+            )
+        return value
@@ -0,0 +1,159 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers import base
+from django.core.handlers.asgi import ASGIHandler
+from django.test import SimpleTestCase, override_settings
+
+from core.buffer import CounterBuffer, WriteBuffer
+from core.checks import check_write_behind_likes
+from core.pubsub import RedisPubSub
+
+
+@override_settings(TEST_BUFFER={"FLUSH_INTERVAL": None, "MAX_PENDING": 3})
+class WriteBufferTests(SimpleTestCase):
+    def test_last_write_wins_and_full_buffers_flush(self):
+        batches = []
+        buffer = WriteBuffer(batches.append, setting="TEST_BUFFER")
+        buffer.add("a", 1)
+        buffer.add("a", 2)
+        buffer.add("b", 1)
+        self.assertEqual(batches, [])
+
+        buffer.add("c", 1)
+        self.assertEqual(batches, [{"a": 2, "b": 1, "c": 1}])
+        self.assertIsNone(buffer.get("a"))
+
+    def test_failed_flush_keeps_values(self):
+        def fail(batch):
+            buffer.add("views", 5)
+            raise RuntimeError
+
+        buffer = CounterBuffer(fail, setting="TEST_BUFFER")
+        buffer.add("views", 1)
+        buffer.add("views", 2)
+        with self.assertLogs("core.buffer", "ERROR"):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.get("views"), 8)
+
+
+class WriteBehindLikesCheckTests(SimpleTestCase):
+    def test_requires_a_single_worker(self):
+        pool = {"MAX_CONNECTIONS": None, "WORKERS": 2, "THREADS": 4}
+        likes = {**settings.LIKES, "WRITE_BEHIND": True}
+        with override_settings(DATABASE_POOL=pool, LIKES=likes):
+            errors = check_write_behind_likes(None)
+            self.assertEqual([error.id for error in errors], ["core.E001"])
+
+            with override_settings(DATABASE_POOL={**pool, "WORKERS": 1}):
+                self.assertEqual(check_write_behind_likes(None), [])
+        with override_settings(DATABASE_POOL=pool):
+            self.assertEqual(check_write_behind_likes(None), [])
+
+
+class AsyncMiddlewareTests(SimpleTestCase):
+    def test_project_middleware_runs_on_the_event_loop(self):
+        with mock.patch.object(
+            base, "sync_to_async", side_effect=sync_to_async
+        ) as to_thread, mock.patch.object(base, "async_to_sync") as to_loop:
+            handler = ASGIHandler()
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+        to_loop.assert_not_called()
+        adapted = {call.args[0].__module__ for call in to_thread.call_args_list}
+        # Only Django's own view hooks are left to a thread.
+        self.assertEqual(adapted, {"django.middleware.csrf"})
+
+
+class FakeRedis:
+    """
+    An in-memory Redis server, standing in for the `redis` package with the pub/sub
+    commands only.
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.asyncio = SimpleNamespace(Redis=SimpleNamespace(from_url=self.connect))
+        self.Redis = SimpleNamespace(from_url=lambda url: self)
+
+    def connect(self, url):
+        connection = FakeRedisConnection()
+        self.connections.append(connection)
+        return connection
+
+    def publish(self, channel, data):
+        for connection in self.connections:
+            if channel in connection.channels:
+                connection.messages.put_nowait(
+                    {"type": "message", "channel": channel.encode(), "data": data}
+                )
+
+
+class FakeRedisConnection:
+    def __init__(self):
+        self.channels = set()
+        self.messages = asyncio.Queue()
+        self.closed = False
+
+    def pubsub(self):
+        return self
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+        self.messages.put_nowait({"type": "subscribe", "channel": channel})
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+    async def reset(self):
+        self.channels.clear()
+
+    async def close(self):
+        self.closed = True
+
+
+class RedisPubSubTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeRedis()
+        patcher = mock.patch.dict(
+            sys.modules, {"redis": self.server, "redis.asyncio": self.server.asyncio}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pubsub = RedisPubSub(url="redis://localhost")
+
+    async def test_subscribers_share_one_connection(self):
+        first = self.pubsub.subscribe("a", 10)
+        second = self.pubsub.subscribe("a", 10)
+        other = self.pubsub.subscribe("b", 10)
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.server.connections), 1)
+        connection = self.server.connections[0]
+        self.assertEqual(connection.channels, {"a", "b"})
+
+        self.pubsub.publish("a", {"count": 1})
+        for subscription in [first, second]:
+            message = await asyncio.wait_for(subscription.get(), 1)
+            self.assertEqual(message, {"count": 1})
+        self.assertTrue(other.queue.empty())
+
+        await other.close()
+        await asyncio.sleep(0)
+        self.assertEqual(connection.channels, {"a"})
+
+        await first.close()
+        await second.close()
+        await asyncio.sleep(0)
+        self.assertTrue(connection.closed)
+
+        # The next subscriber opens a new connection.
+        subscription = self.pubsub.subscribe("a", 10)
+        self.assertEqual(len(self.server.connections), 2)
+        await subscription.close()
@@ -0,0 +1,176 @@
+from http import HTTPStatus
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+)
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView
+
+from authentication.authentication import AsyncJWTAuthentication
+from core.batch import run_batch
+from core.db import get_query_counts
+from core.response import CustomResponse as cr
+from core.serializers import BatchSerializer
+
+
+class BatchView(APIView):
+    serializer_class = BatchSerializer
+
+    def post(self, request: Request) -> Response:
+        """
+        Run several API requests in one round trip.
+
+        The body holds `requests`, a list of `{"method", "path", "body"}` items for
+        the other `/api/` endpoints, at most `BATCH["MAX_ITEMS"]` of them. They run
+        in-process as the user authenticated with this request, and each item gets
+        its own status code.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object containing the `status` and `body`
+            of each request, in order.
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = run_batch(request, serializer.validated_data["requests"])
+        return cr.success(data=results, message="Batch processed successfully!")
+
+
+class DatabaseStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Get the number of queries this process ran on each database alias, to
+        check how reads are spread over the replicas.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        return cr.success(
+            data=get_query_counts(), message="Database stats fetched successfully!"
+        )
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async views, served without holding a thread under ASGI.
+
+    DRF's `APIView` is synchronous, so this covers what the read endpoints use
+    from it: JWT authentication, the authenticated-only check, the
+    `CustomResponse` envelope and the rendering of `APIException`s.
+    `request.query_params` is set so helpers written for DRF requests can be
+    shared.
+    """
+
+    authentication_class = AsyncJWTAuthentication
+    authentication_required = False
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        request.query_params = request.GET
+        try:
+            await self.authenticate(request)
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request: HttpRequest) -> None:
+        """
+        Set `request.user` and `request.auth` from the request's token, or from
+        the user forced on a batch sub-request.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid.
+            NotAuthenticated: If the view requires a user and there is none.
+        """
+        if hasattr(request, "_force_auth_user"):
+            result = (request._force_auth_user, request._force_auth_token)
+        else:
+            result = await self.authentication_class().aauthenticate(request)
+        request.user, request.auth = result or (AnonymousUser(), None)
+        if self.authentication_required and not request.user.is_authenticated:
+            raise NotAuthenticated()
+
+    def handle_exception(self, exc: APIException) -> JsonResponse:
+        """
+        Render an API exception like `custom_exception_handler` does.
+
+        Args:
+            exc (APIException): The exception that was raised.
+
+        Returns:
+            JsonResponse: The error response.
+        """
+        status_code = exc.status_code
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            # DRF answers 403 when the authenticator has no `WWW-Authenticate`.
+            status_code = status.HTTP_403_FORBIDDEN
+        data = (
+            exc.detail
+            if isinstance(exc.detail, (list, dict))
+            else {"detail": exc.detail}
+        )
+        return self.error(
+            message=HTTPStatus(status_code).phrase, data=data, status_code=status_code
+        )
+
+    @staticmethod
+    def success(data=None, message="", status_code=status.HTTP_200_OK):
+        """
+        Async counterpart of `CustomResponse.success`.
+
+        Args:
+            data: The data to be sent along with the response. Defaults to None.
+            message (str): Message to be sent along with the response. Defaults to "".
+            status_code (int): Status code of the response. Defaults to 200.
+
+        Returns:
+            JsonResponse: A response object with all the aforementioned data.
+        """
+        return JsonResponse(
+            {"success": True, "data": data, "message": message},
+            status=status_code,
+            encoder=JSONEncoder,
+        )
+
+    @staticmethod
+    def error(message="", data=None, status_code=status.HTTP_400_BAD_REQUEST):
+        """
+        Async counterpart of `CustomResponse.error`.
+
+        Args:
+            message (str): Message to be sent along with the response. Defaults to "".
+            data: The data to be sent along with the response. Defaults to None.
+            status_code (int): Status code of the response. Defaults to 400.
+
+        Returns:
+            JsonResponse: A response object with all the aforementioned data.
+        """
+        return JsonResponse(
+            {"success": False, "errors": data, "message": message},
+            status=status_code,
+            encoder=JSONEncoder,
+        )
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from jobs.models import Job
+from jobs.registry import register
+
+SEND_EMAIL = "send_email"
+
+
+def enqueue_email(
+    subject: str, message: str, recipients: list[str], from_email: str | None = None
+) -> Job:
+    """
+    Queue an email, sent by the `run_jobs` worker once the current transaction
+    commits.
+
+    Args:
+        subject (str): The subject of the email.
+        message (str): The plain text body.
+        recipients (list[str]): The email addresses to send to.
+        from_email (str, optional): The sender. Defaults to `EMAIL_HOST_USER`.
+
+    Returns:
+        Job: The queued job.
+    """
+    return Job.objects.enqueue(
+        SEND_EMAIL,
+        {
+            "subject": subject,
+            "message": message,
+            "recipients": recipients,
+            "from_email": from_email or settings.EMAIL_HOST_USER,
+        },
+    )
+
+
+@register(SEND_EMAIL)
+def send_emails(payloads: list[dict]) -> list[Exception | None]:
+    """
+    Send a batch of queued emails over a single connection to the mail server.
+
+    Args:
+        payloads (list[dict]): The payloads of the jobs, from `enqueue_email`.
+
+    Returns:
+        list[Exception | None]: The error of each email, None if it was sent.
+    """
+    errors = []
+    # A failure to connect fails the whole batch.
+    with get_connection() as connection:
+        for payload in payloads:
+            email = EmailMessage(
+                payload["subject"],
+                payload["message"],
+                payload["from_email"],
+                payload["recipients"],
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as error:
+                errors.append(error)
+            else:
+                errors.append(None)
+    return errors
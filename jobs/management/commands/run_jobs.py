@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.models import Job
+from jobs.worker import run_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the queued background jobs, e.g. outbound email, polling for new ones "
+        "until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help='Number of jobs claimed at a time. Defaults to JOBS["BATCH_SIZE"].',
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Retry the dead-lettered jobs before starting.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.JOBS["BATCH_SIZE"]
+        if options["requeue_dead"]:
+            requeued = Job.objects.requeue_dead()
+            self.stdout.write(f"Requeued {requeued} dead jobs.")
+
+        totals = {"succeeded": 0, "retried": 0, "dead": 0}
+        try:
+            while True:
+                # The worker runs for days, drop broken or expired connections.
+                close_old_connections()
+                jobs = Job.objects.claim(batch_size)
+                if not jobs:
+                    if options["once"]:
+                        break
+                    time.sleep(settings.JOBS["POLL_INTERVAL"])
+                    continue
+                for key, count in run_batch(jobs).items():
+                    totals[key] += count
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ran {sum(totals.values())} jobs: {totals['succeeded']} succeeded, "
+                f"{totals['retried']} to retry, {totals['dead']} dead."
+            )
+        )
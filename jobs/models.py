@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+# Create your models here.
+
+
+class JobQuerySet(models.QuerySet):
+    def enqueue(
+        self, name: str, payload: dict, run_at: datetime | None = None
+    ) -> "Job":
+        """
+        Add a job to the queue.
+
+        The job is a row in the same database as the rest of the request, so it
+        is committed, or rolled back, with the surrounding transaction and a
+        worker never sees a job whose request failed.
+
+        Args:
+            name (str): The name of the handler, see `jobs.registry.register`.
+            payload (dict): The JSON serializable arguments of the job.
+            run_at (datetime, optional): When to run the job. Defaults to now.
+
+        Returns:
+            Job: The queued job.
+        """
+        return self.create(name=name, payload=payload, run_at=run_at or timezone.now())
+
+    def claim(self, limit: int) -> list["Job"]:
+        """
+        Claim the jobs that are due, oldest first, for the current worker.
+
+        The claimed jobs are leased for `JOBS["LEASE"]` seconds: a job whose worker
+        died is claimed again once its lease expires. Concurrent workers skip the
+        rows locked by each other.
+
+        Args:
+            limit (int): The maximum number of jobs to claim.
+
+        Returns:
+            list[Job]: The claimed jobs.
+        """
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            jobs = list(
+                self.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=Job.Status.PENDING, run_at__lte=now)
+                    | Q(status=Job.Status.RUNNING, locked_until__lt=now)
+                )
+                .order_by("run_at", "id")[:limit]
+            )
+            if jobs:
+                self.filter(pk__in=[job.pk for job in jobs]).update(
+                    status=Job.Status.RUNNING,
+                    locked_until=now + timedelta(seconds=settings.JOBS["LEASE"]),
+                    attempts=F("attempts") + 1,
+                )
+        for job in jobs:
+            job.attempts += 1
+        return jobs
+
+    def record(self, results: dict["Job", Exception | None]) -> dict[str, int]:
+        """
+        Record the outcome of claimed jobs. Succeeded jobs are deleted, failed jobs
+        are retried with an exponential backoff and dead-lettered after
+        `JOBS["MAX_ATTEMPTS"]` attempts, kept with their error for inspection.
+
+        Args:
+            results (dict[Job, Exception | None]): The error of each job, None if
+                it succeeded.
+
+        Returns:
+            dict[str, int]: The number of jobs that succeeded, will be retried and
+            were dead-lettered.
+        """
+        conf = settings.JOBS
+        now = timezone.now()
+        stats = {"succeeded": 0, "retried": 0, "dead": 0}
+        with transaction.atomic(using=self.db):
+            succeeded = [job.pk for job, error in results.items() if error is None]
+            self.filter(pk__in=succeeded).delete()
+            stats["succeeded"] = len(succeeded)
+            for job, error in results.items():
+                if error is None:
+                    continue
+                job.last_error = f"{type(error).__name__}: {error}"
+                job.locked_until = None
+                if job.attempts >= conf["MAX_ATTEMPTS"]:
+                    job.status = Job.Status.DEAD
+                    stats["dead"] += 1
+                else:
+                    job.status = Job.Status.PENDING
+                    job.run_at = now + timedelta(seconds=get_backoff(job.attempts))
+                    stats["retried"] += 1
+                job.save(
+                    update_fields=["status", "run_at", "locked_until", "last_error"]
+                )
+        return stats
+
+    def requeue_dead(self) -> int:
+        """
+        Give the dead-lettered jobs a new series of attempts, e.g. after fixing
+        what made them fail.
+
+        Returns:
+            int: The number of jobs requeued.
+        """
+        return self.filter(status=Job.Status.DEAD).update(
+            status=Job.Status.PENDING, attempts=0, run_at=timezone.now()
+        )
+
+
+def get_backoff(attempts: int) -> float:
+    """
+    Get the delay before retrying a job, doubling with every failed attempt from
+    `JOBS["RETRY_BACKOFF"]` up to `JOBS["MAX_BACKOFF"]` seconds.
+
+    Args:
+        attempts (int): The number of attempts made so far.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    conf = settings.JOBS
+    return min(conf["RETRY_BACKOFF"] * 2 ** (attempts - 1), conf["MAX_BACKOFF"])
+
+
+class Job(models.Model):
+    """A unit of background work, run by the `run_jobs` worker."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DEAD = "dead"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    # The lease of the worker running the job.
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Backs the lookup of the jobs that are due.
+            models.Index(fields=["status", "run_at"], name="jobs_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
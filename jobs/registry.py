@@ -0,0 +1,29 @@
+import typing as t
+
+# A handler gets the payloads of a batch of jobs and returns, for each of them,
+# None if it succeeded or the exception it failed with.
+Handler = t.Callable[[list[dict]], list[Exception | None]]
+
+_handlers: dict[str, Handler] = {}
+
+
+def register(name: str) -> t.Callable[[Handler], Handler]:
+    """
+    Register the handler of the jobs with the given name.
+
+    Args:
+        name (str): The name the jobs are enqueued with.
+
+    Returns:
+        Callable: A decorator registering the handler.
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        _handlers[name] = handler
+        return handler
+
+    return decorator
+
+
+def get_handler(name: str) -> Handler | None:
+    return _handlers.get(name)
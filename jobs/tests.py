@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.mail import enqueue_email
+from jobs.models import Job, get_backoff
+from jobs.registry import register
+from jobs.worker import run_batch
+
+FAILING = "tests.failing"
+
+
+@register(FAILING)
+def fail(payloads: list[dict]) -> list[Exception | None]:
+    return [ValueError(payload["reason"]) for payload in payloads]
+
+
+@override_settings(JOBS={**settings.JOBS, "MAX_ATTEMPTS": 2, "RETRY_BACKOFF": 10})
+class JobQueueTests(TestCase):
+    def run_jobs(self) -> str:
+        out = StringIO()
+        call_command("run_jobs", "--once", stdout=out)
+        return out.getvalue()
+
+    def test_emails_of_a_batch_share_one_connection(self):
+        for index in range(3):
+            enqueue_email("Hello", f"Message {index}", [f"user{index}@example.com"])
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.open"
+        ) as open_connection:
+            output = self.run_jobs()
+        self.assertEqual(open_connection.call_count, 1)
+        self.assertIn("Ran 3 jobs: 3 succeeded", output)
+        self.assertEqual(
+            [email.body for email in mail.outbox],
+            ["Message 0", "Message 1", "Message 2"],
+        )
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_jobs_are_retried_with_backoff_then_dead_lettered(self):
+        job = Job.objects.enqueue(FAILING, {"reason": "Mail server down"})
+        self.assertEqual(
+            run_batch(Job.objects.claim(10)), {"succeeded": 0, "retried": 1, "dead": 0}
+        )
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.last_error, "ValueError: Mail server down")
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=9))
+        # Not due before the backoff elapsed.
+        self.assertEqual(Job.objects.claim(10), [])
+
+        Job.objects.update(run_at=timezone.now())
+        self.assertIn("1 dead", self.run_jobs())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.DEAD, 2))
+
+        call_command("run_jobs", "--once", "--requeue-dead", stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.PENDING, 1))
+
+    def test_backoff_doubles_up_to_the_maximum(self):
+        with self.settings(
+            JOBS={**settings.JOBS, "RETRY_BACKOFF": 30, "MAX_BACKOFF": 100}
+        ):
+            self.assertEqual([get_backoff(n) for n in (1, 2, 3, 4)], [30, 60, 100, 100])
+
+    def test_expired_leases_are_claimed_again(self):
+        job = Job.objects.enqueue("tests.unknown", {})
+        self.assertEqual(Job.objects.claim(10), [job])
+        self.assertEqual(Job.objects.claim(10), [])
+
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(Job.objects.claim(10), [job])
+        with self.assertLogs("jobs.worker", "ERROR"):
+            run_batch([job])
+        job.refresh_from_db()
+        self.assertIn("No handler registered", job.last_error)
+
+    def test_jobs_roll_back_with_the_transaction(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue_email("Hello", "Message", ["user@example.com"])
+            raise RuntimeError
+        self.assertFalse(Job.objects.exists())
@@ -0,0 +1,37 @@
+import logging
+from collections import defaultdict
+
+from jobs.models import Job
+from jobs.registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(jobs: list[Job]) -> dict[str, int]:
+    """
+    Run claimed jobs, handing the jobs of each handler over in a single call, and
+    record their outcome.
+
+    Args:
+        jobs (list[Job]): The jobs, from `JobQuerySet.claim`.
+
+    Returns:
+        dict[str, int]: The number of jobs that succeeded, will be retried and
+        were dead-lettered.
+    """
+    by_name = defaultdict(list)
+    for job in jobs:
+        by_name[job.name].append(job)
+
+    results = {}
+    for name, group in by_name.items():
+        handler = get_handler(name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for {name!r}")
+            errors = handler([job.payload for job in group])
+        except Exception as error:
+            logger.exception("Jobs %r failed", name)
+            errors = [error] * len(group)
+        results.update(zip(group, errors, strict=True))
+    return Job.objects.record(results)